@@ -0,0 +1,94 @@
+"""
+Benchmark du corpus Parquet (src/utils/corpus_store.py) contre le chargement historique
+des *_bible_raw.json : corpus synthétique à l'échelle d'une Bible complète (~31k versets
+par langue), alignement Mina / Ewe par verse_id.
+
+- JSON    : json.loads + DataFrame + clé construite par df.apply(axis=1) (ancien ParallelAligner)
+- Parquet : lecture des seules colonnes utiles, clé verse_id déjà stockée, merge vectorisé
+
+    python scripts/bench_corpus_store.py
+    python scripts/bench_corpus_store.py --repeat 5
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+
+from src.scraping.versions import EWE_BOOKS
+from src.utils.corpus_store import read_corpus, write_corpus
+
+
+def synthetic_records(lang, seed):
+    rng = random.Random(seed)
+    records = []
+    for book, info in EWE_BOOKS.items():
+        for chapter in range(1, info["chapters"] + 1):
+            for verse in range(1, rng.randint(15, 40) + 1):
+                records.append({
+                    "book": book, "chapter": chapter, "verse": str(verse),
+                    "text": " ".join(rng.choice(["mawu", "gbe", "nya", "le", "kple"]) for _ in range(rng.randint(8, 40))),
+                    "audio_path": f"data/raw/{lang}/audio/{book.lower()}_{chapter:02d}.mp3",
+                    "text_url": "", "audio_url": "", "timestamp": time.time(),
+                })
+    return records
+
+
+def align_json(ewe_json, gegbe_json):
+    frames = []
+    for path in (gegbe_json, ewe_json):
+        df = pd.DataFrame(json.loads(path.read_text(encoding="utf-8")))
+        df["verse_id"] = df.apply(lambda x: f"{x['book']}.{x['chapter']}.{x['verse']}", axis=1)
+        frames.append(df[["verse_id", "text", "audio_path"]])
+    return pd.merge(*frames, on="verse_id", suffixes=("_mina", "_ewe"))
+
+
+def align_parquet(paths):
+    columns = ["verse_id", "text", "audio_path"]
+    frames = [read_corpus(lang, columns=columns, path=paths[lang][0], source=paths[lang][1]) for lang in ("gegbe", "ewe")]
+    return pd.merge(*frames, on="verse_id", suffixes=("_mina", "_ewe"))
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = {}
+        for seed, lang in enumerate(("ewe", "gegbe")):
+            records = synthetic_records(lang, seed)
+            source = tmp / f"{lang}_bible_raw.json"
+            source.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+            start = time.perf_counter()
+            write_corpus(records, lang, tmp / f"{lang}_corpus.parquet")
+            print(f"{lang} : {len(records)} versets, JSON {source.stat().st_size / 1024 ** 2:.1f} Mo, "
+                  f"Parquet {(tmp / f'{lang}_corpus.parquet').stat().st_size / 1024 ** 2:.1f} Mo "
+                  f"(écrit en {time.perf_counter() - start:.2f} s)")
+            paths[lang] = (tmp / f"{lang}_corpus.parquet", source)
+
+        json_s, json_df = best_of(lambda: align_json(paths["ewe"][1], paths["gegbe"][1]), args.repeat)
+        parquet_s, parquet_df = best_of(lambda: align_parquet(paths), args.repeat)
+        assert json_df["verse_id"].tolist() == parquet_df["verse_id"].tolist()
+        print(f"Alignement de {len(parquet_df)} versets : JSON + apply {json_s:.2f} s, Parquet {parquet_s:.2f} s "
+              f"(x{json_s / parquet_s:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Benchmark de la précision d'entraînement Whisper sur CPU : fp32 contre autocast bf16,
+avec ou sans torch.compile. Chaque mode tourne dans un processus neuf et rapporte le
+temps d'un pas (forward + backward + optimiseur), le pic de mémoire RSS et, sur données
+réelles, le WER d'une transcription gloutonne (référence et écart avec fp32) : le gain de
+vitesse ne doit rien coûter en précision.
+
+    python scripts/bench_cpu_precision.py --model models/whisper-ewe-mina-final --limit 32
+    python scripts/bench_cpu_precision.py --synthetic --modes fp32 bf16 bf16+compile
+"""
+import argparse
+import csv
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import torch
+
+from src.config.settings import ASR_BATCH_SIZE, ASR_DATASET_MODE, ASR_MODEL_SIZE, PROCESSED_DIR, PROJECT_ROOT
+from src.models.cpu_precision import autocast, cpu_bf16_supported
+from src.models.whisper_freezing import apply_freeze_policy
+
+MODES = ("fp32", "bf16", "fp32+compile", "bf16+compile")
+FINAL_MODEL = PROJECT_ROOT / "models" / "whisper-ewe-mina-final"
+
+
+def peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_samples(csv_path, limit):
+    from src.models.feature_store import load_waveform_16k
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = [row for _, row in zip(range(limit), csv.DictReader(f))]
+    return [load_waveform_16k(row) for row in rows], [row["text"] for row in rows]
+
+
+def load_model(args):
+    from transformers import WhisperConfig, WhisperForConditionalGeneration, WhisperProcessor
+
+    if args.synthetic:
+        # Dimensions de whisper-base, poids aléatoires : temps et mémoire seulement
+        config = WhisperConfig(d_model=512, encoder_layers=6, decoder_layers=6, encoder_attention_heads=8,
+                               decoder_attention_heads=8, encoder_ffn_dim=2048, decoder_ffn_dim=2048)
+        return WhisperForConditionalGeneration(config), None
+    processor = WhisperProcessor.from_pretrained(args.model, task="transcribe")
+    model = WhisperForConditionalGeneration.from_pretrained(args.model)
+    model.config.forced_decoder_ids = None
+    model.config.suppress_tokens = []
+    return model, processor
+
+
+def run_mode(mode, args):
+    """Mesures d'un mode, dans un processus dédié (pic RSS propre au mode)."""
+    torch.manual_seed(0)
+    torch.set_num_threads(args.threads)
+    precision, _, compiled = mode.partition("+")
+    model, processor = load_model(args)
+    rss_loaded = peak_rss_mb()
+
+    if processor is None:
+        features = torch.randn(args.batch_size, model.config.num_mel_bins, 3000)
+        labels = torch.randint(0, model.config.vocab_size, (args.batch_size, 60))
+        waveforms, texts = [], []
+    else:
+        waveforms, texts = load_samples(args.csv, args.limit)
+        features = processor.feature_extractor(waveforms[:args.batch_size], sampling_rate=16000,
+                                               return_tensors="pt").input_features
+        labels = processor.tokenizer(texts[:args.batch_size], padding=True, return_tensors="pt").input_ids
+
+    # Pas d'entraînement, avec la politique de gel de settings.py
+    apply_freeze_policy(model)
+    model.train()
+    step_model = torch.compile(model) if compiled else model
+    optimizer = torch.optim.AdamW([p for p in model.parameters() if p.requires_grad], lr=1e-5)
+
+    def step():
+        with autocast(precision):
+            loss = step_model(input_features=features, labels=labels).loss
+        loss.backward()
+        optimizer.step()
+        optimizer.zero_grad()
+
+    start = time.perf_counter()
+    for _ in range(args.warmup):
+        step()
+    warmup_s = time.perf_counter() - start
+    times = []
+    for _ in range(args.steps):
+        start = time.perf_counter()
+        step()
+        times.append(time.perf_counter() - start)
+    result = {"step_s": float(np.median(times)), "warmup_s": warmup_s,
+              "rss_mb": peak_rss_mb(), "rss_train_mb": peak_rss_mb() - rss_loaded}
+
+    if processor is not None:
+        # Transcription gloutonne (modèle non compilé) dans la même précision
+        model.eval()
+        predictions = []
+        with torch.no_grad(), autocast(precision):
+            for i in range(0, len(waveforms), args.batch_size):
+                inputs = processor.feature_extractor(waveforms[i:i + args.batch_size], sampling_rate=16000,
+                                                     return_tensors="pt").input_features
+                ids = model.generate(inputs, max_length=args.max_length, num_beams=1)
+                predictions += processor.tokenizer.batch_decode(ids, skip_special_tokens=True)
+        result["predictions"] = predictions
+        result["references"] = texts
+    return result
+
+
+def main():
+    default_csv = PROCESSED_DIR / ("bible_asr_segments.csv" if ASR_DATASET_MODE == "offsets" else "bible_asr_dataset.csv")
+    default_model = str(FINAL_MODEL) if FINAL_MODEL.exists() else f"openai/whisper-{ASR_MODEL_SIZE}"
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=default_model)
+    parser.add_argument("--csv", type=Path, default=default_csv)
+    parser.add_argument("--limit", type=int, default=32, help="Exemples transcrits pour le WER")
+    parser.add_argument("--synthetic", action="store_true", help="Poids et lots aléatoires (pas de WER)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["fp32", "bf16"])
+    parser.add_argument("--batch-size", type=int, default=ASR_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--max-length", type=int, default=225)
+    args = parser.parse_args()
+
+    if not args.synthetic and not args.csv.exists():
+        sys.exit(f"{args.csv} introuvable (utiliser --synthetic)")
+    print(f"{args.model if not args.synthetic else 'whisper-base aléatoire'}, lot {args.batch_size}, "
+          f"{args.threads} threads, bf16 natif : {'oui' if cpu_bf16_supported() else 'non'}")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for mode in args.modes:
+        with ctx.Pool(1) as pool:
+            results[mode] = pool.apply(run_mode, (mode, args))
+
+    wer_metric = None
+    if not args.synthetic:
+        import evaluate
+        wer_metric = evaluate.load("wer")
+
+    ref = results[args.modes[0]]
+    print(f"{'mode':<14} {'s/pas':>7} {'accél.':>7} {'1er pas':>8} {'RSS Mo':>8} {'+entr.':>7}"
+          + (f" {'WER':>6} {'écart':>6}" if wer_metric else ""))
+    for mode, r in results.items():
+        line = (f"{mode:<14} {r['step_s']:>7.2f} {ref['step_s'] / r['step_s']:>6.2f}x {r['warmup_s']:>8.1f} "
+                f"{r['rss_mb']:>8.0f} {r['rss_train_mb']:>7.0f}")
+        if wer_metric:
+            wer = wer_metric.compute(predictions=r["predictions"], references=r["references"])
+            # Écart : WER de ce mode en prenant la transcription du mode de référence comme vérité
+            pairs = [(p, q) for p, q in zip(r["predictions"], ref["predictions"]) if q.strip()]
+            drift = wer_metric.compute(predictions=[p for p, _ in pairs], references=[q for _, q in pairs]) \
+                if pairs else float("nan")
+            line += f" {wer:>6.3f} {drift:>6.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
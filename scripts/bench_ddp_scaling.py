@@ -0,0 +1,125 @@
+"""
+Benchmark de passage à l'échelle de l'entraînement Whisper data-parallel sur CPU
+(DDP gloo) : débit en exemples/s en fonction du nombre de processus, les cœurs de la
+machine étant répartis entre eux (threads = cœurs // processus, comme launch_ddp_cpu).
+
+Modèle Whisper initialisé aléatoirement (dimensions de --size, pas de téléchargement)
+et lots synthétiques ; politique de gel de settings.py (encodeur gelé -> décodeur seul,
+comme avec le cache des sorties encodeur).
+
+    python scripts/bench_ddp_scaling.py --procs 1 2 4 8
+    python scripts/bench_ddp_scaling.py --procs 1 4 --size tiny --cores 16 --steps 10
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from transformers import WhisperConfig, WhisperForConditionalGeneration
+from transformers.modeling_outputs import BaseModelOutput
+
+from src.config.settings import ASR_BATCH_SIZE, ASR_DDP_BACKEND, ASR_FREEZE_POLICY, ASR_MODEL_SIZE
+from src.models.launch_ddp_cpu import available_cores, threads_per_process
+from src.models.whisper_freezing import FREEZE_POLICIES, apply_freeze_policy, encoder_frozen
+
+# (d_model, couches, têtes) des checkpoints openai/whisper-*
+SIZES = {"tiny": (384, 4, 6), "base": (512, 6, 8), "small": (768, 12, 12)}
+LABEL_LENGTH = 60
+
+
+def build_model(size, freeze):
+    d_model, layers, heads = SIZES[size]
+    config = WhisperConfig(
+        d_model=d_model, encoder_layers=layers, decoder_layers=layers,
+        encoder_attention_heads=heads, decoder_attention_heads=heads,
+        encoder_ffn_dim=4 * d_model, decoder_ffn_dim=4 * d_model,
+    )
+    model = WhisperForConditionalGeneration(config)
+    apply_freeze_policy(model, freeze)
+    return model
+
+
+def synthetic_batch(model, batch_size, generator):
+    labels = torch.randint(0, model.config.vocab_size, (batch_size, LABEL_LENGTH), generator=generator)
+    if encoder_frozen(model):
+        hidden = torch.randn(batch_size, 1500, model.config.d_model, generator=generator)
+        return {"encoder_outputs": BaseModelOutput(last_hidden_state=hidden), "labels": labels}
+    features = torch.randn(batch_size, model.config.num_mel_bins, 3000, generator=generator)
+    return {"input_features": features, "labels": labels}
+
+
+def worker(rank, world_size, threads, args, port, results):
+    os.environ["MASTER_ADDR"] = "127.0.0.1"
+    os.environ["MASTER_PORT"] = str(port)
+    torch.set_num_threads(threads)
+    dist.init_process_group(ASR_DDP_BACKEND, rank=rank, world_size=world_size)
+    try:
+        torch.manual_seed(0)  # Mêmes poids initiaux sur tous les rangs
+        model = build_model(args.size, args.freeze)
+        if world_size > 1:
+            model = torch.nn.parallel.DistributedDataParallel(model, find_unused_parameters=False)
+        optimizer = torch.optim.AdamW([p for p in model.parameters() if p.requires_grad], lr=1e-5)
+        generator = torch.Generator().manual_seed(rank)
+        batch = synthetic_batch(model.module if world_size > 1 else model, args.batch_size, generator)
+
+        def step():
+            loss = model(**batch).loss
+            loss.backward()
+            optimizer.step()
+            optimizer.zero_grad()
+
+        for _ in range(args.warmup):
+            step()
+        dist.barrier()
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            step()
+        dist.barrier()
+        elapsed = time.perf_counter() - start
+        if rank == 0:
+            results.put(elapsed)
+    finally:
+        dist.destroy_process_group()
+
+
+def run(world_size, threads, args, port):
+    results = mp.get_context("spawn").SimpleQueue()
+    mp.spawn(worker, args=(world_size, threads, args, port, results), nprocs=world_size, join=True)
+    elapsed = results.get()
+    return world_size * args.batch_size * args.steps / elapsed, elapsed / args.steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--procs", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--cores", type=int, default=None, help="Cœurs à répartir (défaut : tous)")
+    parser.add_argument("--size", choices=sorted(SIZES), default=ASR_MODEL_SIZE)
+    parser.add_argument("--freeze", choices=FREEZE_POLICIES, default=ASR_FREEZE_POLICY)
+    parser.add_argument("--batch-size", type=int, default=ASR_BATCH_SIZE, help="Lot par processus")
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--port", type=int, default=29600)
+    args = parser.parse_args()
+
+    cores = args.cores or available_cores()
+    print(f"whisper-{args.size}, gel '{args.freeze}', lot {args.batch_size}/processus, {cores} cœurs")
+    print(f"{'processus':>9} {'threads':>7} {'s/pas':>7} {'ex/s':>8} {'accél.':>7} {'effic.':>7}")
+    baseline = None
+    for i, world_size in enumerate(args.procs):
+        threads = threads_per_process(world_size, cores)
+        # Un port par mesure : évite les sockets encore en TIME_WAIT de la précédente
+        samples_per_s, step_time = run(world_size, threads, args, args.port + i)
+        baseline = baseline or samples_per_s  # Référence : première mesure
+        speedup = samples_per_s / baseline
+        print(f"{world_size:>9} {threads:>7} {step_time:>7.2f} {samples_per_s:>8.2f} "
+              f"{speedup:>6.2f}x {speedup * args.procs[0] / world_size:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark de la traduction Mina -> Français : cascade (NLLB puis OPUS-MT) contre
+élève distillé "direct" (CTranslate2 int8 si exporté). Chaque mode tourne dans un
+processus neuf et rapporte le temps de chargement, la latence par phrase (lot de 1),
+le débit par lots, le pic RSS, et l'accord chrF / BLEU avec les sorties de la
+cascade sur les phrases réservées (split de test de DISTILL_CSV, jamais vues par l'élève).
+
+    python scripts/bench_direct_vs_cascade.py --sentences 200
+    python scripts/bench_direct_vs_cascade.py --modes direct --student models/marian-mina-fr-student
+"""
+import argparse
+import multiprocessing
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sacrebleu
+import torch
+
+from src.config.settings import DISTILL_CSV, DISTILL_TEACHER_BATCH_SIZE
+from src.models.train_translation_cpu import SPLIT_SEED, TEST_SIZE, parallel_rows, peak_rss_mb
+from src.pipeline.translate_cascade import MODES, TranslationCascade
+
+
+def heldout_pairs(distill_csv, n):
+    """Phrases Mina et traductions de la cascade du split de test de l'élève."""
+    test = parallel_rows(distill_csv, "french").train_test_split(test_size=TEST_SIZE, seed=SPLIT_SEED)["test"]
+    test = test.select(range(min(n, len(test))))
+    return test["mina"], test["french"]
+
+
+def run_mode(mode, sentences, args):
+    torch.set_num_threads(args.threads)
+    start = time.perf_counter()
+    cascade = TranslationCascade(nllb_path=args.nllb, opus_path=args.opus, mode=mode, student_path=args.student)
+    load_seconds = time.perf_counter() - start
+
+    cascade.translate_batch_mina_to_french(sentences[:1])  # Préchauffage
+    latencies = []
+    for sentence in sentences[:args.latency_sentences]:
+        start = time.perf_counter()
+        cascade.translate_batch_mina_to_french([sentence])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    outputs = []
+    for first in range(0, len(sentences), args.batch_size):
+        outputs += [r["french"] for r in cascade.translate_batch_mina_to_french(sentences[first:first + args.batch_size])]
+    batch_seconds = time.perf_counter() - start
+    return {"load_s": load_seconds, "latencies": latencies, "sentences_per_s": len(sentences) / batch_seconds,
+            "rss_mb": peak_rss_mb(), "outputs": outputs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", type=Path, default=DISTILL_CSV, help="Sorties de la cascade (distill_mina_fr targets)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--nllb", default=None, help="Modèle Mina -> Ewe de la cascade")
+    parser.add_argument("--opus", default=None, help="Modèle Ewe -> Français de la cascade")
+    parser.add_argument("--student", default=None, help="Élève Mina -> Français (mode direct)")
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--latency-sentences", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=DISTILL_TEACHER_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    args = parser.parse_args()
+
+    if not args.csv.exists():
+        sys.exit(f"{args.csv} introuvable (lancer python -m src.models.distill_mina_fr targets)")
+    sentences, teacher = heldout_pairs(args.csv, args.sentences)
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for mode in args.modes:
+        with ctx.Pool(1) as pool:
+            results[mode] = pool.apply(run_mode, (mode, sentences, args))
+
+    print(f"{len(sentences)} phrases réservées ; accord mesuré contre les traductions de la cascade dans {args.csv.name}")
+    print(f"{'mode':<8} {'charg. s':>8} {'lat. moy ms':>11} {'p95 ms':>7} {'phrases/s':>10} {'RSS Mo':>7} "
+          f"{'chrF':>6} {'BLEU':>6}")
+    for mode, r in results.items():
+        latencies = sorted(r["latencies"])
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        chrf = sacrebleu.corpus_chrf(r["outputs"], [teacher]).score
+        bleu = sacrebleu.corpus_bleu(r["outputs"], [teacher]).score
+        print(f"{mode:<8} {r['load_s']:>8.1f} {statistics.mean(latencies) * 1000:>11.0f} {p95 * 1000:>7.0f} "
+              f"{r['sentences_per_s']:>10.2f} {r['rss_mb']:>7.0f} {chrf:>6.1f} {bleu:>6.1f}")
+    if len(results) == 2:
+        speedup = statistics.mean(results["cascade"]["latencies"]) / statistics.mean(results["direct"]["latencies"])
+        print(f"Latence : direct x{speedup:.2f} plus rapide que la cascade")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark de l'extraction log-mel Whisper : WhisperFeatureExtractor appelé exemple par
+exemple (ancien prepare_dataset) contre BatchedLogMel (torch / NumPy, par lots).
+Rapporte le débit en exemples/s et l'écart maximal avec la référence.
+
+    python scripts/bench_log_mel.py --limit 200                    # segments de bible_asr_segments.csv
+    python scripts/bench_log_mel.py --synthetic 200 --batch-sizes 1 8 32
+"""
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+from transformers import WhisperFeatureExtractor
+
+from src.config.settings import PROCESSED_DIR
+from src.preprocessing.log_mel import BatchedLogMel, TORCH_AVAILABLE
+from src.preprocessing.segment_reader import load_waveform
+
+
+def synthetic_verses(n, seed=0):
+    """Signaux de 3 à 12 s (durée typique d'un verset), 16 kHz."""
+    rng = np.random.default_rng(seed)
+    return [rng.normal(0, 0.1, int(rng.integers(3 * 16000, 12 * 16000))).astype(np.float32) for _ in range(n)]
+
+
+def dataset_verses(csv_path, limit):
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = [row for _, row in zip(range(limit), csv.DictReader(f))]
+    return [load_waveform(row)[0] for row in rows]
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", type=Path, default=PROCESSED_DIR / "bible_asr_segments.csv")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--synthetic", type=int, default=None, help="Nombre de signaux synthétiques")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        waveforms = synthetic_verses(args.synthetic)
+    elif args.csv.exists():
+        waveforms = dataset_verses(args.csv, args.limit)
+    else:
+        sys.exit(f"{args.csv} introuvable (utiliser --synthetic N)")
+    n = len(waveforms)
+    print(f"{n} signaux, durée moyenne {np.mean([len(w) for w in waveforms]) / 16000:.1f} s")
+
+    fe = WhisperFeatureExtractor()
+    ref, t_ref = best_time(lambda: np.stack([fe(w, sampling_rate=16000).input_features[0] for w in waveforms]),
+                           args.repeat)
+    print(f"{'WhisperFeatureExtractor (1 par 1)':<36} {n / t_ref:8.1f} ex/s")
+
+    backends = ["torch", "numpy"] if TORCH_AVAILABLE else ["numpy"]
+    worst = 0.0
+    for backend in backends:
+        for batch_size in args.batch_sizes:
+            extractor = BatchedLogMel(fe, batch_size=batch_size, backend=backend)
+            out, t = best_time(lambda: extractor(waveforms), args.repeat)
+            diff = float(np.abs(out - ref).max())
+            worst = max(worst, diff)
+            print(f"{f'BatchedLogMel {backend} (lots de {batch_size})':<36} {n / t:8.1f} ex/s | "
+                  f"x{t_ref / t:4.1f} | écart max {diff:.1e}")
+
+    sys.exit(0 if worst < 1e-4 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark du fine-tuning NLLB Mina -> Ewe sur CPU : adaptateurs LoRA contre fine-tuning
+complet. Chaque mode tourne dans un processus neuf (pic RSS propre) et rapporte les
+paramètres entraînables, le débit en paires/s et le pic de mémoire. Affiche aussi la part
+de padding des lots regroupés par longueur contre des lots aléatoires.
+
+    python scripts/bench_nmt_lora.py --steps 20
+    python scripts/bench_nmt_lora.py --modes lora --model models/nllb-mina-ewe-local
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import torch
+from transformers.trainer_pt_utils import LengthGroupedSampler
+
+from src.config.settings import NMT_BATCH_SIZE, NMT_MODEL_SIZE
+from src.models.train_translation_cpu import (
+    PARALLEL_CSV,
+    build_trainer,
+    load_model,
+    load_tokenizer,
+    peak_rss_mb,
+    tokenized_splits,
+)
+
+
+def padding_ratio(lengths, batches):
+    padded = sum(max(lengths[i] for i in batch) * len(batch) for batch in batches)
+    return 1 - sum(lengths) / padded
+
+
+def batches_of(order, batch_size):
+    order = list(order)
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def run_mode(mode, args):
+    torch.set_num_threads(args.threads)
+    tokenizer = load_tokenizer(args.model)
+    splits = tokenized_splits(args.csv, tokenizer)
+    model = load_model(args.model, lora=mode == "lora")
+    trainable = sum(p.numel() for p in model.parameters() if p.requires_grad)
+    rss_loaded = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as output_dir:
+        trainer = build_trainer(model, tokenizer, splits, output_dir, max_steps=args.steps,
+                                eval_strategy="no", save_strategy="no", report_to=[], warmup_steps=0,
+                                logging_steps=args.steps, per_device_train_batch_size=args.batch_size)
+        metrics = trainer.train().metrics
+    return {"trainable": trainable, "samples_per_s": metrics["train_samples_per_second"],
+            "rss_mb": peak_rss_mb(), "rss_train_mb": peak_rss_mb() - rss_loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=f"facebook/{NMT_MODEL_SIZE}")
+    parser.add_argument("--csv", type=Path, default=PARALLEL_CSV)
+    parser.add_argument("--modes", nargs="+", choices=["lora", "full"], default=["lora", "full"])
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=NMT_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    args = parser.parse_args()
+
+    if not args.csv.exists():
+        sys.exit(f"{args.csv} introuvable (lancer prepare_nmt_dataset.py)")
+
+    # Padding : ordre aléatoire contre lots regroupés par longueur (LengthGroupedSampler du Trainer)
+    lengths = tokenized_splits(args.csv, load_tokenizer(args.model))["train"]["length"]
+    generator = torch.Generator().manual_seed(0)
+    random_order = torch.randperm(len(lengths), generator=generator).tolist()
+    grouped_order = list(LengthGroupedSampler(args.batch_size, lengths=lengths, generator=generator))
+    print(f"Padding des lots de {args.batch_size} : aléatoire {padding_ratio(lengths, batches_of(random_order, args.batch_size)):.0%}, "
+          f"regroupés par longueur {padding_ratio(lengths, batches_of(grouped_order, args.batch_size)):.0%}")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for mode in args.modes:
+        with ctx.Pool(1) as pool:
+            results[mode] = pool.apply(run_mode, (mode, args))
+
+    print(f"{'mode':<6} {'entraînables':>13} {'paires/s':>9} {'RSS Mo':>8} {'+entr.':>7}")
+    for mode, r in results.items():
+        print(f"{mode:<6} {r['trainable'] / 1e6:>12.1f}M {r['samples_per_s']:>9.2f} "
+              f"{r['rss_mb']:>8.0f} {r['rss_train_mb']:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
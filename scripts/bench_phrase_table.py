@@ -0,0 +1,74 @@
+"""
+Benchmark de la table de segments Mina -> Ewe (niveau zéro de MinaEweTranslator).
+La table est apprise sur 95 % du corpus parallèle et évaluée sur les 5 % restants :
+pour plusieurs seuils de confiance, part des phrases servies sans NLLB, chrF de ces
+traductions contre l'Ewe de référence et temps par phrase. Avec --nllb, NLLB est
+évalué sur les mêmes phrases acceptées (qualité et latence comparées).
+
+    python scripts/bench_phrase_table.py
+    python scripts/bench_phrase_table.py --nllb models/nllb-mina-ewe-final --sentences 200
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sacrebleu
+
+from src.config.settings import PHRASE_TABLE_MIN_CONFIDENCE, PHRASE_TABLE_MIN_COVERAGE
+from src.models.phrase_table import PARALLEL_CSV, PhraseTable, read_parallel_pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", type=Path, default=PARALLEL_CSV)
+    parser.add_argument("--sentences", type=int, default=1000, help="Phrases de test évaluées")
+    parser.add_argument("--confidences", type=float, nargs="+", default=[0.4, 0.5, PHRASE_TABLE_MIN_CONFIDENCE, 0.7, 0.8, 0.9])
+    parser.add_argument("--nllb", default=None, help="Modèle NLLB à comparer sur les phrases acceptées")
+    args = parser.parse_args()
+
+    if not args.csv.exists():
+        sys.exit(f"{args.csv} introuvable (lancer prepare_nmt_dataset.py)")
+    sources, targets = read_parallel_pairs(args.csv)
+    order = list(range(len(sources)))
+    random.Random(42).shuffle(order)
+    n_test = max(1, len(order) // 20)
+    train, test = order[n_test:], order[:n_test][:args.sentences]
+
+    table = PhraseTable.build([sources[i] for i in train], [targets[i] for i in train])
+    test_sources, references = [sources[i] for i in test], [targets[i] for i in test]
+    start = time.perf_counter()
+    results = [table.translate(text) for text in test_sources]
+    micros = (time.perf_counter() - start) / len(test_sources) * 1e6
+    print(f"{len(table)} segments ; {len(test_sources)} phrases de test ; {micros:.0f} µs/phrase ; "
+          f"couverture moyenne {sum(r.coverage for r in results) / len(results):.1%}")
+
+    print(f"{'confiance':>9} {'servies':>8} {'chrF table':>11}")
+    for threshold in args.confidences:
+        accepted = [k for k, r in enumerate(results) if r.coverage >= PHRASE_TABLE_MIN_COVERAGE and r.confidence >= threshold]
+        chrf = sacrebleu.corpus_chrf([results[k].text for k in accepted], [[references[k] for k in accepted]]).score \
+            if accepted else float("nan")
+        print(f"{threshold:>9.2f} {len(accepted) / len(results):>8.1%} {chrf:>11.1f}")
+
+    if args.nllb:
+        from src.models.translation_mina_ewe import MinaEweTranslator
+
+        translator = MinaEweTranslator(model_path=args.nllb, use_phrase_table=False)
+        accepted = [k for k, r in enumerate(results)
+                    if r.coverage >= PHRASE_TABLE_MIN_COVERAGE and r.confidence >= PHRASE_TABLE_MIN_CONFIDENCE]
+        if not accepted:
+            sys.exit("Aucune phrase acceptée au seuil courant : rien à comparer.")
+        start = time.perf_counter()
+        nllb = [translator.translate(test_sources[k]) for k in accepted]
+        nllb_ms = (time.perf_counter() - start) / len(accepted) * 1000
+        refs = [[references[k] for k in accepted]]
+        print(f"Phrases acceptées au seuil {PHRASE_TABLE_MIN_CONFIDENCE} ({len(accepted)}) : "
+              f"table chrF {sacrebleu.corpus_chrf([results[k].text for k in accepted], refs).score:.1f} "
+              f"({micros:.0f} µs), NLLB chrF {sacrebleu.corpus_chrf(nllb, refs).score:.1f} ({nllb_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
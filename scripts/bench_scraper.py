@@ -0,0 +1,87 @@
+"""
+Benchmark du scraper contre le serveur local de fixtures (scripts/bible_fixture_server.py).
+Lance build_corpus.scrape_versions sur un serveur local avec latence / 429 / pannes
+injectées, dans un dossier temporaire, et rapporte :
+chapitres/min, octets/s, requêtes, reprises, échecs et pic mémoire.
+
+    python scripts/bench_scraper.py --chapters 20 --concurrency 8 --rps 0 --latency 0.05 0.2 --p429 0.05
+"""
+import argparse
+import asyncio
+import dataclasses
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bible_fixture_server import app_from_args, build_arg_parser, start_server
+
+from src.pipeline.build_corpus import scrape_versions
+from src.scraping.versions import BIBLE_VERSIONS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def bench_versions(langs, base_url, root, books, chapters):
+    versions = {}
+    for lang in langs:
+        version = BIBLE_VERSIONS[lang]
+        table = {code: dict(version.books[code], chapters=min(chapters, version.books[code]["chapters"]))
+                 for code in books if code in version.books}
+        versions[lang] = dataclasses.replace(version, base_url=base_url, books=table, root_dir=root / lang)
+    return versions
+
+
+async def main(args):
+    app = app_from_args(args)
+    runner = await start_server(app, args.host, args.port)
+    base_url = f"http://{args.host}:{args.port}"
+
+    with tempfile.TemporaryDirectory(prefix="bench_scraper_") as tmp:
+        versions = bench_versions(args.langs, base_url, Path(tmp), args.books, args.chapters)
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            scrapers = await scrape_versions(
+                args.langs,
+                max_concurrency=args.concurrency,
+                requests_per_second=args.rps,
+                versions=versions,
+                cache=False,
+                use_browser=False,
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            _, peak_py = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            await runner.cleanup()
+
+    totals = {k: sum(s.stats[k] for s in scrapers) for k in scrapers[0].stats}
+    faults = app["faults"].counts
+    print("\n=== Benchmark scraper ===")
+    print(f"Versions          : {', '.join(args.langs)} (concurrence={args.concurrency}, rps={args.rps or 'illimité'})")
+    print(f"Durée             : {elapsed:.2f}s")
+    print(f"Chapitres         : {totals['chapters']} ({totals['chapters'] / elapsed * 60:.1f} chapitres/min)")
+    print(f"Octets reçus      : {totals['bytes'] / 1e6:.1f} Mo ({totals['bytes'] / elapsed / 1e6:.2f} Mo/s)")
+    print(f"Requêtes          : {totals['requests']} (serveur : {faults['requests']}, "
+          f"429 injectés : {faults['429']}, 500 injectés : {faults['500']})")
+    print(f"Reprises / échecs : {totals['retries']} / {totals['failures']}")
+    print(f"Pic mémoire Python: {peak_py / 1e6:.1f} Mo (tracemalloc)")
+    if resource is not None:
+        print(f"Pic RSS processus : {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} Mo")
+
+
+if __name__ == "__main__":
+    parser = build_arg_parser(argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter))
+    parser.add_argument("--langs", nargs="+", default=list(BIBLE_VERSIONS.keys()))
+    parser.add_argument("--books", nargs="+", default=["GEN"])
+    parser.add_argument("--chapters", type=int, default=10, help="Chapitres max par livre")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=0.0, help="Débit max (0 = illimité)")
+    asyncio.run(main(parser.parse_args()))
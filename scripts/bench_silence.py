@@ -0,0 +1,83 @@
+"""
+Benchmark de la détection de silence utilisée par align_chapter :
+pydub.silence.detect_silence (boucle Python) contre detect_silence_np (NumPy vectorisé).
+Vérifie que les plages sont identiques pour les deux seuils de l'alignement
+(500 ms / -45 dB et 300 ms / -40 dB).
+
+    python scripts/bench_silence.py --limit 5                 # WAV de data/processed/audio_16k
+    python scripts/bench_silence.py --synthetic-minutes 5     # signal synthétique
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.silence import detect_silence
+
+from src.config.settings import PROCESSED_DIR
+from src.preprocessing.silence import detect_silence_np, read_wav_int16
+
+SETTINGS = [(500, -45), (300, -40)]
+
+
+def synthetic_chapter(minutes, seed=0):
+    """Alternance de « parole » (bruit fort) et de pauses (bruit faible), 16 kHz mono."""
+    rng = np.random.default_rng(seed)
+    n = int(minutes * 60 * 16000)
+    x = np.empty(n)
+    pos = 0
+    while pos < n:
+        length = min(int(rng.integers(2000, 60000)), n - pos)
+        amp = rng.choice([20, 100, 3000, 12000], p=[0.25, 0.1, 0.35, 0.3])
+        x[pos:pos + length] = rng.normal(0, amp, size=length)
+        pos += length
+    return np.clip(x, -32768, 32767).astype(np.int16)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav-dir", type=Path, default=PROCESSED_DIR / "audio_16k")
+    parser.add_argument("--limit", type=int, default=3)
+    parser.add_argument("--synthetic-minutes", type=float, default=None)
+    args = parser.parse_args()
+
+    if args.synthetic_minutes:
+        inputs = [(f"synthétique {args.synthetic_minutes} min", synthetic_chapter(args.synthetic_minutes), 16000, 1)]
+    else:
+        inputs = []
+        for path in sorted(args.wav_dir.glob("*.wav"))[:args.limit]:
+            samples, rate, channels = read_wav_int16(path)
+            inputs.append((path.name, samples, rate, channels))
+    if not inputs:
+        sys.exit(f"Aucun WAV dans {args.wav_dir} (utiliser --synthetic-minutes)")
+
+    total_ref = total_np = 0.0
+    mismatches = 0
+    for name, samples, rate, channels in inputs:
+        segment = AudioSegment(np.asarray(samples).tobytes(), frame_rate=rate, sample_width=2, channels=channels)
+        for min_len, thresh in SETTINGS:
+            ref, t_ref = timed(lambda: detect_silence(segment, min_silence_len=min_len, silence_thresh=thresh))
+            fast, t_np = timed(lambda: detect_silence_np(samples, rate, min_len, thresh, channels))
+            total_ref += t_ref
+            total_np += t_np
+            same = ref == fast
+            mismatches += not same
+            print(f"{name:<32} {min_len}ms/{thresh}dB : {len(ref):4d} plages | pydub {t_ref:7.2f}s | "
+                  f"numpy {t_np:6.3f}s | x{t_ref / max(t_np, 1e-9):6.0f} | {'identique' if same else 'DIFFÉRENT'}")
+
+    print(f"\nTotal : pydub {total_ref:.2f}s, numpy {total_np:.3f}s, accélération x{total_ref / max(total_np, 1e-9):.0f}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark du parsing des chapitres : parser de référence (BeautifulSoup/html.parser)
+contre le parser lxml. Vérifie que les deux produisent EXACTEMENT la même sortie.
+
+Fixtures : pages du cache HTML (data/raw/html_cache/**/*.html.gz) ou tout dossier
+contenant des fichiers .html / .html.gz (option --fixtures).
+
+    python scripts/bench_verse_parser.py --repeat 5
+"""
+import argparse
+import gzip
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bs4 import BeautifulSoup
+
+from src.config.settings import HTML_CACHE_DIR
+from src.scraping.verse_parser import parse_verses, parse_verses_lxml, LXML_AVAILABLE
+
+
+def load_fixtures(folder: Path, limit=None):
+    pages = []
+    for path in sorted(folder.rglob("*.html*")):
+        if path.suffix == ".gz":
+            html = gzip.decompress(path.read_bytes()).decode("utf-8")
+        elif path.suffix == ".html":
+            html = path.read_text(encoding="utf-8")
+        else:
+            continue
+        pages.append((path.name, html))
+        if limit and len(pages) >= limit:
+            break
+    return pages
+
+
+def reference_parse(html):
+    return parse_verses(BeautifulSoup(html, "html.parser"))
+
+
+def bench(fn, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=Path, default=HTML_CACHE_DIR)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not LXML_AVAILABLE:
+        sys.exit("lxml n'est pas installé (pip install lxml).")
+
+    pages = load_fixtures(args.fixtures, args.limit)
+    if not pages:
+        sys.exit(f"Aucune fixture trouvée dans {args.fixtures}")
+
+    # 1. Équivalence stricte
+    mismatches = [name for name, html in pages if reference_parse(html) != parse_verses_lxml(html)]
+    n_verses = sum(len(parse_verses_lxml(html)) for _, html in pages)
+    print(f"{len(pages)} pages, {n_verses} versets — sorties identiques : {len(pages) - len(mismatches)}/{len(pages)}")
+    for name in mismatches[:10]:
+        print(f"  DIFF : {name}")
+
+    # 2. Vitesse
+    t_ref = bench(reference_parse, pages, args.repeat)
+    t_lxml = bench(parse_verses_lxml, pages, args.repeat)
+    print(f"html.parser : {t_ref:.3f}s ({len(pages) / t_ref:.1f} pages/s)")
+    print(f"lxml        : {t_lxml:.3f}s ({len(pages) / t_lxml:.1f} pages/s)")
+    print(f"Accélération : x{t_ref / t_lxml:.1f}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
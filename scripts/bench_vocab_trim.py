@@ -0,0 +1,98 @@
+"""
+Benchmark de la réduction du vocabulaire NLLB (src/models/vocab_trim.py) : taille du
+modèle, temps de décodage et traductions identiques entre le modèle complet et le
+modèle réduit sur des phrases du corpus parallèle (décodage glouton).
+
+    python scripts/bench_vocab_trim.py --model models/nllb-mina-ewe-final --sentences 200
+    python scripts/bench_vocab_trim.py --model facebook/nllb-200-distilled-600M --trimmed /tmp/nllb-trimmed
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import torch
+from transformers import AutoModelForSeq2SeqLM
+
+from src.config.settings import NMT_MAX_LENGTH, NMT_MODEL_SIZE, NMT_TGT_LANG
+from src.models.vocab_trim import PARALLEL_CSV, TrimmedVocab, model_size_mb, read_parallel_corpus, trim_checkpoint
+
+
+def translate(model, tokenizer, sentences, batch_size, vocab=None):
+    """Traductions et temps de génération (s) ; `vocab` renumérote les identifiants du modèle réduit."""
+    forced_bos_token_id = tokenizer.convert_tokens_to_ids(NMT_TGT_LANG)
+    if vocab is not None:
+        forced_bos_token_id = vocab.to_model(forced_bos_token_id)
+    outputs, elapsed, tokens = [], 0.0, 0
+    with torch.inference_mode():
+        for start in range(0, len(sentences), batch_size):
+            inputs = tokenizer(sentences[start:start + batch_size], return_tensors="pt", padding=True,
+                               max_length=NMT_MAX_LENGTH, truncation=True)
+            if vocab is not None:
+                inputs["input_ids"] = vocab.to_model(inputs["input_ids"])
+            begin = time.perf_counter()
+            ids = model.generate(**inputs, forced_bos_token_id=forced_bos_token_id, max_length=NMT_MAX_LENGTH,
+                                 num_beams=1, do_sample=False)
+            elapsed += time.perf_counter() - begin
+            tokens += ids.numel()
+            if vocab is not None:
+                ids = vocab.to_tokenizer(ids)
+            outputs += tokenizer.batch_decode(ids, skip_special_tokens=True)
+    return outputs, elapsed, tokens
+
+
+def disk_size_mb(model_dir):
+    return sum(f.stat().st_size for f in Path(model_dir).glob("*.safetensors")) / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=f"facebook/{NMT_MODEL_SIZE}")
+    parser.add_argument("--trimmed", type=Path, default=None, help="Défaut : répertoire temporaire")
+    parser.add_argument("--csv", type=Path, default=PARALLEL_CSV)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    args = parser.parse_args()
+
+    if not args.csv.exists():
+        sys.exit(f"{args.csv} introuvable (lancer prepare_nmt_dataset.py)")
+    torch.set_num_threads(args.threads)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trimmed_dir = args.trimmed or Path(tmp)
+        start = time.perf_counter()
+        trimmed, tokenizer, vocab = trim_checkpoint(args.model, trimmed_dir, args.csv)
+        trim_seconds = time.perf_counter() - start
+        # Relecture depuis le disque : c'est ce checkpoint que charge MinaEweTranslator
+        trimmed = AutoModelForSeq2SeqLM.from_pretrained(trimmed_dir).eval()
+        vocab = TrimmedVocab.load(trimmed_dir)
+        trimmed_disk = disk_size_mb(trimmed_dir)
+
+        full = AutoModelForSeq2SeqLM.from_pretrained(args.model).eval()
+        sentences = read_parallel_corpus(args.csv)[0][:args.sentences]
+        translate(full, tokenizer, sentences[:args.batch_size], args.batch_size)  # Préchauffage
+        reference, full_time, full_tokens = translate(full, tokenizer, sentences, args.batch_size)
+        translate(trimmed, tokenizer, sentences[:args.batch_size], args.batch_size, vocab)
+        output, trimmed_time, trimmed_tokens = translate(trimmed, tokenizer, sentences, args.batch_size, vocab)
+
+        identical = sum(a == b for a, b in zip(reference, output))
+        print(f"Réduction en {trim_seconds:.1f} s : {len(vocab)} / {full.config.vocab_size} tokens conservés")
+        print(f"{'modèle':<8} {'params Mo':>10} {'disque Mo':>10} {'phrases/s':>10} {'ms/token':>9}")
+        for name, model, elapsed, tokens, disk in (
+            ("complet", full, full_time, full_tokens, disk_size_mb(args.model) if Path(args.model).exists() else float("nan")),
+            ("réduit", trimmed, trimmed_time, trimmed_tokens, trimmed_disk),
+        ):
+            print(f"{name:<8} {model_size_mb(model):>10.0f} {disk:>10.0f} {len(sentences) / elapsed:>10.2f} "
+                  f"{elapsed / tokens * 1000:>9.2f}")
+        print(f"Accélération du décodage : x{full_time / trimmed_time:.2f} ; "
+              f"traductions identiques : {identical}/{len(sentences)}")
+        for a, b in [(a, b) for a, b in zip(reference, output) if a != b][:5]:
+            print(f"  complet : {a}\n  réduit  : {b}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Serveur local imitant bible.com pour tester / mesurer le scraper sans toucher au vrai site.
+
+- Pages chapitre : servies depuis le cache HTML enregistré (data/raw/html_cache) quand
+  la page réelle correspondante y existe, sinon générées synthétiquement.
+- Pages audio : une balise <audio> pointant vers /audio/<ref>.mp3.
+- MP3 : charge utile synthétique de taille configurable.
+- Injection de pannes : latence aléatoire, réponses 429 (avec Retry-After) et 500.
+
+    python scripts/bible_fixture_server.py --port 8765 --latency 0.05 0.3 --p429 0.05 --p500 0.02
+"""
+import argparse
+import asyncio
+import random
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aiohttp import web
+
+from src.config.settings import HTML_CACHE_DIR
+from src.scraping.html_cache import HtmlCache
+
+REAL_BASE_URL = "https://www.bible.com"
+
+
+def synthetic_chapter(ref: str, n_verses: int = 30) -> str:
+    book, chapter = ref.split(".")[:2]
+    verses = "".join(
+        f'<span data-usfm="{book}.{chapter}.{v}" class="ChapterContent_verse">'
+        f'<span class="ChapterContent_label">{v}</span>'
+        f'<span class="ChapterContent_content">Nya {v} le ta {chapter} me, Mawu gblɔ be: kekeli neva.</span>'
+        f'</span>'
+        for v in range(1, n_verses + 1)
+    )
+    return f'<html><body><div class="ChapterContent_chapter">{verses}</div></body></html>'
+
+
+def synthetic_mp3(size: int) -> bytes:
+    # En-tête ID3 minimal + trames MPEG factices : suffisant pour mesurer le débit
+    frame = b"\xff\xfb\x90\x64" + bytes(413)
+    body = frame * (size // len(frame) + 1)
+    return b"ID3\x03\x00\x00\x00\x00\x00\x00" + body[:size]
+
+
+class FaultInjector:
+    def __init__(self, latency=(0.0, 0.0), p429=0.0, p500=0.0, retry_after=1, seed=None):
+        self.latency = latency
+        self.p429 = p429
+        self.p500 = p500
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.counts = {"requests": 0, "429": 0, "500": 0}
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        self.counts["requests"] += 1
+        low, high = self.latency
+        if high > 0:
+            await asyncio.sleep(self.rng.uniform(low, high))
+        draw = self.rng.random()
+        if draw < self.p429:
+            self.counts["429"] += 1
+            return web.Response(status=429, headers={"Retry-After": str(self.retry_after)})
+        if draw < self.p429 + self.p500:
+            self.counts["500"] += 1
+            return web.Response(status=500)
+        return await handler(request)
+
+
+def create_app(recorded_dir=None, mp3_size=2_000_000, verses_per_chapter=30, faults=None):
+    cache = HtmlCache(recorded_dir) if recorded_dir and Path(recorded_dir).exists() else None
+    mp3_payload = synthetic_mp3(mp3_size)
+    faults = faults or FaultInjector()
+
+    async def chapter(request):
+        html = cache.get(REAL_BASE_URL + request.path) if cache else None
+        if html is None:
+            html = synthetic_chapter(request.match_info["ref"], verses_per_chapter)
+        etag = f'"{zlib.crc32(html.encode("utf-8")):08x}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=html, content_type="text/html", headers={"ETag": etag})
+
+    async def audio_page(request):
+        ref = request.match_info["ref"]
+        html = f'<html><body><audio src="/audio/{ref}.mp3"></audio></body></html>'
+        return web.Response(text=html, content_type="text/html")
+
+    async def mp3(request):
+        return web.Response(body=mp3_payload, content_type="audio/mpeg")
+
+    app = web.Application(middlewares=[faults.middleware])
+    app["faults"] = faults
+    app.router.add_get("/audio/{ref}.mp3", mp3)
+    for prefix in ("", "/{locale}"):
+        app.router.add_get(prefix + "/bible/{version}/{ref}", chapter)
+        app.router.add_get(prefix + "/audio-bible/{version}/{ref}", audio_page)
+    return app
+
+
+async def start_server(app, host="127.0.0.1", port=8765):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    return runner
+
+
+def build_arg_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--recorded", type=Path, default=HTML_CACHE_DIR, help="Cache HTML enregistré")
+    parser.add_argument("--mp3-size", type=int, default=2_000_000, help="Taille des MP3 synthétiques (octets)")
+    parser.add_argument("--verses", type=int, default=30, help="Versets par chapitre synthétique")
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--p429", type=float, default=0.0, help="Probabilité de réponse 429")
+    parser.add_argument("--p500", type=float, default=0.0, help="Probabilité de réponse 500")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def app_from_args(args):
+    faults = FaultInjector(tuple(args.latency), args.p429, args.p500, args.retry_after, args.seed)
+    return create_app(args.recorded, args.mp3_size, args.verses, faults)
+
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+    print(f"Serveur de fixtures sur http://{args.host}:{args.port}")
+    web.run_app(app_from_args(args), host=args.host, port=args.port)
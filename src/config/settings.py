@@ -14,24 +14,130 @@ GEGBE_AUDIO_DIR = GEGBE_RAW_DIR / "audio"
 GEGBE_TEXT_DIR = GEGBE_RAW_DIR / "texts"
 GEGBE_META_DIR = GEGBE_RAW_DIR / "metadata"
 
+# Scraping (budget global partagé entre toutes les versions scrapées en parallèle)
+SCRAPER_MAX_CONCURRENCY = 4        # Chapitres traités simultanément (toutes langues confondues)
+SCRAPER_REQUESTS_PER_SECOND = 1.0  # Débit maximal de requêtes vers bible.com
+SCRAPER_MAX_RETRIES = 3            # Reprises sur 429 / 5xx / erreur réseau
+SCRAPER_RETRY_BACKOFF = 2.0        # Délai initial (s) des reprises, doublé à chaque essai
+SCRAPER_USE_BROWSER = True         # crawl4ai pour les pages non cachées (False = HTTP simple)
+HTML_CACHE_DIR = PROJECT_ROOT / "data" / "raw" / "html_cache"  # Pages brutes (gzip), pour re-parser hors ligne
+HTML_CACHE_REVALIDATE = True       # False = servir le cache sans aucune requête réseau
+
+# Stockage des textes bruts des versets : "files" (un .txt par verset),
+# "chapter" ou "book" (shards JSONL + index d'offsets, bien moins de fichiers)
+TEXT_STORAGE_LAYOUT = "files"
+TEXT_STORE_COMPACT_RATIO = 0.25  # "book" : compactage en fin de scraping au-delà de 25 % d'octets orphelins
+
 # Processed Data
 PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
+# Corpus parallèle Mina / Ewe : alignement incrémental par chapitre (empreinte du contenu
+# des deux côtés, seuls les chapitres nouveaux ou modifiés sont réalignés)
+PARALLEL_INCREMENTAL = True
+PARALLEL_SHARDS_DIR = PROCESSED_DIR / "parallel_shards"  # Un CSV par chapitre + index.json
+
+# Conversion audio (MP3 -> WAV 16 kHz)
+AUDIO_CONVERSION_WORKERS = 4  # Processus ffmpeg simultanés
+
+# Dataset ASR : "export" (un WAV par verset dans audio_split/) ou
+# "offsets" (bible_asr_segments.csv : offsets dans les WAV de chapitre, lus à la volée)
+ASR_DATASET_MODE = "export"
+ASR_ALIGNMENT_WORKERS = 4  # Processus d'alignement des chapitres en parallèle
+
+# Cache persistant des features Whisper (log-mel float16 + tokens), partagé entre entraînements
+ASR_FEATURE_STORE = True
+FEATURE_STORE_DIR = PROCESSED_DIR / "feature_store"
+FEATURE_STORE_SHARD_SIZE = 512  # Exemples par shard (~240 Mo de features en float16)
+# Signaux par STFT dans BatchedLogMel. 1 = le plus rapide sur CPU (scripts/bench_log_mel.py) ;
+# des lots plus grands ne paient qu'avec plusieurs threads BLAS / FFT
+LOG_MEL_BATCH_SIZE = 1
+
+# Pré-filtrage du manifeste ASR (en-têtes WAV + tokenisation, avant toute extraction)
+ASR_MIN_DURATION_MS = 500     # Segments plus courts : alignement raté / inutiles
+ASR_MAX_DURATION_MS = 30000   # Fenêtre Whisper : au-delà, l'audio serait tronqué
+ASR_MAX_LABEL_TOKENS = 448    # Limite du décodeur Whisper
+
+# Packing : versets consécutifs d'un même chapitre regroupés en exemples <= 30 s
+# (l'encodeur Whisper traite toujours 30 s, padding compris)
+ASR_PACKING = False
+ASR_PACKING_MAX_MS = 30000
+ASR_PACKING_GAP_MS = 200      # Silence inséré entre deux fichiers (mode export)
+
 # Training Hyperparameters (CPU Optimized)
 ASR_MODEL_SIZE = "base"  # Options: tiny, base, small
-ASR_FREEZE_PERCENT = 0.9  # Freeze 90% of parameters
+ASR_FREEZE_POLICY = "percent"  # Options: none, percent (ASR_FREEZE_PERCENT), encoder
+ASR_FREEZE_PERCENT = 0.9  # Freeze 90% of parameters (premières couches d'abord)
+ASR_CACHE_ENCODER_OUTPUTS = True  # Encodeur entièrement gelé : sorties calculées une fois, sur disque
+ASR_PRECISION = "auto"  # Options: auto (bf16 si AVX512-BF16/AMX), bf16, fp32 (autocast CPU)
+ASR_TORCH_COMPILE = False  # torch.compile (inductor) : compilation longue au 1er pas, pas suivants plus rapides
 ASR_LEARNING_RATE = 1e-4
-ASR_BATCH_SIZE = 4
+ASR_BATCH_SIZE = 4  # Micro-lot fixe, si ASR_AUTO_BATCH = False (ou mesure impossible)
+# Réglage automatique selon la RAM : pic RSS par exemple mesuré sur quelques pas avant l'entraînement,
+# puis plus grand micro-lot tenant dans le budget, threads et accumulation jusqu'au lot effectif visé
+ASR_AUTO_BATCH = True
+ASR_MEMORY_BUDGET_GB = None   # None = ASR_MEMORY_HEADROOM x RAM disponible au lancement
+ASR_MEMORY_HEADROOM = 0.8
+ASR_TARGET_BATCH = 16         # Lot effectif (micro-lot x accumulation x processus)
+ASR_MAX_MICRO_BATCH = 32
 ASR_EPOCHS = 10
 TRAINING_NUM_CORES = 4  # Réduit de 10 à 4 pour économiser la RAM sur PC modeste
 ASR_MAX_SAMPLES = 5000   # Limite optionnelle pour éviter les crashs si le dataset est trop gros
+# Streaming : manifeste lu à la volée par les workers du DataLoader, mémoire bornée,
+# corpus complet (ASR_MAX_SAMPLES ignoré)
+ASR_STREAMING = False
+ASR_SHUFFLE_BUFFER = 2000           # Lignes du manifeste en attente de mélange (par worker)
+ASR_STREAMING_EVAL_SAMPLES = 500    # Exemples d'évaluation (chapitres réservés)
+# Évaluation pendant l'entraînement : sous-ensemble fixe stratifié par longueur, décodage glouton
+# et longueur réduite ; WER du split complet calculé sur les checkpoints dans un processus séparé
+ASR_FAST_EVAL = True
+ASR_FAST_EVAL_SAMPLES = 200
+ASR_FAST_EVAL_MAX_LENGTH = 128
+ASR_ASYNC_FULL_EVAL = True          # Nécessite ASR_FEATURE_STORE (le processus relit les features)
+ASR_FULL_EVAL_THREADS = 2
+# Data-parallel CPU (DDP gloo) : python -m src.models.launch_ddp_cpu --nproc N
+ASR_DDP_BACKEND = "gloo"
+ASR_DDP_DATALOADER_WORKERS = 1      # Workers DataLoader par processus (features déjà en cache)
+ASR_DDP_SHARED_STORAGE = False      # True si data/ et models/ sont partagés (NFS) entre les nœuds
 
 # NMT Hyperparameters
 NMT_MODEL_SIZE = "nllb-200-distilled-600M"
 NMT_QUANTIZATION = "int8"
 NMT_DEVICE = "cpu"
+# Le Mina n'a pas de code NLLB : la source est tokenisée comme de l'Ewe (langue gbe la plus proche)
+NMT_SRC_LANG = "ewe_Latn"
+NMT_TGT_LANG = "ewe_Latn"
+NMT_MAX_LENGTH = 128
+# Fine-tuning Mina -> Ewe sur CPU : adaptateurs LoRA seuls (poids de NLLB gelés)
+NMT_USE_LORA = True
+NMT_LORA_RANK = 16
+NMT_LORA_ALPHA = 32
+NMT_LORA_DROPOUT = 0.05
+NMT_LORA_TARGETS = ["q_proj", "k_proj", "v_proj", "out_proj"]
+NMT_LEARNING_RATE = 3e-4
+NMT_BATCH_SIZE = 16
+NMT_EPOCHS = 3
+NMT_TOKENIZED_DIR = PROCESSED_DIR / "nmt_tokenized"  # Corpus tokenisé en cache (datasets.save_to_disk)
+# Vocabulaire réduit aux tokens du corpus (src/models/vocab_trim.py) : utilisé en priorité s'il existe
+NMT_TRIMMED_DIR = PROJECT_ROOT / "models" / "nllb-mina-ewe-trimmed"
+# Niveau zéro : table de segments Mina -> Ewe (src/models/phrase_table.py), NLLB seulement en repli
+NMT_PHRASE_TABLE = True
+PHRASE_TABLE_PATH = PROCESSED_DIR / "mina_ewe_phrase_table.tsv.gz"
+PHRASE_TABLE_MAX_PHRASE = 4         # Mots par segment
+PHRASE_TABLE_MIN_COUNT = 2          # Segments source vus moins souvent : écartés
+PHRASE_TABLE_ITERATIONS = 5         # Itérations EM de l'alignement mot à mot
+PHRASE_TABLE_MIN_COVERAGE = 1.0     # Part des mots source présents dans la table
+PHRASE_TABLE_MIN_CONFIDENCE = 0.6   # Moyenne géométrique par mot de p(ewe | mina)
 
 # External Models
 EWE_FR_MODEL = "Helsinki-NLP/opus-mt-ee-fr"
 
+# Distillation de la cascade en un élève Mina -> Français (src/models/distill_mina_fr.py)
+CASCADE_MODE = "cascade"            # "cascade" (NLLB puis OPUS-MT) ou "direct" (élève distillé)
+DISTILL_STUDENT_INIT = EWE_FR_MODEL  # Marian Ewe -> Français : même taille, langue source la plus proche
+DISTILL_TEACHER_BATCH_SIZE = 16     # Phrases par appel à la cascade lors de la génération des cibles
+DISTILL_LEARNING_RATE = 2e-4
+DISTILL_EPOCHS = 5
+DISTILL_CSV = PROCESSED_DIR / "mina_fr_distill.csv"
+MINA_FR_STUDENT_DIR = PROJECT_ROOT / "models" / "marian-mina-fr-student"
+MINA_FR_CT2_DIR = PROJECT_ROOT / "models" / "mina_fr_ct2"
@@ -0,0 +1,203 @@
+"""
+Évaluation de Whisper hors du chemin critique de l'entraînement.
+
+Pendant l'entraînement, le Seq2SeqTrainer n'évalue qu'un sous-ensemble fixe, stratifié
+par longueur de transcription, en décodage glouton avec une longueur réduite
+(ASR_FAST_EVAL). Le WER sur tout le split de test est calculé sur les checkpoints
+sauvegardés, dans un processus séparé (peu de threads, priorité basse), et écrit dans
+TensorBoard (<output_dir>/runs/full_eval, courbe eval_full/wer).
+
+    python -m src.models.async_eval models/whisper-ewe-gegbe-local/checkpoint-200 \\
+        --spec models/whisper-ewe-gegbe-local/full_eval_spec.json
+"""
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+from transformers import TrainerCallback
+
+from src.config.settings import ASR_FULL_EVAL_THREADS, PROJECT_ROOT
+from src.models.encoder_cache import EncoderOutputDataset
+from src.models.feature_store import FeatureStore, FeatureStoreDataset
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SPEC_FILE = "full_eval_spec.json"
+RESULT_FILE = "full_eval.json"
+TENSORBOARD_TAG = "eval_full/wer"
+
+
+# ---------------------------------------------------------------------
+# Sous-ensemble d'évaluation rapide
+# ---------------------------------------------------------------------
+def label_lengths(dataset):
+    """Longueur des labels de chaque exemple ; None si inconnue (dataset en streaming)."""
+    store = getattr(dataset, "store", None) or getattr(getattr(dataset, "cache", None), "store", None)
+    if store is not None:
+        return [store.label_length(key) for key in dataset.keys]
+    if hasattr(dataset, "column_names") and "labels" in dataset.column_names:
+        return [len(labels) for labels in dataset["labels"]]
+    return None
+
+
+def stratified_indices(lengths, n, bins=5, seed=42):
+    """
+    `n` indices tirés proportionnellement dans `bins` tranches de longueur (quantiles) :
+    versets courts et longs restent représentés, et le tirage est identique à chaque évaluation.
+    """
+    if n >= len(lengths):
+        return list(range(len(lengths)))
+    rng = np.random.default_rng(seed)
+    order = np.argsort(lengths, kind="stable")
+    picked = []
+    for stratum in np.array_split(order, bins):
+        take = int(round(n * len(stratum) / len(lengths)))
+        picked += rng.choice(stratum, size=min(take, len(stratum)), replace=False).tolist()
+    return sorted(picked)
+
+
+def subset_dataset(dataset, indices):
+    if isinstance(dataset, FeatureStoreDataset):
+        return FeatureStoreDataset(dataset.store, [dataset.keys[i] for i in indices])
+    if isinstance(dataset, EncoderOutputDataset):
+        return EncoderOutputDataset(dataset.cache, [dataset.keys[i] for i in indices])
+    return dataset.select(indices)
+
+
+def fast_eval_subset(dataset, n):
+    lengths = label_lengths(dataset)
+    if lengths is None:
+        return dataset
+    indices = stratified_indices(lengths, n)
+    logger.info(f"Évaluation rapide : {len(indices)}/{len(lengths)} exemples (stratifiés par longueur)")
+    return subset_dataset(dataset, indices)
+
+
+# ---------------------------------------------------------------------
+# Évaluation complète asynchrone des checkpoints
+# ---------------------------------------------------------------------
+def write_spec(output_dir, model_name, dataset, max_length, batch_size) -> Path:
+    """Décrit le split de test complet (clés du FeatureStore) pour le processus d'évaluation."""
+    path = Path(output_dir) / SPEC_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    store = getattr(dataset, "store", None) or dataset.cache.store
+    spec = {"model_name": model_name, "store_root": str(store.store_dir.parent), "keys": list(dataset.keys),
+            "max_length": max_length, "batch_size": batch_size}
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return path
+
+
+class FullEvalCallback(TrainerCallback):
+    """
+    À chaque sauvegarde, lance l'évaluation complète du checkpoint dans un processus
+    séparé (un seul à la fois ; les checkpoints suivants attendent leur tour).
+    """
+
+    def __init__(self, spec_path, threads=None):
+        self.spec_path = str(spec_path)
+        self.threads = threads or ASR_FULL_EVAL_THREADS
+        self.pending = []
+        self.process = None
+
+    def _launch(self, args):
+        if not self.pending or (self.process is not None and self.process.poll() is None):
+            return
+        env = os.environ.copy()
+        env["OMP_NUM_THREADS"] = env["MKL_NUM_THREADS"] = str(self.threads)
+        # Processus indépendant de l'éventuel groupe DDP de l'entraînement
+        for name in ("RANK", "LOCAL_RANK", "WORLD_SIZE", "LOCAL_WORLD_SIZE", "MASTER_ADDR", "MASTER_PORT"):
+            env.pop(name, None)
+        cmd = [sys.executable, "-m", "src.models.async_eval", *self.pending, "--spec", self.spec_path,
+               "--logdir", str(Path(args.output_dir) / "runs" / "full_eval")]
+        self.process = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env)
+        logger.info(f"Évaluation complète en arrière-plan (pid {self.process.pid}) : "
+                    f"{', '.join(Path(p).name for p in self.pending)}")
+        self.pending = []
+
+    def on_save(self, args, state, control, **kwargs):
+        if state.is_world_process_zero:
+            self.pending.append(str(Path(args.output_dir) / f"checkpoint-{state.global_step}"))
+            self._launch(args)
+
+    def on_log(self, args, state, control, **kwargs):
+        if state.is_world_process_zero:
+            self._launch(args)
+
+    def on_train_end(self, args, state, control, **kwargs):
+        if not state.is_world_process_zero or not self.pending:
+            return
+        if self.process is not None:
+            self.process.wait()
+        self._launch(args)
+
+
+def checkpoint_step(checkpoint: Path) -> int:
+    match = re.search(r"checkpoint-(\d+)$", str(checkpoint))
+    return int(match.group(1)) if match else 0
+
+
+def evaluate_checkpoint(checkpoint, spec, processor, store, wer_metric, precision):
+    from transformers import WhisperForConditionalGeneration
+    from src.models.cpu_precision import autocast
+
+    model = WhisperForConditionalGeneration.from_pretrained(checkpoint)
+    model.eval()
+    keys, batch_size = spec["keys"], spec["batch_size"]
+    predictions, references = [], []
+    with torch.no_grad(), autocast(precision):
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            features = torch.from_numpy(np.stack([store.features(k) for k in batch]).astype(np.float32))
+            ids = model.generate(features, max_length=spec["max_length"])
+            predictions += processor.tokenizer.batch_decode(ids, skip_special_tokens=True)
+            references += processor.tokenizer.batch_decode([store.labels(k) for k in batch], skip_special_tokens=True)
+    return wer_metric.compute(predictions=predictions, references=references)
+
+
+def main():
+    import argparse
+    import evaluate
+    from torch.utils.tensorboard import SummaryWriter
+    from transformers import WhisperProcessor
+    from src.models.cpu_precision import resolve_precision
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("checkpoints", type=Path, nargs="+")
+    parser.add_argument("--spec", type=Path, required=True)
+    parser.add_argument("--logdir", type=Path, default=None, help="Défaut : <output_dir>/runs/full_eval")
+    args = parser.parse_args()
+
+    if hasattr(os, "nice"):
+        os.nice(10)  # L'entraînement garde la priorité sur les cœurs partagés
+    spec = json.loads(args.spec.read_text(encoding="utf-8"))
+    processor = WhisperProcessor.from_pretrained(spec["model_name"], task="transcribe")
+    store = FeatureStore(processor, root=spec["store_root"])
+    wer_metric = evaluate.load("wer")
+    precision = resolve_precision()
+    writer = SummaryWriter(log_dir=str(args.logdir or args.spec.parent / "runs" / "full_eval"))
+
+    for checkpoint in args.checkpoints:
+        if not checkpoint.exists():
+            # Checkpoint supprimé entre-temps (save_total_limit)
+            logger.warning(f"Checkpoint introuvable : {checkpoint}")
+            continue
+        step = checkpoint_step(checkpoint)
+        wer = evaluate_checkpoint(checkpoint, spec, processor, store, wer_metric, precision)
+        writer.add_scalar(TENSORBOARD_TAG, wer, step)
+        writer.flush()
+        (checkpoint / RESULT_FILE).write_text(
+            json.dumps({"step": step, "wer": wer, "samples": len(spec["keys"])}), encoding="utf-8"
+        )
+        logger.info(f"{checkpoint.name} : WER complet {wer:.4f} ({len(spec['keys'])} exemples)")
+    writer.close()
+
+
+if __name__ == "__main__":
+    main()
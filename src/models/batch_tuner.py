@@ -0,0 +1,211 @@
+import io
+import logging
+import math
+import os
+import queue
+import time
+from dataclasses import dataclass
+
+import torch
+import torch.multiprocessing as mp
+from transformers.modeling_outputs import BaseModelOutput
+
+from src.config.settings import (
+    ASR_MEMORY_BUDGET_GB,
+    ASR_MEMORY_HEADROOM,
+    ASR_TARGET_BATCH,
+    ASR_MAX_MICRO_BATCH,
+)
+from src.models.cpu_precision import autocast
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows : pas de pic RSS, on garde ASR_BATCH_SIZE
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 600  # s sans nouvelle mesure (whisper-small, encodeur complet, gros lot)
+
+
+@dataclass
+class BatchPlan:
+    micro_batch: int
+    grad_accum: int
+    threads: int
+    per_sample_mb: float
+    base_mb: float
+    budget_mb: float
+
+    @property
+    def peak_mb(self) -> float:
+        return self.base_mb + self.per_sample_mb * self.micro_batch
+
+
+def available_memory_mb() -> float:
+    """RAM disponible (MemAvailable sous Linux, pages libres sinon)."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def memory_budget_mb(budget_gb=None, processes: int = 1) -> float:
+    """Budget mémoire d'un processus d'entraînement : ASR_MEMORY_BUDGET_GB ou une part de la RAM disponible."""
+    budget_gb = ASR_MEMORY_BUDGET_GB if budget_gb is None else budget_gb
+    total = budget_gb * 1024 if budget_gb else available_memory_mb() * ASR_MEMORY_HEADROOM
+    return total / processes
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def fit_memory(points):
+    """(base, par exemple) en Mo, ajustés sur les pics RSS [(lot, pic)] : pic = base + lot x par_exemple."""
+    if len(points) == 1:
+        # Un seul point : hypothèse prudente, tout le pic est proportionnel au lot
+        batch, peak = points[0]
+        return 0.0, peak / batch
+    (b1, p1), (b2, p2) = points[-2], points[-1]
+    per_sample = max((p2 - p1) / (b2 - b1), 1.0)
+    return p2 - per_sample * b2, per_sample
+
+
+def plan_batch(points, budget_mb, target_batch=None, world_size=1, threads=1, max_micro_batch=None) -> BatchPlan:
+    """
+    Plus grand micro-lot tenant dans le budget, puis accumulation de gradient pour
+    atteindre le lot effectif visé (micro-lot x accumulation x processus >= cible).
+    Le micro-lot est ensuite réduit au plus juste pour ce nombre d'accumulations.
+    """
+    target_batch = target_batch or ASR_TARGET_BATCH
+    max_micro_batch = max_micro_batch or ASR_MAX_MICRO_BATCH
+    base, per_sample = fit_memory(points)
+    safe = int((budget_mb - base) // per_sample)
+    per_process = math.ceil(target_batch / world_size)
+    micro = max(1, min(safe, max_micro_batch, per_process))
+    accum = math.ceil(per_process / micro)
+    micro = math.ceil(per_process / accum)
+    return BatchPlan(micro, accum, threads, per_sample, base, budget_mb)
+
+
+def synthetic_batch(model, batch_size, label_length, cached_encoder):
+    """Lot au pire cas (labels de longueur maximale) de même forme que les vrais lots."""
+    labels = torch.randint(0, model.config.vocab_size, (batch_size, label_length))
+    if cached_encoder:
+        hidden = torch.randn(batch_size, model.config.max_source_positions, model.config.d_model)
+        return {"encoder_outputs": BaseModelOutput(last_hidden_state=hidden), "labels": labels}
+    return {"input_features": torch.randn(batch_size, model.config.num_mel_bins, 3000), "labels": labels}
+
+
+def _probe(model_bytes, batch_sizes, thread_counts, label_length, cached_encoder, precision, budget_mb, results):
+    """
+    Processus de sonde (pic RSS propre, un éventuel OOM ne tue pas l'entraînement) :
+    un pas complet (forward, backward, AdamW) par taille de lot croissante, arrêt dès que
+    le lot suivant dépasserait le budget ; puis temps d'un pas selon le nombre de threads.
+    """
+    torch.set_num_threads(max(thread_counts))
+    model = torch.load(io.BytesIO(model_bytes), weights_only=False)
+    del model_bytes
+    model.train()
+    optimizer = torch.optim.AdamW([p for p in model.parameters() if p.requires_grad], lr=0.0)
+
+    def step(batch):
+        start = time.perf_counter()
+        with autocast(precision):
+            loss = model(**batch).loss
+        loss.backward()
+        optimizer.step()
+        optimizer.zero_grad(set_to_none=False)
+        return time.perf_counter() - start
+
+    points = []
+    for i, batch_size in enumerate(batch_sizes):
+        step(synthetic_batch(model, batch_size, label_length, cached_encoder))
+        points.append((batch_size, peak_rss_mb()))
+        results.put(("memory", batch_size, points[-1][1]))
+        base, per_sample = fit_memory(points)
+        if i + 1 < len(batch_sizes) and base + per_sample * batch_sizes[i + 1] > budget_mb:
+            break
+
+    if len(thread_counts) > 1:
+        plan = plan_batch(points, budget_mb)
+        batch = synthetic_batch(model, plan.micro_batch, label_length, cached_encoder)
+        step(batch)  # Préchauffage
+        for threads in thread_counts:
+            torch.set_num_threads(threads)
+            results.put(("threads", threads, step(batch) / plan.micro_batch))
+    results.put(("done",))
+
+
+def probe_batch_plan(model, label_length, cached_encoder=False, precision="fp32", threads=None,
+                     tune_threads=True, budget_mb=None, world_size=1, target_batch=None) -> BatchPlan:
+    """
+    Mesure le pic RSS par exemple sur quelques pas forward/backward à lots croissants
+    (1, 2, 4, ...) dans un processus séparé, puis choisit micro-lot, threads et
+    accumulation de gradient pour le budget mémoire (cf. plan_batch).
+    Retourne None si la mesure est impossible (Windows) : garder ASR_BATCH_SIZE.
+    """
+    if not RESOURCE_AVAILABLE:
+        logger.warning("Pic RSS non mesurable sur cette plateforme : réglage automatique du lot désactivé.")
+        return None
+    threads = threads or torch.get_num_threads()
+    budget_mb = budget_mb or memory_budget_mb()
+    batch_sizes = [2 ** i for i in range(int(math.log2(ASR_MAX_MICRO_BATCH)) + 1)]
+    thread_counts = sorted({threads, *(threads // 2 ** i for i in range(1, 4) if threads // 2 ** i >= 1)},
+                           reverse=True) if tune_threads else [threads]
+
+    # Copie sérialisée (gel compris) plutôt que des tenseurs partagés : /dev/shm est souvent petit
+    buffer = io.BytesIO()
+    torch.save(model, buffer)
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_probe, args=(buffer.getvalue(), batch_sizes, thread_counts, label_length,
+                                               cached_encoder, precision, budget_mb, results))
+    logger.info(f"Sonde mémoire : budget {budget_mb / 1024:.1f} Go, labels de {label_length} tokens, "
+                f"{'décodeur seul' if cached_encoder else 'modèle complet'}, {precision}")
+    process.start()
+    del buffer
+    points, timings = [], {}
+    last_message = time.monotonic()
+    try:
+        while True:
+            try:
+                message = results.get(timeout=1)
+            except queue.Empty:
+                if process.is_alive() and time.monotonic() - last_message < PROBE_TIMEOUT:
+                    continue
+                # Processus de sonde tué (OOM) ou bloqué : on garde les mesures déjà reçues
+                logger.warning(f"Sonde interrompue (code {process.exitcode}) après {len(points)} mesures.")
+                break
+            last_message = time.monotonic()
+            if message[0] == "done":
+                break
+            if message[0] == "memory":
+                points.append(message[1:])
+                logger.info(f"  lot {message[1]:>3} : pic RSS {message[2]:.0f} Mo")
+            else:
+                timings[message[1]] = message[2]
+                logger.info(f"  {message[1]:>3} threads : {message[2]:.2f} s/exemple")
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    if not points:
+        logger.warning("Aucune mesure mémoire : réglage automatique du lot désactivé.")
+        return None
+
+    if timings:
+        # Le plus rapide ; à 5 % près, le moins de threads (cœurs libres pour le DataLoader)
+        best = min(timings.values())
+        threads = min(t for t, s in timings.items() if s <= best * 1.05)
+    plan = plan_batch(points, budget_mb, target_batch, world_size, threads)
+    logger.info(f"Lot retenu : micro-lot {plan.micro_batch} x accumulation {plan.grad_accum} x {world_size} "
+                f"processus, {plan.threads} threads ({plan.per_sample_mb:.0f} Mo/exemple, "
+                f"pic estimé {plan.peak_mb / 1024:.1f} / {budget_mb / 1024:.1f} Go)")
+    return plan
@@ -0,0 +1,60 @@
+import logging
+from pathlib import Path
+
+import torch
+
+from src.config.settings import ASR_PRECISION
+
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ("auto", "fp32", "bf16")
+# Instructions bf16 natives (Cooper Lake / Sapphire Rapids, Zen 4+)
+BF16_CPU_FLAGS = ("avx512_bf16", "amx_bf16")
+
+
+def cpu_flags() -> set:
+    """Drapeaux du processeur (/proc/cpuinfo) ; ensemble vide hors Linux."""
+    try:
+        text = Path("/proc/cpuinfo").read_text()
+    except OSError:
+        return set()
+    for line in text.splitlines():
+        if line.startswith("flags"):
+            return set(line.split(":", 1)[1].split())
+    return set()
+
+
+def cpu_bf16_supported() -> bool:
+    """Vrai si le CPU exécute les matmuls bf16 nativement (AVX512-BF16 / AMX)."""
+    flags = cpu_flags()
+    if flags:
+        return any(flag in flags for flag in BF16_CPU_FLAGS)
+    # Hors Linux : diagnostic de oneDNN (bf16 natif ou AVX-512 suffisant)
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def resolve_precision(precision=None) -> str:
+    """
+    Précision d'entraînement effective (ASR_PRECISION) :
+    - "auto" : bf16 si le CPU le supporte nativement, sinon fp32
+    - "bf16" : autocast bf16 forcé (émulé, donc lent, sans support matériel)
+    - "fp32" : aucun autocast
+    """
+    precision = precision or ASR_PRECISION
+    if precision not in PRECISIONS:
+        raise ValueError(f"Précision inconnue : {precision}. Options : {PRECISIONS}")
+    supported = cpu_bf16_supported()
+    if precision == "auto":
+        precision = "bf16" if supported else "fp32"
+    elif precision == "bf16" and not supported:
+        logger.warning("bf16 demandé sans support matériel (AVX512-BF16/AMX) : calcul émulé, probablement plus lent.")
+    logger.info(f"Précision d'entraînement : {precision} (bf16 natif : {'oui' if supported else 'non'})")
+    return precision
+
+
+def autocast(precision: str):
+    """Contexte autocast CPU (forward ; le backward suit les types enregistrés) pour `precision`."""
+    return torch.autocast("cpu", dtype=torch.bfloat16, enabled=precision == "bf16")
@@ -0,0 +1,144 @@
+"""
+Distillation séquentielle de la cascade Mina -> Ewe -> Français en un élève Marian
+Mina -> Français (un seul décodage par requête au lieu de deux).
+
+1. `targets` : la cascade (TranslationCascade) traduit par lots la colonne mina du
+   corpus parallèle ; les sorties sont ajoutées à DISTILL_CSV (mina, ewe, french),
+   la génération reprend là où elle s'est arrêtée.
+2. `train` : fine-tuning de l'élève (initialisé depuis OPUS-MT Ewe -> Français) sur
+   les paires mina -> french de la cascade -> MINA_FR_STUDENT_DIR.
+3. `export` : conversion CTranslate2 int8 -> MINA_FR_CT2_DIR, chargée par le mode
+   "direct" de TranslationCascade.
+
+    python -m src.models.distill_mina_fr all
+    python -m src.models.distill_mina_fr targets --limit 2000
+"""
+import csv
+import logging
+import time
+
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from src.config.settings import (
+    DISTILL_CSV,
+    DISTILL_EPOCHS,
+    DISTILL_LEARNING_RATE,
+    DISTILL_STUDENT_INIT,
+    DISTILL_TEACHER_BATCH_SIZE,
+    MINA_FR_CT2_DIR,
+    MINA_FR_STUDENT_DIR,
+    NMT_QUANTIZATION,
+    PROJECT_ROOT,
+)
+from src.models.train_translation_cpu import PARALLEL_CSV, build_trainer, peak_rss_mb, tokenized_splits
+
+try:
+    import ctranslate2
+    CTRANSLATE2_AVAILABLE = True
+except ImportError:
+    CTRANSLATE2_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STUDENT_OUTPUT_DIR = PROJECT_ROOT / "models" / "marian-mina-fr-local"  # Checkpoints intermédiaires
+DISTILL_COLUMNS = ["mina", "ewe", "french"]
+
+
+def read_mina_sentences(csv_path=None):
+    """Phrases Mina non vides du corpus parallèle, dans l'ordre du fichier."""
+    with open(csv_path or PARALLEL_CSV, encoding="utf-8", newline="") as f:
+        return [row["mina"].strip() for row in csv.DictReader(f) if (row.get("mina") or "").strip()]
+
+
+def generate_distillation_targets(csv_path=None, output_csv=None, cascade=None,
+                                  batch_size=DISTILL_TEACHER_BATCH_SIZE, limit=None):
+    """
+    Traduit le Mina du corpus parallèle avec la cascade complète et ajoute les
+    triplets (mina, ewe, french) à `output_csv`, écrit au fil des lots : une
+    génération interrompue reprend après la dernière ligne écrite.
+    """
+    output_csv = output_csv or DISTILL_CSV
+    sentences = read_mina_sentences(csv_path)[:limit]
+    done = 0
+    if output_csv.exists():
+        with open(output_csv, encoding="utf-8", newline="") as f:
+            done = sum(1 for _ in csv.DictReader(f))
+    if done >= len(sentences):
+        logger.info(f"Cibles de distillation déjà générées : {output_csv} ({done} phrases)")
+        return output_csv
+
+    if cascade is None:
+        from src.pipeline.translate_cascade import TranslationCascade
+        cascade = TranslationCascade(mode="cascade")
+
+    logger.info(f"Génération des cibles par la cascade : {len(sentences) - done} phrases (reprise à {done})")
+    start = time.perf_counter()
+    with open(output_csv, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=DISTILL_COLUMNS)
+        if done == 0:
+            writer.writeheader()
+        for first in range(done, len(sentences), batch_size):
+            writer.writerows(cascade.translate_batch_mina_to_french(sentences[first:first + batch_size]))
+            f.flush()
+            translated = min(first + batch_size, len(sentences))
+            elapsed = time.perf_counter() - start
+            logger.info(f"  {translated}/{len(sentences)} phrases ({(translated - done) / elapsed:.2f} phrases/s)")
+    return output_csv
+
+
+def train_student(distill_csv=None, init_model=None, output_dir=None, max_steps=-1):
+    """Fine-tune l'élève Marian sur les paires mina -> french produites par la cascade."""
+    distill_csv = distill_csv or DISTILL_CSV
+    init_model = init_model or DISTILL_STUDENT_INIT
+    output_dir = output_dir or MINA_FR_STUDENT_DIR
+    if not distill_csv.exists():
+        raise FileNotFoundError(f"Cibles de distillation introuvables : {distill_csv}. Lancez l'étape `targets`.")
+
+    print(f"--- Distillation de la cascade dans {init_model} (Mina -> Français) ---")
+    tokenizer = AutoTokenizer.from_pretrained(init_model)
+    splits = tokenized_splits(distill_csv, tokenizer, target_column="french")
+    model = AutoModelForSeq2SeqLM.from_pretrained(init_model)
+    logger.info(f"Élève : {sum(p.numel() for p in model.parameters()) / 1e6:.0f}M paramètres")
+
+    trainer = build_trainer(model, tokenizer, splits, STUDENT_OUTPUT_DIR, max_steps,
+                            learning_rate=DISTILL_LEARNING_RATE, num_train_epochs=DISTILL_EPOCHS)
+    metrics = trainer.train().metrics
+    print(f"Entraînement : {metrics.get('train_samples_per_second', 0):.2f} paires/s, "
+          f"pic mémoire {peak_rss_mb():.0f} Mo")
+
+    model.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    logger.info(f"Élève sauvegardé : {output_dir}")
+    return model, tokenizer
+
+
+def export_ctranslate2(model_dir=None, output_dir=None, quantization=NMT_QUANTIZATION):
+    """Convertit l'élève au format CTranslate2 (int8 par défaut) pour le mode "direct" de la cascade."""
+    if not CTRANSLATE2_AVAILABLE:
+        raise ImportError("ctranslate2 est requis pour l'export : pip install ctranslate2")
+    model_dir = model_dir or MINA_FR_STUDENT_DIR
+    output_dir = output_dir or MINA_FR_CT2_DIR
+    converter = ctranslate2.converters.TransformersConverter(str(model_dir))
+    converter.convert(str(output_dir), quantization=quantization, force=True)
+    logger.info(f"Élève exporté en CTranslate2 {quantization} : {output_dir}")
+    return output_dir
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("step", choices=["targets", "train", "export", "all"])
+    parser.add_argument("--csv", type=Path, default=PARALLEL_CSV, help="Corpus parallèle (colonne mina)")
+    parser.add_argument("--limit", type=int, default=None, help="Nombre de phrases à faire traduire par la cascade")
+    parser.add_argument("--max-steps", type=int, default=-1)
+    args = parser.parse_args()
+
+    if args.step in ("targets", "all"):
+        generate_distillation_targets(args.csv, limit=args.limit)
+    if args.step in ("train", "all"):
+        train_student(max_steps=args.max_steps)
+    if args.step in ("export", "all"):
+        export_ctranslate2()
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import logging
+from pathlib import Path
+
+import numpy as np
+import torch
+from transformers.modeling_outputs import BaseModelOutput
+
+from src.models.feature_store import FeatureStore
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+
+
+def encoder_fingerprint(model) -> str:
+    """Empreinte des poids de l'encodeur : le cache n'est valable que pour ces poids."""
+    h = hashlib.sha1()
+    for name, tensor in sorted(model.model.encoder.state_dict().items()):
+        h.update(name.encode())
+        h.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return h.hexdigest()[:12]
+
+
+class EncoderOutputCache:
+    """
+    Sorties de l'encodeur Whisper (last_hidden_state, float16) pour chaque exemple du
+    FeatureStore, calculées une seule fois quand l'encodeur est entièrement gelé.
+    Les époques n'exécutent alors plus que le décodeur.
+
+    Stockage : <feature store>/encoder_<empreinte des poids>/shard_XXXXX.npy
+    (n, 1500, d_model), ~1,5 Mo par exemple pour whisper-base.
+    """
+
+    def __init__(self, store: FeatureStore, model):
+        self.store = store
+        self.cache_dir = store.store_dir / f"encoder_{encoder_fingerprint(model)}"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index = {}
+        if self.index_path.exists():
+            self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self._open = {}
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / INDEX_FILE
+
+    def _save_index(self):
+        tmp = self.index_path.with_name(INDEX_FILE + ".tmp")
+        tmp.write_text(json.dumps(self.index), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_open"] = {}
+        return state
+
+    def build(self, model, keys, batch_size=8, shard_size=256):
+        """Calcule les sorties manquantes (no_grad, mode eval), shard par shard."""
+        missing = list(dict.fromkeys(k for k in keys if k not in self))
+        logger.info(f"Cache encodeur {self.cache_dir.name} : {len(keys) - len(missing)} exemples en cache, "
+                    f"{len(missing)} à calculer.")
+        if not missing:
+            return
+        encoder = model.model.encoder
+        was_training = encoder.training
+        encoder.eval()
+        first = len({shard for shard, _ in self.index.values()})
+        try:
+            for n, start in enumerate(range(0, len(missing), shard_size)):
+                chunk = missing[start:start + shard_size]
+                name = f"shard_{first + n:05d}"
+                tmp = self.cache_dir / f"{name}.tmp.npy"
+                hidden = None
+                with torch.no_grad():
+                    for b in range(0, len(chunk), batch_size):
+                        batch_keys = chunk[b:b + batch_size]
+                        features = torch.from_numpy(
+                            np.stack([self.store.features(k) for k in batch_keys]).astype(np.float32)
+                        )
+                        out = encoder(features).last_hidden_state.numpy()
+                        if hidden is None:
+                            hidden = np.lib.format.open_memmap(
+                                tmp, mode="w+", dtype=np.float16, shape=(len(chunk),) + out.shape[1:]
+                            )
+                        hidden[b:b + len(batch_keys)] = out
+                hidden.flush()
+                del hidden
+                os.replace(tmp, self.cache_dir / f"{name}.npy")
+                for row, key in enumerate(chunk):
+                    self.index[key] = [name, row]
+                self._save_index()
+                logger.info(f"{name} : {min(start + shard_size, len(missing))}/{len(missing)} sorties encodeur")
+        finally:
+            encoder.train(was_training)
+
+    def hidden_states(self, key):
+        shard, row = self.index[key]
+        if shard not in self._open:
+            self._open[shard] = np.load(self.cache_dir / f"{shard}.npy", mmap_mode="r")
+        return self._open[shard][row]
+
+
+class EncoderOutputDataset(torch.utils.data.Dataset):
+    """Exemples décodeur seul : sorties encodeur en cache + labels du FeatureStore."""
+
+    def __init__(self, cache: EncoderOutputCache, keys):
+        self.cache = cache
+        self.keys = list(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, idx):
+        key = self.keys[idx]
+        return {
+            # Clé = argument de forward() : le Trainer retire les colonnes inconnues du modèle
+            "encoder_outputs": self.cache.hidden_states(key),
+            "labels": self.cache.store.labels(key).tolist(),
+        }
+
+
+def encoder_outputs_batch(features) -> BaseModelOutput:
+    """Empile les sorties encodeur d'un lot (float16 -> float32) au format attendu par Whisper."""
+    hidden = np.stack([f["encoder_outputs"] for f in features]).astype(np.float32)
+    return BaseModelOutput(last_hidden_state=torch.from_numpy(hidden))
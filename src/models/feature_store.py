@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from src.config.settings import FEATURE_STORE_DIR, FEATURE_STORE_SHARD_SIZE
+from src.preprocessing.log_mel import BatchedLogMel
+from src.preprocessing.segment_reader import SegmentReader, load_waveform
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+INDEX_FILE = "index.json"
+EXTRACT_BATCH = 32  # Signaux chargés puis passés ensemble à BatchedLogMel
+
+
+def config_fingerprint(processor) -> dict:
+    """Ce qui détermine le contenu du store : config du feature extractor + tokenizer."""
+    fe_config = processor.feature_extractor.to_dict()
+    fe_config.pop("processor_class", None)
+    return {
+        "version": STORE_VERSION,
+        "feature_extractor": fe_config,
+        "tokenizer": processor.tokenizer.name_or_path,
+        "vocab_size": len(processor.tokenizer),
+    }
+
+
+def config_hash(config: dict) -> str:
+    return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+
+_segment_reader = None
+
+
+def audio_hash(row: dict) -> str:
+    """Empreinte du signal d'une ligne de dataset (octets PCM du segment, ou du fichier)."""
+    global _segment_reader
+    h = hashlib.sha1()
+    if row.get("parts"):
+        parts = json.loads(row["parts"]) if isinstance(row["parts"], str) else row["parts"]
+        h.update(f"gap:{row.get('gap_ms')}:".encode())
+        for path in parts:
+            h.update(audio_hash({"audio_filepath": path}).encode())
+    elif row.get("chapter_wav"):
+        if _segment_reader is None:
+            _segment_reader = SegmentReader()
+        view, rate, channels = _segment_reader.read(row["chapter_wav"], row["start_ms"], row["end_ms"])
+        h.update(f"{rate}:{channels}:".encode())
+        h.update(np.ascontiguousarray(view).data)
+    else:
+        with open(row["audio_filepath"], "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def sample_key(row: dict) -> str:
+    """Clé d'un exemple : signal + transcription (les labels en dépendent)."""
+    return hashlib.sha1(f"{audio_hash(row)}\0{row['text']}".encode("utf-8")).hexdigest()
+
+
+def load_waveform_16k(row: dict):
+    """load_waveform + rééchantillonnage à 16 kHz si nécessaire (sécurité)."""
+    waveform, sr = load_waveform(row)
+    if sr != 16000:
+        import scipy.signal
+        waveform = scipy.signal.resample(waveform, int(len(waveform) * 16000 / sr))
+    return waveform
+
+
+# ---------------------------------------------------------------------
+# Construction des shards (processus du pool)
+# ---------------------------------------------------------------------
+_processor = None
+
+
+def _get_processor(model_name):
+    global _processor
+    if _processor is None:
+        from transformers import WhisperProcessor
+        _processor = WhisperProcessor.from_pretrained(model_name, task="transcribe")
+    return _processor
+
+
+def build_shard(shard_dir: str, name: str, items: list, model_name: str):
+    """
+    Calcule les log-mel (float16) et tokens d'une liste de (clé, ligne) et écrit le shard :
+    <name>.features.npy (n, n_mels, n_frames), <name>.labels.npy (tokens à plat)
+    et <name>.offsets.npy (n + 1). Retourne [(clé, rang)] des exemples lisibles.
+    """
+    processor = _get_processor(model_name)
+    fe = processor.feature_extractor
+    extractor = BatchedLogMel(fe)
+    shard_dir = Path(shard_dir)
+
+    tmp_features = shard_dir / f"{name}.features.tmp.npy"
+    features = np.lib.format.open_memmap(
+        tmp_features, mode="w+", dtype=np.float16, shape=(len(items), fe.feature_size, extractor.n_frames)
+    )
+    labels, offsets, written = [], [0], []
+    for start in range(0, len(items), EXTRACT_BATCH):
+        rows_idx, waveforms = [], []
+        for i in range(start, min(start + EXTRACT_BATCH, len(items))):
+            key, row = items[i]
+            try:
+                waveforms.append(load_waveform_16k(row))
+                rows_idx.append(i)
+            except Exception as e:
+                logger.warning(f"Erreur lecture {row.get('audio_filepath') or row.get('chapter_wav')}: {e}")
+        if waveforms:
+            features[rows_idx] = extractor(waveforms)
+
+        ok = set(rows_idx)
+        for i in range(start, min(start + EXTRACT_BATCH, len(items))):
+            key, row = items[i]
+            if i not in ok:
+                offsets.append(offsets[-1])
+                continue
+            ids = processor.tokenizer(row["text"]).input_ids
+            labels.extend(ids)
+            offsets.append(offsets[-1] + len(ids))
+            written.append((key, i))
+    features.flush()
+    del features
+
+    # Écriture atomique : features en dernier, c'est leur présence qui valide le shard
+    for suffix, array in (("labels", np.asarray(labels, dtype=np.int32)),
+                          ("offsets", np.asarray(offsets, dtype=np.int64))):
+        tmp = shard_dir / f"{name}.{suffix}.tmp.npy"
+        np.save(tmp, array)
+        os.replace(tmp, shard_dir / f"{name}.{suffix}.npy")
+    os.replace(tmp_features, shard_dir / f"{name}.features.npy")
+    return written
+
+
+class FeatureStore:
+    """
+    Store persistant des entrées Whisper, partagé entre les entraînements :
+    log-mel en float16 et tokens dans des shards .npy mappés en mémoire.
+
+    Un dossier par configuration (feature extractor + tokenizer) :
+    FEATURE_STORE_DIR/<hash config>/{index.json, shard_XXXXX.*.npy}.
+    L'index associe la clé d'un exemple (hash du signal + texte) à (shard, rang) ;
+    un exemple déjà présent n'est jamais recalculé.
+    """
+
+    def __init__(self, processor, root=None):
+        self.config = config_fingerprint(processor)
+        self.store_dir = Path(root or FEATURE_STORE_DIR) / config_hash(self.config)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.index = {"config": self.config, "shards": {}, "keys": {}}
+        if self.index_path.exists():
+            self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self._open = {}
+
+    @property
+    def index_path(self) -> Path:
+        return self.store_dir / INDEX_FILE
+
+    def _save_index(self):
+        tmp = self.index_path.with_name(INDEX_FILE + ".tmp")
+        tmp.write_text(json.dumps(self.index), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def __contains__(self, key):
+        return key in self.index["keys"]
+
+    def __len__(self):
+        return len(self.index["keys"])
+
+    def __getstate__(self):
+        # Les memmaps sont rouverts dans chaque worker du DataLoader
+        state = self.__dict__.copy()
+        state["_open"] = {}
+        return state
+
+    # -----------------------------------------------------------------
+    # Remplissage
+    # -----------------------------------------------------------------
+    def keys_for(self, rows, workers=4):
+        """Clés des lignes (hash en threads : sha1 relâche le GIL). None si l'audio est illisible."""
+        def safe_key(row):
+            try:
+                return sample_key(row)
+            except Exception as e:
+                logger.warning(f"Audio illisible {row.get('audio_filepath') or row.get('chapter_wav')}: {e}")
+                return None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(safe_key, rows))
+
+    def add(self, rows, model_name: str, workers=4, shard_size=None):
+        """
+        Ajoute au store les lignes absentes ; retourne les clés alignées sur `rows`
+        (None pour un exemple illisible). Les shards sont calculés dans un pool de processus
+        et l'index est sauvegardé après chaque shard (reprise possible après interruption).
+        """
+        shard_size = shard_size or FEATURE_STORE_SHARD_SIZE
+        keys = self.keys_for(rows, workers)
+
+        pending, seen = [], set()
+        for key, row in zip(keys, rows):
+            if key is not None and key not in self and key not in seen:
+                seen.add(key)
+                pending.append((key, dict(row)))
+        logger.info(f"Feature store {self.store_dir.name} : {len(rows) - len(pending)} exemples en cache, "
+                    f"{len(pending)} à calculer.")
+        if not pending:
+            return keys
+
+        first = len(self.index["shards"])
+        chunks = {f"shard_{first + i:05d}": pending[start:start + shard_size]
+                  for i, start in enumerate(range(0, len(pending), shard_size))}
+        failed = set()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(build_shard, str(self.store_dir), name, items, model_name): name
+                       for name, items in chunks.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                written = future.result()
+                self.index["shards"][name] = len(chunks[name])
+                for key, row_idx in written:
+                    self.index["keys"][key] = [name, row_idx]
+                failed.update({k for k, _ in chunks[name]} - {k for k, _ in written})
+                self._save_index()
+                logger.info(f"{name} écrit ({len(written)} exemples)")
+        return [None if key in failed else key for key in keys]
+
+    # -----------------------------------------------------------------
+    # Lecture (zero-copy)
+    # -----------------------------------------------------------------
+    def _arrays(self, shard):
+        if shard not in self._open:
+            self._open[shard] = tuple(
+                np.load(self.store_dir / f"{shard}.{suffix}.npy", mmap_mode="r")
+                for suffix in ("features", "labels", "offsets")
+            )
+        return self._open[shard]
+
+    def features(self, key):
+        """Vue float16 (n_mels, n_frames) sur le shard mappé en mémoire."""
+        shard, row = self.index["keys"][key]
+        return self._arrays(shard)[0][row]
+
+    def labels(self, key):
+        shard, row = self.index["keys"][key]
+        _, labels, offsets = self._arrays(shard)
+        return labels[offsets[row]:offsets[row + 1]]
+
+    def label_length(self, key) -> int:
+        shard, row = self.index["keys"][key]
+        offsets = self._arrays(shard)[2]
+        return int(offsets[row + 1] - offsets[row])
+
+
+class FeatureStoreDataset(torch.utils.data.Dataset):
+    """Dataset d'entraînement sur un FeatureStore : aucune extraction, lecture mappée."""
+
+    def __init__(self, store: FeatureStore, keys):
+        self.store = store
+        self.keys = list(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, idx):
+        key = self.keys[idx]
+        return {
+            # Conversion float32 à la lecture : le modèle reste en float32
+            "input_features": self.store.features(key).astype(np.float32),
+            "labels": self.store.labels(key).tolist(),
+        }
+
+
+if __name__ == "__main__":
+    # Pré-calcul hors entraînement : python -m src.models.feature_store data/processed/bible_asr_segments.csv
+    import argparse
+    import csv
+    from transformers import WhisperProcessor
+    from src.config.settings import ASR_MODEL_SIZE, TRAINING_NUM_CORES
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Pré-calcul des features Whisper (log-mel + tokens)")
+    parser.add_argument("csv_path", type=Path)
+    parser.add_argument("--model", default=f"openai/whisper-{ASR_MODEL_SIZE}")
+    parser.add_argument("--workers", type=int, default=TRAINING_NUM_CORES)
+    args = parser.parse_args()
+
+    with open(args.csv_path, newline="", encoding="utf-8") as f:
+        csv_rows = list(csv.DictReader(f))
+    store = FeatureStore(WhisperProcessor.from_pretrained(args.model, task="transcribe"))
+    stored = store.add(csv_rows, args.model, workers=args.workers)
+    logger.info(f"{sum(k is not None for k in stored)}/{len(csv_rows)} exemples disponibles dans {store.store_dir}")
@@ -0,0 +1,90 @@
+"""
+Lanceur de l'entraînement Whisper data-parallel sur CPU (DDP, backend gloo).
+
+Au-delà de quelques cœurs, le parallélisme intra-op d'un seul processus ne passe plus
+à l'échelle : on lance plutôt N processus (torchrun), chacun avec son propre budget de
+threads (OMP_NUM_THREADS = cœurs disponibles // N), qui synchronisent leurs gradients
+par gloo. Plusieurs nœuds CPU d'un même réseau local peuvent être combinés.
+
+    # Une machine 32 cœurs : 8 processus x 4 threads
+    python -m src.models.launch_ddp_cpu --nproc 8
+
+    # Deux machines sur le LAN (même commande sur chacune, --node-rank 0 puis 1)
+    python -m src.models.launch_ddp_cpu --nproc 8 --nnodes 2 --node-rank 0 \\
+        --master-addr 192.168.1.10 --iface eth0
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+
+from src.config.settings import PROJECT_ROOT
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TRAIN_MODULE = "src.models.train_whisper_cpu"
+
+
+def available_cores() -> int:
+    """Cœurs utilisables par ce processus (affinité CPU / cgroup), à défaut os.cpu_count()."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def threads_per_process(nproc: int, cores: int = None) -> int:
+    """Budget de threads par processus : les cœurs sont partagés sans sur-souscription."""
+    return max(1, (cores or available_cores()) // nproc)
+
+
+def ddp_env(threads: int, iface: str = None) -> dict:
+    """Environnement des processus : budget de threads (OpenMP / MKL) et interface réseau gloo."""
+    env = os.environ.copy()
+    env["OMP_NUM_THREADS"] = str(threads)
+    env["MKL_NUM_THREADS"] = str(threads)
+    if iface:
+        # Multi-nœuds : gloo doit utiliser l'interface du LAN, pas loopback
+        env["GLOO_SOCKET_IFNAME"] = iface
+    return env
+
+
+def torchrun_command(nproc, nnodes=1, node_rank=0, master_addr="127.0.0.1", master_port=29500,
+                     module=TRAIN_MODULE) -> list:
+    return [
+        sys.executable, "-m", "torch.distributed.run",
+        f"--nproc-per-node={nproc}",
+        f"--nnodes={nnodes}",
+        f"--node-rank={node_rank}",
+        f"--master-addr={master_addr}",
+        f"--master-port={master_port}",
+        "-m", module,
+    ]
+
+
+def launch(nproc, threads=None, nnodes=1, node_rank=0, master_addr="127.0.0.1", master_port=29500,
+           iface=None, module=TRAIN_MODULE) -> int:
+    """Lance `module` sur `nproc` processus locaux (torchrun) ; retourne le code de sortie."""
+    threads = threads or threads_per_process(nproc)
+    cmd = torchrun_command(nproc, nnodes, node_rank, master_addr, master_port, module)
+    logger.info(f"DDP CPU : nœud {node_rank + 1}/{nnodes}, {nproc} processus x {threads} threads "
+                f"(monde = {nproc * nnodes} processus, maître {master_addr}:{master_port})")
+    return subprocess.call(cmd, cwd=PROJECT_ROOT, env=ddp_env(threads, iface))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nproc", type=int, required=True, help="Processus sur ce nœud")
+    parser.add_argument("--threads", type=int, default=None, help="Threads par processus (défaut : cœurs // nproc)")
+    parser.add_argument("--nnodes", type=int, default=1)
+    parser.add_argument("--node-rank", type=int, default=0)
+    parser.add_argument("--master-addr", default="127.0.0.1", help="Adresse LAN du nœud de rang 0")
+    parser.add_argument("--master-port", type=int, default=29500)
+    parser.add_argument("--iface", default=None, help="Interface réseau gloo (ex. eth0), multi-nœuds")
+    parser.add_argument("--module", default=TRAIN_MODULE)
+    args = parser.parse_args()
+
+    sys.exit(launch(args.nproc, args.threads, args.nnodes, args.node_rank, args.master_addr,
+                    args.master_port, args.iface, args.module))
@@ -0,0 +1,368 @@
+"""
+Table de segments Mina -> Ewe apprise sur le corpus biblique aligné par versets.
+
+Le Mina (Gegbe) et l'Ewe partagent l'essentiel de leur lexique et de leur ordre des
+mots : un transducteur à base de segments suffit pour une bonne part des phrases, en
+quelques microsecondes, là où NLLB-600M coûte un décodage complet.
+
+Construction (hors ligne) :
+1. alignement mot à mot des versets dans les deux sens (IBM 1 avec a priori
+   diagonal, à la fast_align), vectorisé avec numpy ;
+2. symétrisation grow-diag-final ;
+3. extraction des segments cohérents avec l'alignement (<= PHRASE_TABLE_MAX_PHRASE
+   mots), probabilité p(ewe | mina) par comptage, meilleure traduction de chaque
+   segment vu au moins PHRASE_TABLE_MIN_COUNT fois.
+
+Traduction : segmentation monotone de la phrase par programmation dynamique sur un
+trie des segments source. Retourne la couverture (part des mots source connus) et
+la confiance (moyenne géométrique par mot des probabilités des segments utilisés) ;
+MinaEweTranslator n'utilise la sortie que si les deux dépassent les seuils.
+
+    python -m src.models.phrase_table
+"""
+import csv
+import gzip
+import logging
+import math
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from src.config.settings import (
+    PHRASE_TABLE_ITERATIONS,
+    PHRASE_TABLE_MAX_PHRASE,
+    PHRASE_TABLE_MIN_COUNT,
+    PHRASE_TABLE_PATH,
+    PROCESSED_DIR,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PARALLEL_CSV = PROCESSED_DIR / "mina_ewe_parallel.csv"
+TOKEN_RE = re.compile(r"[\w\u0300-\u036f]+|[^\w\s]")  # Mots (tons en diacritiques combinants inclus) ou ponctuation
+DIAGONAL_TENSION = 4.0   # a priori fast_align : alignements proches de la diagonale favorisés
+NULL_PROB = 0.08         # Part de masse donnée au mot vide (mots cible sans correspondant)
+UNKNOWN_LOG_PROB = math.log(1e-4)  # Coût d'un mot source hors table (recopié tel quel)
+_END = ""                # Clé de la traduction dans un nœud du trie (jamais un token)
+
+
+def cased_tokens(text):
+    return TOKEN_RE.findall(unicodedata.normalize("NFC", text))
+
+
+def tokenize(text):
+    return [token.lower() for token in cased_tokens(text)]
+
+
+def sentence_initial(tokens, k):
+    """Mot en début de phrase : sa majuscule n'indique pas un nom propre."""
+    return k == 0 or tokens[k - 1] in (".", "!", "?")
+
+
+def truecase_map(texts):
+    """Forme la plus fréquente de chaque mot (minuscule -> forme), hors débuts de phrase."""
+    forms = defaultdict(Counter)
+    for text in texts:
+        tokens = cased_tokens(text)
+        for k, token in enumerate(tokens):
+            if not sentence_initial(tokens, k):
+                forms[token.lower()][token] += 1
+    return {word: counter.most_common(1)[0][0] for word, counter in forms.items()}
+
+
+def detokenize(tokens, source_text=""):
+    text = " ".join(tokens)
+    text = re.sub(r"\s+([,.;:!?)»])", r"\1", text)
+    text = re.sub(r"([(«])\s+", r"\1", text)
+    if text and source_text[:1].isupper():
+        text = text[0].upper() + text[1:]
+    return text
+
+
+# ---------------------------------------------------------------------
+# Alignement mot à mot
+# ---------------------------------------------------------------------
+def align_words(sources, targets, iterations=PHRASE_TABLE_ITERATIONS):
+    """
+    Alignement IBM 1 avec a priori diagonal (cible -> source) sur des phrases
+    tokenisées. Toutes les paires (mot source, mot cible) des phrases sont mises à
+    plat dans des tableaux numpy : une itération EM = quelques bincount.
+    Retourne, pour chaque phrase, la liste des (i_source, j_cible) alignés (Viterbi).
+    """
+    vocab_src, vocab_tgt = {None: 0}, {}  # 0 = mot vide (NULL)
+    src_ids = [[0] + [vocab_src.setdefault(w, len(vocab_src)) for w in s] for s in sources]
+    tgt_ids = [[vocab_tgt.setdefault(w, len(vocab_tgt)) for w in t] for t in targets]
+
+    n_tgt = len(vocab_tgt)
+    pair_keys, group, prior = [], [], []
+    n_groups = 0
+    for f, e in zip(src_ids, tgt_ids):
+        if not e or len(f) == 1:
+            continue
+        m, n = len(f) - 1, len(e)
+        # a priori par mot cible j : exp(-tension |i/m - j/n|), normalisé, NULL_PROB au mot vide
+        i_pos = (np.arange(1, m + 1) - 0.5) / m
+        j_pos = (np.arange(n) + 0.5) / n
+        diag = np.exp(-DIAGONAL_TENSION * np.abs(i_pos[:, None] - j_pos[None, :]))
+        diag = (1 - NULL_PROB) * diag / diag.sum(axis=0, keepdims=True)
+        weights = np.vstack([np.full((1, n), NULL_PROB), diag])         # (m + 1, n)
+        # Clé de la paire (f, e) = f * |V_cible| + e, ligne i = mot source, colonne j = mot cible
+        pair_keys.append((np.asarray(f, dtype=np.int64)[:, None] * n_tgt + np.asarray(e, dtype=np.int64)).ravel())
+        group.append(np.tile(np.arange(n_groups, n_groups + n, dtype=np.int32), m + 1))
+        prior.append(weights.ravel().astype(np.float32))
+        n_groups += n
+
+    group, prior = np.concatenate(group), np.concatenate(prior)
+    keys, pair_idx = np.unique(np.concatenate(pair_keys), return_inverse=True)
+    del pair_keys
+    pair_idx = pair_idx.astype(np.int32)
+    key_f = keys // n_tgt
+    t = np.ones(len(keys), dtype=np.float32)  # t(e | f) uniforme au départ
+
+    for _ in range(iterations):
+        score = t[pair_idx] * prior
+        posterior = score / np.bincount(group, weights=score, minlength=n_groups)[group]
+        counts = np.bincount(pair_idx, weights=posterior, minlength=len(keys))
+        t = (counts / np.bincount(key_f, weights=counts)[key_f]).astype(np.float32)
+
+    # Viterbi : chaque mot cible vers le mot source (ou NULL) de meilleur score
+    score = t[pair_idx] * prior
+    alignments, offset = [], 0
+    for f, e in zip(src_ids, tgt_ids):
+        if not e or len(f) == 1:
+            alignments.append(set())
+            continue
+        m, n = len(f) - 1, len(e)
+        best = score[offset:offset + (m + 1) * n].reshape(m + 1, n).argmax(axis=0)
+        alignments.append({(int(i) - 1, j) for j, i in enumerate(best) if i > 0})
+        offset += (m + 1) * n
+    return alignments
+
+
+def symmetrize(src_to_tgt, tgt_to_src):
+    """grow-diag-final : intersection, puis points voisins de l'union, puis mots encore non alignés."""
+    alignment = src_to_tgt & tgt_to_src
+    union = src_to_tgt | tgt_to_src
+    neighbours = [(-1, 0), (0, -1), (1, 0), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    added = True
+    while added:
+        added = False
+        aligned_i = {i for i, _ in alignment}
+        aligned_j = {j for _, j in alignment}
+        for i, j in sorted(alignment):
+            for di, dj in neighbours:
+                point = (i + di, j + dj)
+                if point in union and point not in alignment and (point[0] not in aligned_i or point[1] not in aligned_j):
+                    alignment.add(point)
+                    aligned_i.add(point[0])
+                    aligned_j.add(point[1])
+                    added = True
+    aligned_i = {i for i, _ in alignment}
+    aligned_j = {j for _, j in alignment}
+    for i, j in sorted(union - alignment):
+        if i not in aligned_i and j not in aligned_j:
+            alignment.add((i, j))
+            aligned_i.add(i)
+            aligned_j.add(j)
+    return alignment
+
+
+def extract_phrases(source, target, alignment, max_phrase=PHRASE_TABLE_MAX_PHRASE):
+    """Segments (source, cible) cohérents avec l'alignement : aucun lien ne sort du rectangle."""
+    by_source = defaultdict(list)
+    for i, j in alignment:
+        by_source[i].append(j)
+    for i1 in range(len(source)):
+        j_min, j_max = len(target), -1
+        for i2 in range(i1, min(len(source), i1 + max_phrase)):
+            for j in by_source.get(i2, ()):
+                j_min, j_max = min(j_min, j), max(j_max, j)
+            if j_max < 0 or j_max - j_min >= max_phrase:
+                continue
+            if any(j_min <= j <= j_max and not i1 <= i <= i2 for i, j in alignment):
+                continue
+            yield tuple(source[i1:i2 + 1]), tuple(target[j_min:j_max + 1])
+
+
+# ---------------------------------------------------------------------
+# Table et trie
+# ---------------------------------------------------------------------
+@dataclass
+class PhraseTranslation:
+    text: str
+    coverage: float     # Part des mots source couverts par la table
+    confidence: float   # Moyenne géométrique par mot couvert de p(ewe | mina)
+    phrases: list = field(default_factory=list)  # [(segment mina, segment ewe, p)]
+
+
+class PhraseTable:
+    """Segments Mina -> meilleure traduction Ewe, dans un trie de dict imbriqués (un niveau par mot)."""
+
+    def __init__(self, entries=(), max_phrase=PHRASE_TABLE_MAX_PHRASE):
+        self.max_phrase = max_phrase
+        self.root = {}
+        self.size = 0
+        for source, target, prob, count in entries:
+            self.add(source, target, prob, count)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, source, target, prob, count):
+        node = self.root
+        for word in source:
+            node = node.setdefault(word, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = (tuple(target), prob, count)
+
+    def entries(self):
+        stack = [((), self.root)]
+        while stack:
+            prefix, node = stack.pop()
+            for word, child in node.items():
+                if word == _END:
+                    yield (prefix, *child)
+                else:
+                    stack.append((prefix + (word,), child))
+
+    @classmethod
+    def build(cls, sources, targets, max_phrase=PHRASE_TABLE_MAX_PHRASE, min_count=PHRASE_TABLE_MIN_COUNT,
+              iterations=PHRASE_TABLE_ITERATIONS):
+        """Apprend la table sur des paires de phrases (texte brut) Mina / Ewe."""
+        start = time.perf_counter()
+        # Segments appris en minuscules, segments cible stockés avec leur casse usuelle (noms propres)
+        truecase = truecase_map(targets)
+        sources = [tokenize(s) for s in sources]
+        targets = [tokenize(t) for t in targets]
+        forward = align_words(sources, targets, iterations)
+        backward = align_words(targets, sources, iterations)
+        logger.info(f"Alignement de {len(sources)} paires : {time.perf_counter() - start:.1f} s")
+
+        pair_counts = Counter()
+        for source, target, fwd, bwd in zip(sources, targets, forward, backward):
+            alignment = symmetrize(fwd, {(i, j) for j, i in bwd})
+            pair_counts.update(extract_phrases(source, target, alignment, max_phrase))
+        source_counts = Counter()
+        best = {}
+        for (source, target), count in pair_counts.items():
+            source_counts[source] += count
+            if count > best.get(source, ((), 0))[1]:
+                best[source] = (target, count)
+
+        table = cls(max_phrase=max_phrase)
+        for source, (target, count) in best.items():
+            if source_counts[source] >= min_count:
+                target = tuple(truecase.get(word, word) for word in target)
+                table.add(source, target, count / source_counts[source], source_counts[source])
+        logger.info(f"Table de segments : {len(table)} segments source ({len(pair_counts)} paires extraites), "
+                    f"{time.perf_counter() - start:.1f} s")
+        return table
+
+    def save(self, path=None):
+        path = Path(path or PHRASE_TABLE_PATH)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(f"# max_phrase\t{self.max_phrase}\n")
+            for source, target, prob, count in sorted(self.entries()):
+                f.write(f"{' '.join(source)}\t{' '.join(target)}\t{prob:.4f}\t{count}\n")
+        logger.info(f"Table de segments sauvegardée : {path}")
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        table = cls()
+        with gzip.open(path or PHRASE_TABLE_PATH, "rt", encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if fields[0] == "# max_phrase":
+                    table.max_phrase = int(fields[1])
+                    continue
+                table.add(fields[0].split(" "), fields[1].split(" "), float(fields[2]), int(fields[3]))
+        return table
+
+    def translate(self, text) -> PhraseTranslation:
+        """
+        Segmentation monotone de meilleur score (somme des log p par mot), mots inconnus
+        recopiés. Un mot cible identique à un mot source du segment reprend sa casse
+        (hors début de phrase) : les noms propres restent en majuscule.
+        """
+        cased = cased_tokens(text)
+        words = [token.lower() for token in cased]
+        if not words:
+            return PhraseTranslation("", 0.0, 0.0)
+        n = len(words)
+        # best[i] = (score, -segments, début du dernier segment, entrée ou None si mot inconnu)
+        best = [None] * (n + 1)
+        best[0] = (0.0, 0, 0, None)
+        for i in range(n):
+            if best[i] is None:
+                continue
+            score, segments = best[i][0], best[i][1]
+            candidates = [(i + 1, score + UNKNOWN_LOG_PROB, None)]
+            node = self.root
+            for k in range(i, min(n, i + self.max_phrase)):
+                node = node.get(words[k])
+                if node is None:
+                    break
+                if _END in node:
+                    target, prob, _ = node[_END]
+                    candidates.append((k + 1, score + (k + 1 - i) * math.log(prob), node[_END]))
+            for end, new_score, entry in candidates:
+                if best[end] is None or (new_score, segments - 1) > best[end][:2]:
+                    best[end] = (new_score, segments - 1, i, entry)
+
+        output, phrases, covered, log_prob = [], [], 0, 0.0
+        end = n
+        while end > 0:
+            _, _, start, entry = best[end]
+            if entry is None:
+                output.append((cased[start],))
+            else:
+                target, prob, _ = entry
+                forms = {words[k]: cased[k] for k in range(start, end) if not sentence_initial(cased, k)}
+                output.append(tuple(forms.get(token.lower(), token) for token in target))
+                phrases.append((" ".join(words[start:end]), " ".join(target), prob))
+                covered += end - start
+                log_prob += (end - start) * math.log(prob)
+            end = start
+        tokens = [token for segment in reversed(output) for token in segment]
+        confidence = math.exp(log_prob / covered) if covered else 0.0
+        return PhraseTranslation(detokenize(tokens, text.strip()), covered / n, confidence, phrases[::-1])
+
+
+def read_parallel_pairs(csv_path=None):
+    """Paires (mina, ewe) du CSV de prepare_nmt_dataset (mina, ewe) ou de ParallelAligner (text_mina, text_ewe)."""
+    sources, targets = [], []
+    with open(csv_path or PARALLEL_CSV, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            mina = (row.get("mina") or row.get("text_mina") or "").strip()
+            ewe = (row.get("ewe") or row.get("text_ewe") or "").strip()
+            if mina and ewe:
+                sources.append(mina)
+                targets.append(ewe)
+    return sources, targets
+
+
+def build_phrase_table(csv_path=None, output_path=None):
+    sources, targets = read_parallel_pairs(csv_path)
+    if not sources:
+        raise FileNotFoundError(f"Aucune paire parallèle dans {csv_path or PARALLEL_CSV}. Lancez `prepare_nmt_dataset.py`.")
+    table = PhraseTable.build(sources, targets)
+    table.save(output_path)
+    return table
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", type=Path, default=PARALLEL_CSV)
+    parser.add_argument("--output", type=Path, default=PHRASE_TABLE_PATH)
+    args = parser.parse_args()
+    build_phrase_table(args.csv, args.output)
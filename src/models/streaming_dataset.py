@@ -0,0 +1,169 @@
+import csv
+import logging
+import random
+import zlib
+
+import torch
+
+from src.config.settings import (
+    ASR_MIN_DURATION_MS,
+    ASR_MAX_DURATION_MS,
+    ASR_MAX_LABEL_TOKENS,
+    ASR_SHUFFLE_BUFFER,
+)
+from src.models.feature_store import load_waveform_16k, sample_key
+from src.preprocessing.asr_preflight import WavHeaders, reject_reason, row_duration_ms
+from src.preprocessing.dataset_builder import chapter_key, pack_rows
+from src.preprocessing.log_mel import BatchedLogMel
+
+logger = logging.getLogger(__name__)
+
+
+def chapter_bucket(row: dict, n: int) -> int:
+    """Répartition stable par chapitre (split train/test, workers) : un chapitre reste groupé."""
+    return zlib.crc32(chapter_key(row).encode("utf-8")) % n
+
+
+class StreamingASRDataset(torch.utils.data.IterableDataset):
+    """
+    Dataset ASR en flux, à mémoire bornée quelle que soit la taille du corpus :
+    le manifeste CSV est lu ligne à ligne dans chaque worker du DataLoader (un chapitre
+    entier par worker), pré-filtré et éventuellement packé à la volée, mélangé dans un
+    buffer de `shuffle_buffer` lignes, puis décodé et converti en log-mel par petits lots
+    (ou lu dans le FeatureStore si l'exemple y est déjà).
+
+    Split : un chapitre sur `eval_every` est réservé à l'évaluation (split="test").
+    """
+
+    def __init__(self, csv_path, processor, split="train", eval_every=10, shuffle_buffer=None,
+                 seed=42, pack=False, store=None, max_samples=None, extract_batch=8):
+        self.csv_path = str(csv_path)
+        self.processor = processor
+        self.split = split
+        self.eval_every = eval_every
+        self.shuffle_buffer = ASR_SHUFFLE_BUFFER if shuffle_buffer is None else shuffle_buffer
+        self.seed = seed
+        self.pack = pack
+        self.store = store
+        self.max_samples = max_samples
+        self.extract_batch = extract_batch
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int):
+        # Appelé par le Trainer à chaque époque : nouvel ordre de mélange
+        self.epoch = epoch
+
+    # -----------------------------------------------------------------
+    # Lignes du manifeste
+    # -----------------------------------------------------------------
+    def _chapters(self, worker_id, num_workers):
+        """Chapitres (listes de lignes consécutives) de ce split et de ce worker."""
+        current, current_key = [], None
+        with open(self.csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                key = chapter_key(row)
+                if key != current_key and current:
+                    yield current
+                    current = []
+                current_key = key
+                in_test = chapter_bucket(row, self.eval_every) == 0
+                if in_test != (self.split == "test"):
+                    continue
+                if num_workers > 1 and zlib.crc32(key.encode("utf-8")) // self.eval_every % num_workers != worker_id:
+                    continue
+                current.append(row)
+        if current:
+            yield current
+
+    def _rows(self, worker_id, num_workers):
+        tokenizer = self.processor.tokenizer
+        headers = WavHeaders()
+        for chapter in self._chapters(worker_id, num_workers):
+            texts = [str(row.get("text") or "").strip() for row in chapter]
+            lengths = [len(ids) for ids in tokenizer(texts).input_ids]
+            valid = [
+                row for row, text, n_labels in zip(chapter, texts, lengths)
+                if not reject_reason(row_duration_ms(row, headers), text, n_labels,
+                                     ASR_MIN_DURATION_MS, ASR_MAX_DURATION_MS, ASR_MAX_LABEL_TOKENS)
+            ]
+            yield from pack_rows(valid, tokenizer=tokenizer) if self.pack else valid
+
+    def _shuffled(self, rows, rng):
+        if self.shuffle_buffer <= 1:
+            yield from rows
+            return
+        buffer = []
+        for row in rows:
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(row)
+                continue
+            i = rng.randrange(len(buffer))
+            yield buffer[i]
+            buffer[i] = row
+        rng.shuffle(buffer)
+        yield from buffer
+
+    # -----------------------------------------------------------------
+    # Exemples
+    # -----------------------------------------------------------------
+    def __iter__(self):
+        info = torch.utils.data.get_worker_info()
+        worker_id, num_workers = (info.id, info.num_workers) if info else (0, 1)
+        rng = random.Random(self.seed * 1000003 + self.epoch * 101 + worker_id)
+        extractor = BatchedLogMel(self.processor.feature_extractor)
+
+        rows = self._rows(worker_id, num_workers)
+        if self.split == "train":
+            rows = self._shuffled(rows, rng)
+
+        limit = None
+        if self.max_samples:
+            # Plafond réparti entre les workers
+            limit = self.max_samples // num_workers + (worker_id < self.max_samples % num_workers)
+        produced = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.extract_batch:
+                for example in self._featurize(batch, extractor):
+                    if limit is not None and produced >= limit:
+                        return
+                    produced += 1
+                    yield example
+                batch = []
+        for example in self._featurize(batch, extractor):
+            if limit is not None and produced >= limit:
+                return
+            produced += 1
+            yield example
+
+    def _featurize(self, rows, extractor):
+        if not rows:
+            return
+        features, todo = {}, []
+        for i, row in enumerate(rows):
+            if self.store is not None:
+                try:
+                    key = sample_key(row)
+                except Exception:
+                    key = None
+                if key in self.store:
+                    features[i] = self.store.features(key).astype("float32")
+                    continue
+            todo.append(i)
+
+        waveforms, loaded = [], []
+        for i in todo:
+            try:
+                waveforms.append(load_waveform_16k(rows[i]))
+                loaded.append(i)
+            except Exception as e:
+                logger.warning(f"Erreur lecture {rows[i].get('audio_filepath') or rows[i].get('chapter_wav')}: {e}")
+        if waveforms:
+            for i, feats in zip(loaded, extractor(waveforms)):
+                features[i] = feats
+
+        kept = sorted(features)
+        labels = self.processor.tokenizer([rows[i]["text"] for i in kept]).input_ids if kept else []
+        for i, ids in zip(kept, labels):
+            yield {"input_features": features[i], "labels": ids}
@@ -0,0 +1,223 @@
+import hashlib
+import logging
+import time
+
+import torch
+from datasets import load_dataset, load_from_disk
+from transformers import (
+    AutoModelForSeq2SeqLM,
+    AutoTokenizer,
+    DataCollatorForSeq2Seq,
+    Seq2SeqTrainingArguments,
+    Seq2SeqTrainer,
+)
+from src.config.settings import (
+    NMT_MODEL_SIZE,
+    NMT_SRC_LANG,
+    NMT_TGT_LANG,
+    NMT_MAX_LENGTH,
+    NMT_USE_LORA,
+    NMT_LORA_RANK,
+    NMT_LORA_ALPHA,
+    NMT_LORA_DROPOUT,
+    NMT_LORA_TARGETS,
+    NMT_LEARNING_RATE,
+    NMT_BATCH_SIZE,
+    NMT_EPOCHS,
+    NMT_TOKENIZED_DIR,
+    PROCESSED_DIR,
+    PROJECT_ROOT,
+    TRAINING_NUM_CORES,
+)
+from src.models.cpu_precision import resolve_precision
+
+try:
+    from peft import LoraConfig, PeftModel, TaskType, get_peft_model
+    PEFT_AVAILABLE = True
+except ImportError:
+    PEFT_AVAILABLE = False
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+torch.set_num_threads(TRAINING_NUM_CORES)
+
+PARALLEL_CSV = PROCESSED_DIR / "mina_ewe_parallel.csv"
+OUTPUT_DIR = PROJECT_ROOT / "models" / "nllb-mina-ewe-local"
+ADAPTER_DIR = PROJECT_ROOT / "models" / "nllb-mina-ewe-lora"
+FINAL_DIR = PROJECT_ROOT / "models" / "nllb-mina-ewe-final"
+TEST_SIZE = 0.05
+SPLIT_SEED = 42
+
+
+def peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_tokenizer(model_name):
+    return AutoTokenizer.from_pretrained(model_name, src_lang=NMT_SRC_LANG, tgt_lang=NMT_TGT_LANG)
+
+
+def parallel_rows(csv_path, target_column="ewe"):
+    """Lignes du CSV parallèle dont la source et la cible sont non vides (même ordre que le fichier)."""
+    dataset = load_dataset("csv", data_files={"train": str(csv_path)})["train"]
+    return dataset.filter(
+        lambda row: bool(row["mina"] and row[target_column] and row["mina"].strip() and row[target_column].strip())
+    )
+
+
+def tokenized_cache_dir(csv_path, tokenizer, max_length, target_column="ewe"):
+    """Répertoire du corpus tokenisé : change si le CSV, le tokenizer, la cible ou la longueur max changent."""
+    stat = csv_path.stat()
+    h = hashlib.sha1()
+    for part in (csv_path.resolve(), stat.st_size, stat.st_mtime_ns, tokenizer.name_or_path, len(tokenizer),
+                 NMT_SRC_LANG, NMT_TGT_LANG, max_length, target_column):
+        h.update(str(part).encode("utf-8"))
+    return NMT_TOKENIZED_DIR / h.hexdigest()[:16]
+
+
+def tokenized_splits(csv_path, tokenizer, max_length=NMT_MAX_LENGTH, target_column="ewe"):
+    """
+    Corpus parallèle tokenisé (input_ids, labels, length), train/test 95/5 : colonne
+    mina en source, `target_column` en cible ("french" pour l'élève distillé).
+    Calculé une seule fois puis relu depuis NMT_TOKENIZED_DIR (save_to_disk).
+    """
+    cache_dir = tokenized_cache_dir(csv_path, tokenizer, max_length, target_column)
+    if cache_dir.exists():
+        logger.info(f"Corpus tokenisé en cache : {cache_dir}")
+        return load_from_disk(str(cache_dir))
+
+    dataset = parallel_rows(csv_path, target_column)
+
+    def tokenize(batch):
+        encoded = tokenizer(batch["mina"], text_target=batch[target_column], max_length=max_length, truncation=True)
+        # Longueur du couple : clé de regroupement des lots (moins de padding)
+        encoded["length"] = [len(src) + len(tgt) for src, tgt in zip(encoded["input_ids"], encoded["labels"])]
+        return encoded
+
+    dataset = dataset.map(tokenize, batched=True, remove_columns=dataset.column_names)
+    splits = dataset.train_test_split(test_size=TEST_SIZE, seed=SPLIT_SEED)
+    splits.save_to_disk(str(cache_dir))
+    logger.info(f"Corpus tokenisé : {len(splits['train'])} / {len(splits['test'])} paires -> {cache_dir}")
+    return splits
+
+
+def load_model(model_name, lora=True):
+    """NLLB complet, ou gelé avec des adaptateurs LoRA sur les projections d'attention."""
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    if lora:
+        if not PEFT_AVAILABLE:
+            raise ImportError("peft est requis pour l'entraînement LoRA : pip install peft")
+        config = LoraConfig(
+            task_type=TaskType.SEQ_2_SEQ_LM,
+            r=NMT_LORA_RANK,
+            lora_alpha=NMT_LORA_ALPHA,
+            lora_dropout=NMT_LORA_DROPOUT,
+            target_modules=NMT_LORA_TARGETS,
+        )
+        model = get_peft_model(model, config)
+    total = sum(p.numel() for p in model.parameters())
+    trainable = sum(p.numel() for p in model.parameters() if p.requires_grad)
+    logger.info(f"{'LoRA' if lora else 'Fine-tuning complet'} : {trainable / 1e6:.1f}M / {total / 1e6:.1f}M "
+                f"paramètres entraînables ({trainable / total:.2%})")
+    return model
+
+
+def length_grouping_args() -> dict:
+    """Lots de longueurs voisines (LengthGroupedSampler) ; nom de l'option selon la version de transformers."""
+    if "group_by_length" in Seq2SeqTrainingArguments.__dataclass_fields__:
+        return {"group_by_length": True}
+    return {"train_sampling_strategy": "group_by_length"}
+
+
+def build_trainer(model, tokenizer, splits, output_dir, max_steps=-1, **overrides):
+    """Seq2SeqTrainer CPU ; `overrides` remplace des arguments d'entraînement (benchmark)."""
+    precision = resolve_precision()
+    args = dict(
+        output_dir=str(output_dir),
+        per_device_train_batch_size=NMT_BATCH_SIZE,
+        per_device_eval_batch_size=NMT_BATCH_SIZE,
+        learning_rate=NMT_LEARNING_RATE,
+        num_train_epochs=NMT_EPOCHS,
+        max_steps=max_steps,
+        warmup_steps=50,
+        bf16=precision == "bf16",
+        eval_strategy="epoch",                     # Perte seule (pas de génération) : évaluation rapide
+        save_strategy="epoch",
+        save_total_limit=2,
+        logging_steps=25,
+        report_to=["tensorboard"],
+        use_cpu=True,
+        length_column_name="length",
+        dataloader_num_workers=0,                  # Données déjà tokenisées en mémoire
+        **length_grouping_args(),
+    )
+    args.update(overrides)
+    training_args = Seq2SeqTrainingArguments(**args)
+    return Seq2SeqTrainer(
+        args=training_args,
+        model=model,
+        train_dataset=splits["train"],
+        eval_dataset=splits["test"],
+        # Padding dynamique au plus long du lot (labels paddés à -100)
+        data_collator=DataCollatorForSeq2Seq(tokenizer, model=model, label_pad_token_id=-100),
+        processing_class=tokenizer,
+    )
+
+
+def merge_adapters(model, tokenizer, output_dir=FINAL_DIR):
+    """Fusionne les adaptateurs LoRA dans les poids de NLLB : checkpoint autonome (sans peft à l'inférence)."""
+    merged = model.merge_and_unload() if PEFT_AVAILABLE and isinstance(model, PeftModel) else model
+    merged.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    logger.info(f"Modèle fusionné sauvegardé : {output_dir}")
+    return merged
+
+
+def train_mina_ewe_nmt(csv_path=None, lora=None, max_steps=-1):
+    """
+    Fine-tune NLLB Mina -> Ewe sur le corpus parallèle de la Bible, sur CPU :
+    adaptateurs LoRA seuls (NMT_USE_LORA), corpus tokenisé en cache, lots regroupés par longueur.
+    Produit models/nllb-mina-ewe-final (adaptateurs fusionnés), utilisé par MinaEweTranslator.
+    """
+    csv_path = csv_path or PARALLEL_CSV
+    lora = NMT_USE_LORA if lora is None else lora
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Corpus parallèle introuvable : {csv_path}. Lancez `prepare_nmt_dataset.py`.")
+
+    model_name = f"facebook/{NMT_MODEL_SIZE}"
+    print(f"--- Fine-tuning {model_name} Mina -> Ewe sur CPU ({TRAINING_NUM_CORES} coeurs, "
+          f"{'LoRA' if lora else 'complet'}) ---")
+    tokenizer = load_tokenizer(model_name)
+    splits = tokenized_splits(csv_path, tokenizer)
+    model = load_model(model_name, lora)
+
+    trainer = build_trainer(model, tokenizer, splits, OUTPUT_DIR, max_steps)
+    start = time.perf_counter()
+    metrics = trainer.train().metrics
+    elapsed = time.perf_counter() - start
+    print(f"Entraînement : {metrics.get('train_samples_per_second', 0):.2f} paires/s, "
+          f"{elapsed / 60:.1f} min, pic mémoire {peak_rss_mb():.0f} Mo")
+
+    if lora:
+        model.save_pretrained(ADAPTER_DIR)  # Adaptateurs seuls (quelques Mo)
+    merged = merge_adapters(model, tokenizer)
+    return merged, tokenizer
+
+
+if __name__ == "__main__":
+    # python -m src.models.train_translation_cpu [--full] [--max-steps N]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fine-tuning NLLB Mina -> Ewe sur CPU")
+    parser.add_argument("--full", action="store_true", help="Fine-tuning complet au lieu de LoRA")
+    parser.add_argument("--max-steps", type=int, default=-1)
+    args = parser.parse_args()
+    train_mina_ewe_nmt(lora=not args.full, max_steps=args.max_steps)
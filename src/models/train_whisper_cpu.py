@@ -1,7 +1,7 @@
 import torch
 from dataclasses import dataclass
 from typing import Any, Dict, List, Union
-from datasets import load_dataset, Audio
+from datasets import load_dataset, Audio, Dataset
 import evaluate
 from transformers import (
     WhisperForConditionalGeneration,
@@ -11,176 +11,301 @@ from transformers import (
 )
 from src.config.settings import (
     ASR_MODEL_SIZE,
-    ASR_FREEZE_PERCENT,
+    ASR_CACHE_ENCODER_OUTPUTS,
     ASR_LEARNING_RATE,
     ASR_BATCH_SIZE,
     PROJECT_ROOT,
     PROCESSED_DIR,
     TRAINING_NUM_CORES,
+    ASR_DATASET_MODE,
+    ASR_FEATURE_STORE,
+    ASR_MAX_LABEL_TOKENS,
+    ASR_PACKING,
+    ASR_MAX_SAMPLES,
+    ASR_STREAMING,
+    ASR_SHUFFLE_BUFFER,
+    ASR_STREAMING_EVAL_SAMPLES,
+    ASR_DDP_BACKEND,
+    ASR_DDP_DATALOADER_WORKERS,
+    ASR_DDP_SHARED_STORAGE,
+    ASR_TORCH_COMPILE,
+    ASR_AUTO_BATCH,
+    ASR_FAST_EVAL,
+    ASR_FAST_EVAL_SAMPLES,
+    ASR_FAST_EVAL_MAX_LENGTH,
+    ASR_ASYNC_FULL_EVAL,
 )
+from src.preprocessing.log_mel import BatchedLogMel
+from src.preprocessing.asr_preflight import preflight, save_stats
+from src.preprocessing.dataset_builder import pack_rows, log_packing_report
+from src.models.feature_store import FeatureStore, FeatureStoreDataset, load_waveform_16k
+from src.models.encoder_cache import EncoderOutputCache, EncoderOutputDataset, encoder_outputs_batch
+from src.models.streaming_dataset import StreamingASRDataset
+from src.models.whisper_freezing import apply_freeze_policy, encoder_frozen
+from src.models.cpu_precision import resolve_precision
+from src.models.batch_tuner import memory_budget_mb, probe_batch_plan
+from src.models.async_eval import SPEC_FILE, FullEvalCallback, fast_eval_subset, label_lengths, write_spec
 
 import os
 import multiprocessing
+import numpy as np
 
 # --- Optimisation CPU ---
-# Sur Windows, set_num_threads est utile pour MKL/OpenMP
-NUM_CORES = TRAINING_NUM_CORES  # Utilise la limite de 10 cœurs demandée
+# Data-parallel (lancé par src.models.launch_ddp_cpu / torchrun) : WORLD_SIZE processus
+WORLD_SIZE = int(os.environ.get("WORLD_SIZE", "1"))
+DISTRIBUTED = WORLD_SIZE > 1
+if DISTRIBUTED:
+    # Budget de threads du processus fixé par le lanceur : pas de sur-souscription des cœurs
+    NUM_CORES = int(os.environ.get("OMP_NUM_THREADS") or
+                    max(1, TRAINING_NUM_CORES // int(os.environ.get("LOCAL_WORLD_SIZE", WORLD_SIZE))))
+else:
+    # Sur Windows, set_num_threads est utile pour MKL/OpenMP
+    NUM_CORES = TRAINING_NUM_CORES  # Utilise la limite de 10 cœurs demandée
 torch.set_num_threads(NUM_CORES) 
 
+# Décodeur Whisper limité à 448 tokens
+MAX_LABEL_LENGTH = ASR_MAX_LABEL_TOKENS
+# Longueur de génération de l'évaluation complète (ASR_FAST_EVAL_MAX_LENGTH pendant l'entraînement)
+GENERATION_MAX_LENGTH = 225
+
 @dataclass
 class DataCollatorSpeechSeq2SeqWithPadding:
     processor: Any
 
     def __call__(self, features: List[Dict[str, Union[List[int], torch.Tensor]]]) -> Dict[str, torch.Tensor]:
         input_features = [{"input_features": f["input_features"]} for f in features]
-        label_features = [{"input_ids": f["labels"]} for f in features]
-
         batch = self.processor.feature_extractor.pad(input_features, return_tensors="pt")
+        batch["labels"] = self.pad_labels(features)
+        return batch
+
+    def pad_labels(self, features) -> torch.Tensor:
+        label_features = [{"input_ids": f["labels"]} for f in features]
         labels_batch = self.processor.tokenizer.pad(label_features, return_tensors="pt")
 
         labels = labels_batch["input_ids"].masked_fill(labels_batch.attention_mask.ne(1), -100)
 
         if (labels[:, 0] == self.processor.tokenizer.bos_token_id).all().cpu().item():
             labels = labels[:, 1:]
+        return labels
 
-        batch["labels"] = labels
-        return batch
 
+@dataclass
+class DataCollatorEncoderOutputs(DataCollatorSpeechSeq2SeqWithPadding):
+    """Lots décodeur seul : sorties encodeur en cache à la place des log-mel."""
 
-wer_metric = evaluate.load("wer")
+    def __call__(self, features):
+        return {"encoder_outputs": encoder_outputs_batch(features), "labels": self.pad_labels(features)}
 
-def train_whisper_on_cpu(dataset=None):
+
+def load_splits(dataset, csv_path, processor):
+    """Manifeste CSV (ou dataset fourni) -> DatasetDict pré-filtré, packé et sous-échantillonné."""
+    if dataset is None:
+        print(f"Chargement depuis {csv_path}...")
+        dataset = load_dataset("csv", data_files={"train": str(csv_path)})
+    dataset = preflight_splits(dataset, processor.tokenizer)
+    if ASR_PACKING:
+        dataset = pack_splits(dataset, processor.tokenizer)
+
+    # Subsampling for RAM safety if needed
+    if csv_path is not None and ASR_MAX_SAMPLES and len(dataset["train"]) > ASR_MAX_SAMPLES:
+        print(f"Subsampling dataset from {len(dataset['train'])} to {ASR_MAX_SAMPLES} samples for system stability...")
+        dataset["train"] = dataset["train"].shuffle(seed=42).select(range(ASR_MAX_SAMPLES))
+    return dataset
+
+
+def streaming_splits(csv_path, processor):
     """
-    Fine-tune Whisper sur le dataset pré-aligné (verset par verset).
-    Optimisé pour CPU.
+    Datasets itérables sur le manifeste complet : décodage et log-mel dans les workers
+    du DataLoader (features du FeatureStore réutilisées si présentes).
     """
-    model_name = f"openai/whisper-{ASR_MODEL_SIZE}"
-    print(f"--- Initialisation Fine-tuning Whisper ({model_name}) sur CPU ({NUM_CORES} coeurs) ---")
+    store = FeatureStore(processor) if ASR_FEATURE_STORE else None
+    print(f"Streaming depuis {csv_path} (buffer de mélange {ASR_SHUFFLE_BUFFER}, pas de sous-échantillonnage)")
+    return {
+        "train": StreamingASRDataset(csv_path, processor, split="train", pack=ASR_PACKING, store=store),
+        "test": StreamingASRDataset(csv_path, processor, split="test", pack=ASR_PACKING, store=store,
+                                    max_samples=ASR_STREAMING_EVAL_SAMPLES),
+    }
 
-    processor = WhisperProcessor.from_pretrained(model_name, task="transcribe")
-    model = WhisperForConditionalGeneration.from_pretrained(model_name)
 
-    model.config.forced_decoder_ids = None
-    model.config.suppress_tokens = []
-    model.config.use_cache = False  # DOIT être False si gradient_checkpointing est True, et recommandé sur CPU
+def preflight_splits(dataset, tokenizer):
+    """
+    Pré-filtrage bon marché (en-têtes WAV + tokenisation) avant toute extraction :
+    audio illisible, segments trop courts ou > 30 s et labels > 448 tokens sont écartés
+    au lieu d'être extraits (ou remplacés par du silence) puis filtrés.
+    """
+    all_stats = {}
+    for split in dataset:
+        kept, all_stats[split] = preflight(dataset[split].to_list(), tokenizer)
+        if len(kept) < len(dataset[split]):
+            dataset[split] = dataset[split].select(kept)
+    save_stats(all_stats)
+    return dataset
 
-    # 1. Chargement dataset
-    if dataset is None:
-        csv_path = PROCESSED_DIR / "bible_asr_dataset.csv"
-        if not csv_path.exists():
-            raise FileNotFoundError(f"Dataset introuvable : {csv_path}. Veuillez relancer `dataset_builder.py`.")
 
-        print(f"Chargement depuis {csv_path}...")
-        dataset = load_dataset("csv", data_files={"train": str(csv_path)})
+def pack_splits(dataset, tokenizer):
+    """
+    Packing des versets consécutifs d'un chapitre en exemples <= 30 s (après pré-filtrage,
+    avant sous-échantillonnage) : chaque fenêtre de 3000 trames contient plusieurs versets
+    au lieu d'un seul verset noyé dans le padding.
+    """
+    for split in dataset:
+        rows = dataset[split].to_list()
+        packed = pack_rows(rows, tokenizer=tokenizer)
+        log_packing_report(rows, packed)
+        dataset[split] = Dataset.from_list(packed)
+    return dataset
 
-        # Subsampling for RAM safety if needed
-        from src.config.settings import ASR_MAX_SAMPLES
-        if ASR_MAX_SAMPLES and len(dataset["train"]) > ASR_MAX_SAMPLES:
-            print(f"Subsampling dataset from {len(dataset['train'])} to {ASR_MAX_SAMPLES} samples for system stability...")
-            dataset["train"] = dataset["train"].shuffle(seed=42).select(range(ASR_MAX_SAMPLES))
 
+def extract_features(dataset, processor):
+    """
+    Extraction log-mel + tokenisation via dataset.map (recalculée à chaque entraînement).
+    Chemin historique, utilisé quand ASR_FEATURE_STORE est désactivé.
+    """
     # On n'utilise PLUS cast_column avec Audio() car cela déclenche torchcodec qui plante sur votre machine.
     # dataset = dataset.cast_column("audio_filepath", Audio(sampling_rate=16000))
 
-    # 2. Pré-traitement simple avec chargement manuel (SoundFile)
-    import soundfile as sf
-    import scipy.signal
-    import numpy as np
+    # 2. Pré-traitement par lots : chargement manuel + log-mel vectorisé (BatchedLogMel)
+    extractor = BatchedLogMel(processor.feature_extractor)
 
     def prepare_dataset(batch):
         # Chargement manuel pour éviter l'erreur torchcodec
-        audio_path = batch["audio_filepath"]
-        
-        try:
-            waveform, sr = sf.read(audio_path)
-        except Exception as e:
-            # En cas d'erreur de lecture, on retourne des dummy data pour ne pas crasher tout le process
-            # (idéalement on filtrerait avant, mais map gère mal les suppressions directes)
-            print(f"Erreur lecture {audio_path}: {e}")
-            waveform = np.zeros(16000) # 1 sec silence
-            sr = 16000
-
-        # Conversion Mono
-        if len(waveform.shape) > 1:
-            waveform = waveform.mean(axis=1)
-
-        # Resample si nécessaire (sécurité)
-        if sr != 16000:
-            num_samples = int(len(waveform) * 16000 / sr)
-            waveform = scipy.signal.resample(waveform, num_samples)
-
-        # Audio input
-        input_features = processor.feature_extractor(
-            waveform, 
-            sampling_rate=16000
-        ).input_features[0]
-
-        # Text targets
-        lang = batch["language"].lower()
-        proxy_lang = "yoruba" if lang in ["ewe", "gegbe", "mina", "gbe"] else lang
-        
-        # Tokenize text
-        # Whisper gère le language via le tokenizer/processor lors du forward, 
-        # mais on peut aussi forcer le prompt ici si on veut
-        labels = processor.tokenizer(batch["text"]).input_ids
-        
+        # (fichier par verset ou segment mappé en mémoire dans le WAV du chapitre)
+        rows = [dict(zip(batch.keys(), values)) for values in zip(*batch.values())]
+        waveforms = []
+        for row in rows:
+            try:
+                waveforms.append(load_waveform_16k(row))
+            except Exception as e:
+                # En cas d'erreur de lecture, on retourne des dummy data pour ne pas crasher tout le process
+                # (idéalement on filtrerait avant, mais map gère mal les suppressions directes)
+                print(f"Erreur lecture {row.get('audio_filepath') or row.get('chapter_wav')}: {e}")
+                waveforms.append(np.zeros(16000))  # 1 sec silence
+
         return {
-            "input_features": input_features,
-            "labels": labels,
+            "input_features": list(extractor(waveforms)),
+            "labels": processor.tokenizer(batch["text"]).input_ids,
         }
 
-    print("Pré-traitement du dataset (Feature Extraction manuelle)...")
+    print("Pré-traitement du dataset (Feature Extraction par lots)...")
     # On utilise num_proc pour paralléliser le prétraitement
     dataset = dataset.map(
         prepare_dataset, 
+        batched=True,
+        batch_size=32,
         remove_columns=dataset["train"].column_names, 
         num_proc=NUM_CORES
     )
 
     print(f"Dataset transformé : {len(dataset['train'])} exemples.")
 
-    # 3. Filtrage des séquences trop longues (décodeur Whisper limité à 448 tokens)
-    MAX_LABEL_LENGTH = 448
-    def filter_labels(labels):
-        return len(labels) <= MAX_LABEL_LENGTH
-
-    print(f"Filtrage des labels > {MAX_LABEL_LENGTH} tokens...")
-    dataset = dataset.filter(
-        lambda x: filter_labels(x["labels"]), 
-        num_proc=NUM_CORES
-    )
-    print(f"Dataset final : {len(dataset['train'])} exemples.")
-
-    # 4. Split
+    # 3. Split
     if "test" not in dataset:
         dataset = dataset["train"].train_test_split(test_size=0.1, seed=42)
 
-    data_collator = DataCollatorSpeechSeq2SeqWithPadding(processor=processor)
+    return dataset
 
-    # 4. Métriques
-    def compute_metrics(pred):
-        pred_ids = pred.predictions
-        label_ids = pred.label_ids
-        label_ids[label_ids == -100] = processor.tokenizer.pad_token_id
-        pred_str = processor.tokenizer.batch_decode(pred_ids, skip_special_tokens=True)
-        label_str = processor.tokenizer.batch_decode(label_ids, skip_special_tokens=True)
-        wer = wer_metric.compute(predictions=pred_str, references=label_str)
-        return {"wer": wer}
 
-    # 5. Training Args CPU Optimized
+def feature_store_splits(dataset, processor, model_name):
+    """
+    Features lues depuis le FeatureStore persistant : seuls les exemples absents du store
+    sont calculés, un entraînement relancé n'extrait plus rien.
+    Retourne {"train", "test"} de FeatureStoreDataset.
+    """
+    store = FeatureStore(processor)
+    splits = {}
+    for split in dataset:
+        rows = dataset[split].to_list()
+        keys = [k for k in store.add(rows, model_name, workers=NUM_CORES) if k is not None]
+        kept = [k for k in keys if store.label_length(k) <= MAX_LABEL_LENGTH]
+        print(f"{split} : {len(kept)} exemples ({len(rows) - len(kept)} illisibles ou labels > {MAX_LABEL_LENGTH} tokens)")
+        splits[split] = kept
+
+    if "test" not in splits:
+        order = np.random.default_rng(42).permutation(len(splits["train"]))
+        n_test = int(round(len(order) * 0.1))
+        keys = splits["train"]
+        splits = {"train": [keys[i] for i in order[n_test:]], "test": [keys[i] for i in order[:n_test]]}
+    return {split: FeatureStoreDataset(store, keys) for split, keys in splits.items()}
+
+
+def encoder_cache_splits(dataset, model):
+    """FeatureStoreDataset -> EncoderOutputDataset (sorties encodeur calculées une seule fois)."""
+    cache = EncoderOutputCache(dataset["train"].store, model)
+    cache.build(model, [key for split in dataset for key in dataset[split].keys], batch_size=ASR_BATCH_SIZE)
+    return {split: EncoderOutputDataset(cache, dataset[split].keys) for split in dataset}
+
+
+def max_label_length(dataset) -> int:
+    """Plus long label du split (pire cas mémoire du décodeur) ; limite Whisper si inconnu (streaming)."""
+    return max(label_lengths(dataset) or [MAX_LABEL_LENGTH])
+
+
+def tune_batch_size(model, train_dataset, training_args, precision, cached_encoder):
+    """
+    Micro-lot, threads et accumulation de gradient choisis d'après le pic RSS mesuré
+    (src.models.batch_tuner) au lieu de valeurs abaissées à la main après des OOM.
+    En DDP, la sonde tourne sur le rang 0 (budget partagé entre les processus du nœud)
+    et le plan est diffusé : tous les rangs gardent le même lot effectif.
+    """
+    plan = None
+    if training_args.process_index == 0:
+        local_processes = int(os.environ.get("LOCAL_WORLD_SIZE", "1"))
+        plan = probe_batch_plan(model, max_label_length(train_dataset), cached_encoder, precision,
+                                threads=NUM_CORES, tune_threads=not DISTRIBUTED,
+                                budget_mb=memory_budget_mb(processes=local_processes), world_size=WORLD_SIZE)
+    if DISTRIBUTED:
+        shared = [plan]
+        torch.distributed.broadcast_object_list(shared, src=0)
+        plan = shared[0]
+    if plan is None:
+        return
+    training_args.per_device_train_batch_size = plan.micro_batch
+    training_args.gradient_accumulation_steps = plan.grad_accum
+    if not DISTRIBUTED:
+        torch.set_num_threads(plan.threads)
+
+
+wer_metric = evaluate.load("wer")
+
+def train_whisper_on_cpu(dataset=None):
+    """
+    Fine-tune Whisper sur le dataset pré-aligné (verset par verset).
+    Optimisé pour CPU.
+    """
+    model_name = f"openai/whisper-{ASR_MODEL_SIZE}"
+    print(f"--- Initialisation Fine-tuning Whisper ({model_name}) sur CPU ({NUM_CORES} coeurs) ---")
+
+    processor = WhisperProcessor.from_pretrained(model_name, task="transcribe")
+    model = WhisperForConditionalGeneration.from_pretrained(model_name)
+
+    model.config.forced_decoder_ids = None
+    model.config.suppress_tokens = []
+    model.config.use_cache = False  # DOIT être False si gradient_checkpointing est True, et recommandé sur CPU
+
+    # Gel des paramètres (ASR_FREEZE_POLICY / ASR_FREEZE_PERCENT)
+    apply_freeze_policy(model)
+
+    # bf16 (autocast CPU) si le processeur le supporte nativement (ASR_PRECISION)
+    precision = resolve_precision()
+
+    # Training Args CPU Optimized (avant les données : main_process_first en DDP)
     training_args = Seq2SeqTrainingArguments(
         output_dir=str(PROJECT_ROOT / "models" / "whisper-ewe-gegbe-local"),
-        per_device_train_batch_size=ASR_BATCH_SIZE, # 4 ou 8 selons RAM
-        gradient_accumulation_steps=1,             # Désactivé pour debug autograd
+        per_device_train_batch_size=ASR_BATCH_SIZE, # Remplacé par la sonde mémoire si ASR_AUTO_BATCH
+        gradient_accumulation_steps=1,             # Idem (lot effectif ASR_TARGET_BATCH)
         learning_rate=ASR_LEARNING_RATE,
         warmup_steps=50,
         max_steps=1000,                            # Plus de steps car données plus petites/nombreuses
         gradient_checkpointing=False,              # Désactivé car cause RuntimeError sur CPU
         fp16=False,                                # CPU ne supporte pas fp16 (ou mal), bfloat16 si supporté
+        bf16=precision == "bf16",                  # Autocast CPU bf16 (poids maîtres en fp32)
+        torch_compile=ASR_TORCH_COMPILE,
         eval_strategy="steps",
         per_device_eval_batch_size=4,
         predict_with_generate=True,
-        generation_max_length=225,
+        # Évaluation rapide : glouton et longueur réduite (le WER complet est calculé à part)
+        generation_max_length=ASR_FAST_EVAL_MAX_LENGTH if ASR_FAST_EVAL else GENERATION_MAX_LENGTH,
+        generation_num_beams=1 if ASR_FAST_EVAL else None,
         save_steps=200,
         eval_steps=200,
         logging_steps=25,
@@ -190,17 +315,82 @@ def train_whisper_on_cpu(dataset=None):
         greater_is_better=False,
         push_to_hub=False,
         use_cpu=True,                              # Force CPU explicitly if needed
-        dataloader_num_workers=4,                  # Data loading parallélisé
+        dataloader_num_workers=ASR_DDP_DATALOADER_WORKERS if DISTRIBUTED else 4,  # Data loading parallélisé
+        dataloader_prefetch_factor=2,              # Lots préparés d'avance par worker (mémoire bornée)
+        # DDP CPU : gradients synchronisés par gloo ; les couches gelées n'ont pas de gradient
+        ddp_backend=ASR_DDP_BACKEND if DISTRIBUTED else None,
+        ddp_find_unused_parameters=False if DISTRIBUTED else None,
+        # Sans stockage partagé, chaque nœud garde ses checkpoints (rechargement du meilleur modèle)
+        save_on_each_node=DISTRIBUTED and not ASR_DDP_SHARED_STORAGE,
     )
 
+    # 1. Chargement dataset
+    csv_path = None
+    if dataset is None:
+        # Mode "offsets" : segments lus à la volée dans les WAV de chapitre (pas de audio_split/)
+        csv_name = "bible_asr_segments.csv" if ASR_DATASET_MODE == "offsets" else "bible_asr_dataset.csv"
+        csv_path = PROCESSED_DIR / csv_name
+        if not csv_path.exists():
+            raise FileNotFoundError(f"Dataset introuvable : {csv_path}. Veuillez relancer `dataset_builder.py`.")
+
+    if csv_path is not None and ASR_STREAMING:
+        # Streaming : pas de matérialisation, mémoire bornée quelle que soit la taille du corpus
+        dataset = streaming_splits(csv_path, processor)
+        data_collator = DataCollatorSpeechSeq2SeqWithPadding(processor=processor)
+    else:
+        # DDP : le processus principal (du nœud, ou global si stockage partagé) remplit les caches,
+        # les autres attendent puis ne font que relire le FeatureStore / le cache encodeur
+        with training_args.main_process_first(local=not ASR_DDP_SHARED_STORAGE, desc="préparation des features"):
+            dataset = load_splits(dataset, csv_path, processor)
+
+            # 2. Features : store persistant (calcul unique) ou extraction à chaque run
+            if ASR_FEATURE_STORE:
+                dataset = feature_store_splits(dataset, processor, model_name)
+            else:
+                dataset = extract_features(dataset, processor)
+
+            # Encodeur entièrement gelé : ses sorties sont calculées une fois, les époques n'exécutent que le décodeur
+            if ASR_FEATURE_STORE and ASR_CACHE_ENCODER_OUTPUTS and encoder_frozen(model):
+                dataset = encoder_cache_splits(dataset, model)
+                data_collator = DataCollatorEncoderOutputs(processor=processor)
+            else:
+                data_collator = DataCollatorSpeechSeq2SeqWithPadding(processor=processor)
+
+    # Évaluation : sous-ensemble fixe pendant l'entraînement, split complet hors du chemin critique
+    eval_dataset, callbacks = dataset["test"], []
+    if ASR_FAST_EVAL:
+        if ASR_ASYNC_FULL_EVAL and isinstance(eval_dataset, (FeatureStoreDataset, EncoderOutputDataset)):
+            if training_args.process_index == 0:
+                write_spec(training_args.output_dir, model_name, eval_dataset,
+                           GENERATION_MAX_LENGTH, training_args.per_device_eval_batch_size)
+            spec_path = os.path.join(training_args.output_dir, SPEC_FILE)
+            callbacks.append(FullEvalCallback(spec_path))
+        eval_dataset = fast_eval_subset(eval_dataset, ASR_FAST_EVAL_SAMPLES)
+
+    # 3. Lot : plus grand micro-lot tenant en RAM + accumulation jusqu'au lot effectif visé
+    if ASR_AUTO_BATCH:
+        tune_batch_size(model, dataset["train"], training_args, precision,
+                        cached_encoder=isinstance(data_collator, DataCollatorEncoderOutputs))
+
+    # 4. Métriques
+    def compute_metrics(pred):
+        pred_ids = pred.predictions
+        label_ids = pred.label_ids
+        label_ids[label_ids == -100] = processor.tokenizer.pad_token_id
+        pred_str = processor.tokenizer.batch_decode(pred_ids, skip_special_tokens=True)
+        label_str = processor.tokenizer.batch_decode(label_ids, skip_special_tokens=True)
+        wer = wer_metric.compute(predictions=pred_str, references=label_str)
+        return {"wer": wer}
+
     trainer = Seq2SeqTrainer(
         args=training_args,
         model=model,
         train_dataset=dataset["train"],
-        eval_dataset=dataset["test"],
+        eval_dataset=eval_dataset,
         data_collator=data_collator,
-        tokenizer=processor.feature_extractor,
+        processing_class=processor.feature_extractor,
         compute_metrics=compute_metrics,
+        callbacks=callbacks,
     )
 
     print("Démarrage de l'entraînement...")
@@ -208,8 +398,10 @@ def train_whisper_on_cpu(dataset=None):
     
     final_path = PROJECT_ROOT / "models" / "whisper-ewe-mina-final"
     trainer.save_model(final_path)
-    processor.save_pretrained(final_path)
-    print(f"Modèle sauvegardé : {final_path}")
+    if training_args.should_save:
+        # DDP : un seul processus écrit (par nœud si save_on_each_node)
+        processor.save_pretrained(final_path)
+        print(f"Modèle sauvegardé : {final_path}")
     return model, processor
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import os
 import logging
+from pathlib import Path
 from transformers import MarianMTModel, MarianTokenizer
 import ctranslate2
 from src.config.settings import EWE_FR_MODEL, PROJECT_ROOT
@@ -8,10 +9,11 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class EweFrenchTranslator:
-    def __init__(self, use_ctranslate2=True, model_path=None):
+    def __init__(self, use_ctranslate2=True, model_path=None, ct_model_path=None):
+        # Sert aussi pour l'élève distillé Mina -> Français (même architecture Marian)
         self.model_name = model_path if model_path else EWE_FR_MODEL
         self.use_ctranslate = use_ctranslate2
-        self.ct_model_path = PROJECT_ROOT / "models" / "ewe_fr_ct2"
+        self.ct_model_path = Path(ct_model_path) if ct_model_path else PROJECT_ROOT / "models" / "ewe_fr_ct2"
         
         self.tokenizer = MarianTokenizer.from_pretrained(self.model_name)
         
@@ -26,16 +28,30 @@ class EweFrenchTranslator:
     def translate(self, text):
         if not text:
             return ""
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        """Traduit une liste de phrases en un seul appel (lots CTranslate2 ou generate paddé)."""
+        indices = [i for i, text in enumerate(texts) if text]
+        results = [""] * len(texts)
+        if not indices:
+            return results
 
         if self.use_ctranslate:
-            source = self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text))
-            results = self.translator.translate_batch([source])
-            target = results[0].hypotheses[0]
-            return self.tokenizer.decode(self.tokenizer.convert_tokens_to_ids(target), skip_special_tokens=True)
+            sources = [self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(texts[i])) for i in indices]
+            outputs = self.translator.translate_batch(sources)
+            translations = [
+                self.tokenizer.decode(self.tokenizer.convert_tokens_to_ids(out.hypotheses[0]), skip_special_tokens=True)
+                for out in outputs
+            ]
         else:
-            inputs = self.tokenizer(text, return_tensors="pt", padding=True)
+            inputs = self.tokenizer([texts[i] for i in indices], return_tensors="pt", padding=True)
             translated = self.model.generate(**inputs)
-            return self.tokenizer.decode(translated[0], skip_special_tokens=True)
+            translations = self.tokenizer.batch_decode(translated, skip_special_tokens=True)
+
+        for i, translation in zip(indices, translations):
+            results[i] = translation
+        return results
 
 if __name__ == "__main__":
     # Test simple
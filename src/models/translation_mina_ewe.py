@@ -1,16 +1,37 @@
 import logging
+from collections import Counter
+from pathlib import Path
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
-from src.config.settings import NMT_MODEL_SIZE, NMT_DEVICE, PROJECT_ROOT
+from src.config.settings import (
+    NMT_MODEL_SIZE,
+    NMT_DEVICE,
+    NMT_TRIMMED_DIR,
+    NMT_PHRASE_TABLE,
+    PHRASE_TABLE_PATH,
+    PHRASE_TABLE_MIN_COVERAGE,
+    PHRASE_TABLE_MIN_CONFIDENCE,
+    PROJECT_ROOT,
+)
+from src.models.phrase_table import PhraseTable
+from src.models.vocab_trim import TrimmedVocab, stale_trimmed_source
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class MinaEweTranslator:
-    def __init__(self, model_path=None):
-        # Par défaut on cherche le modèle fine-tuné localement, sinon NLLB-200
+    def __init__(self, model_path=None, phrase_table_path=None, use_phrase_table=None):
+        # Par défaut on cherche le modèle fine-tuné localement (vocabulaire réduit d'abord), sinon NLLB-200
         default_local = PROJECT_ROOT / "models" / "nllb-mina-ewe-final"
         if model_path:
             self.model_name = model_path
+        elif NMT_TRIMMED_DIR.exists():
+            self.model_name = str(NMT_TRIMMED_DIR)
+            # Checkpoint réentraîné depuis la réduction : le modèle réduit servirait l'ancien modèle
+            source = stale_trimmed_source(NMT_TRIMMED_DIR)
+            if source:
+                logger.warning(f"Modèle réduit périmé ({source} modifié depuis) : utilisation du checkpoint complet. "
+                               f"Relancer `python -m src.models.vocab_trim`.")
+                self.model_name = source
         elif default_local.exists():
             self.model_name = str(default_local)
         else:
@@ -20,24 +41,77 @@ class MinaEweTranslator:
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
         self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
         self.model.to(NMT_DEVICE)
+        # Modèle au vocabulaire réduit : identifiants du tokenizer renumérotés (None sinon)
+        self.vocab = TrimmedVocab.load(self.model_name)
+
+        # Niveau zéro : table de segments apprise sur le corpus aligné (phrases bien couvertes seulement)
+        self.phrase_table = None
+        use_phrase_table = NMT_PHRASE_TABLE if use_phrase_table is None else use_phrase_table
+        phrase_table_path = Path(phrase_table_path or PHRASE_TABLE_PATH)
+        if use_phrase_table and phrase_table_path.exists():
+            self.phrase_table = PhraseTable.load(phrase_table_path)
+            logger.info(f"Table de segments Mina-Ewe : {len(self.phrase_table)} segments ({phrase_table_path})")
+        self.stats = Counter()  # Phrases servies par niveau : "phrase_table" / "nllb"
 
     def translate(self, text):
         if not text:
             return ""
-        
+        return self.translate_batch([text])[0]
+
+    def translate_fast(self, text):
+        """Traduction par la table de segments si couverture et confiance suffisent, sinon None."""
+        if self.phrase_table is None:
+            return None
+        result = self.phrase_table.translate(text)
+        if result.coverage >= PHRASE_TABLE_MIN_COVERAGE and result.confidence >= PHRASE_TABLE_MIN_CONFIDENCE:
+            return result.text
+        return None
+
+    def translate_batch(self, texts):
+        """Table de segments d'abord ; les phrases restantes passent par NLLB en un seul lot."""
+        results = [""] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            fast = self.translate_fast(text)
+            if fast is None:
+                pending.append(i)
+            else:
+                results[i] = fast
+        self.stats["phrase_table"] += len([t for t in texts if t]) - len(pending)
+        self.stats["nllb"] += len(pending)
+        for i, translation in zip(pending, self.translate_nllb([texts[i] for i in pending])):
+            results[i] = translation
+        return results
+
+    def translate_nllb(self, texts):
+        """Traduit une liste de phrases avec NLLB en un seul appel à generate (lots paddés)."""
         # Le Mina et l'Ewe n'ont pas de codes officiels distincts dans NLLB pour le moment
         # On utilise ewe_Latn comme cible. Pour la source, on utilise ewe_Latn ou ace_Latn par défaut
         # Note: Dans un vrai fine-tuning, on peut définir des jetons spéciaux.
-        inputs = self.tokenizer(text, return_tensors="pt").to(NMT_DEVICE)
+        indices = [i for i, text in enumerate(texts) if text]
+        results = [""] * len(texts)
+        if not indices:
+            return results
+        inputs = self.tokenizer([texts[i] for i in indices], return_tensors="pt", padding=True).to(NMT_DEVICE)
+        forced_bos_token_id = self.tokenizer.convert_tokens_to_ids("ewe_Latn")
+        if self.vocab is not None:
+            inputs["input_ids"] = self.vocab.to_model(inputs["input_ids"])
+            forced_bos_token_id = self.vocab.to_model(forced_bos_token_id)
         
         # On force la langue cible à l'Ewe
         translated_tokens = self.model.generate(
             **inputs, 
-            forced_bos_token_id=self.tokenizer.convert_tokens_to_ids("ewe_Latn"), 
+            forced_bos_token_id=forced_bos_token_id, 
             max_length=128
         )
+        if self.vocab is not None:
+            translated_tokens = self.vocab.to_tokenizer(translated_tokens)
         
-        return self.tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)[0]
+        for i, translation in zip(indices, self.tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)):
+            results[i] = translation
+        return results
 
 if __name__ == "__main__":
     translator = MinaEweTranslator()
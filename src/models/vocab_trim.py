@@ -0,0 +1,193 @@
+"""
+Réduction du vocabulaire de NLLB aux tokens du corpus Mina / Ewe.
+
+NLLB-200 embarque ~256k tokens pour 200 langues ; le pivot ne lit que du Mina et
+n'écrit que de l'Ewe. On garde les tokens produits par le tokenizer sur le corpus
+(plus les tokens spéciaux et les codes de langue utilisés), on découpe la matrice
+d'embeddings partagée et la projection de sortie (lm_head), et on enregistre la
+correspondance des identifiants (vocab_map.json). Le tokenizer d'origine est
+conservé tel quel : MinaEweTranslator convertit les identifiants à l'entrée et à
+la sortie du modèle réduit.
+
+    python -m src.models.vocab_trim --model models/nllb-mina-ewe-final --output models/nllb-mina-ewe-trimmed
+"""
+import csv
+import json
+import logging
+from pathlib import Path
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from src.config.settings import NMT_SRC_LANG, NMT_TGT_LANG, NMT_MAX_LENGTH, NMT_TRIMMED_DIR, PROCESSED_DIR
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PARALLEL_CSV = PROCESSED_DIR / "mina_ewe_parallel.csv"
+VOCAB_MAP_FILE = "vocab_map.json"
+# Identifiants de tokens portés par la configuration et la configuration de génération
+TOKEN_ID_ATTRS = ("pad_token_id", "bos_token_id", "eos_token_id", "decoder_start_token_id",
+                  "forced_bos_token_id", "forced_eos_token_id")
+
+
+class TrimmedVocab:
+    """Correspondance identifiants du tokenizer d'origine <-> identifiants du modèle réduit."""
+
+    def __init__(self, kept_ids, tokenizer_size, unk_id, source=None):
+        self.kept_ids = sorted(kept_ids)
+        # Checkpoint complet d'origine : {"path", "mtime_ns"} (None si inconnu)
+        self.source = source
+        self.tokenizer_size = max(tokenizer_size, self.kept_ids[-1] + 1)
+        self.unk_id = unk_id
+        self.new_to_old = torch.tensor(self.kept_ids, dtype=torch.long)
+        # Token absent du corpus (texte nouveau) -> <unk> du modèle réduit
+        self.old_to_new = torch.full((self.tokenizer_size,), self.kept_ids.index(unk_id), dtype=torch.long)
+        self.old_to_new[self.new_to_old] = torch.arange(len(self.kept_ids))
+
+    def __len__(self):
+        return len(self.kept_ids)
+
+    def to_model(self, ids):
+        """Identifiants du tokenizer -> identifiants du modèle réduit (entier ou tenseur)."""
+        if isinstance(ids, int):
+            return int(self.old_to_new[ids])
+        return self.old_to_new.to(ids.device)[ids]
+
+    def to_tokenizer(self, ids):
+        """Identifiants générés par le modèle réduit -> identifiants du tokenizer (decode)."""
+        return self.new_to_old.to(ids.device)[ids]
+
+    def save(self, model_dir):
+        data = {"kept_ids": self.kept_ids, "tokenizer_size": self.tokenizer_size, "unk_id": self.unk_id,
+                "source": self.source}
+        (Path(model_dir) / VOCAB_MAP_FILE).write_text(json.dumps(data), encoding="utf-8")
+
+    @classmethod
+    def load(cls, model_dir):
+        """Correspondance du checkpoint, ou None pour un modèle au vocabulaire complet."""
+        path = Path(model_dir) / VOCAB_MAP_FILE
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data["kept_ids"], data["tokenizer_size"], data["unk_id"], data.get("source"))
+
+    def is_stale(self):
+        """Vrai si le checkpoint d'origine a été réécrit (réentraîné) depuis la réduction."""
+        if not self.source:
+            return False
+        current = checkpoint_mtime(self.source["path"])
+        return current is not None and current != self.source["mtime_ns"]
+
+
+def checkpoint_mtime(model_dir):
+    """Date de modification (ns) la plus récente des poids / config d'un checkpoint local, None sinon."""
+    model_dir = Path(model_dir)
+    if not model_dir.is_dir():
+        return None
+    files = [p for p in model_dir.iterdir() if p.suffix in (".safetensors", ".bin") or p.name == "config.json"]
+    return max((p.stat().st_mtime_ns for p in files), default=None)
+
+
+def stale_trimmed_source(trimmed_dir):
+    """Checkpoint d'origine si le modèle réduit `trimmed_dir` est périmé, sinon None."""
+    vocab = TrimmedVocab.load(trimmed_dir)
+    if vocab is not None and vocab.is_stale():
+        return vocab.source["path"]
+    return None
+
+
+def read_parallel_corpus(csv_path=None):
+    """Colonnes mina / ewe du corpus parallèle (lignes vides ignorées)."""
+    sources, targets = [], []
+    with open(csv_path or PARALLEL_CSV, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            mina, ewe = (row.get("mina") or "").strip(), (row.get("ewe") or "").strip()
+            if mina and ewe:
+                sources.append(mina)
+                targets.append(ewe)
+    return sources, targets
+
+
+def corpus_token_ids(tokenizer, sources, targets, batch_size=1000):
+    """
+    Tokens à conserver : ceux du corpus tokenisé comme à l'entraînement (source et
+    cible, codes de langue inclus), plus tous les tokens spéciaux du tokenizer.
+    """
+    kept = set(tokenizer.all_special_ids)
+    kept.update(tokenizer.convert_tokens_to_ids([NMT_SRC_LANG, NMT_TGT_LANG]))
+    for start in range(0, len(sources), batch_size):
+        encoded = tokenizer(sources[start:start + batch_size], text_target=targets[start:start + batch_size],
+                            max_length=NMT_MAX_LENGTH, truncation=True)
+        for ids in encoded["input_ids"] + encoded["labels"]:
+            kept.update(ids)
+    return kept
+
+
+def trim_model(model, vocab: TrimmedVocab):
+    """
+    Copie du modèle réduite au vocabulaire `vocab` : lignes des embeddings (partagés
+    encodeur / décodeur) et de lm_head, biais de sortie éventuel, identifiants
+    spéciaux de la configuration renumérotés.
+    """
+    old_size = model.config.vocab_size
+    index = vocab.new_to_old
+    state_dict = {}
+    for name, tensor in model.state_dict().items():
+        if name.endswith("final_logits_bias"):
+            tensor = tensor[:, index]
+        elif tensor.dim() >= 1 and tensor.shape[0] == old_size:
+            tensor = tensor[index]
+        state_dict[name] = tensor.clone()
+
+    config = model.config.__class__.from_dict(model.config.to_dict())
+    config.vocab_size = len(vocab)
+    generation_config = model.generation_config.__class__.from_dict(model.generation_config.to_dict())
+    for target in (config, generation_config):
+        for attr in TOKEN_ID_ATTRS:
+            value = getattr(target, attr, None)
+            if isinstance(value, int):
+                setattr(target, attr, vocab.to_model(value))
+
+    trimmed = model.__class__(config)
+    trimmed.load_state_dict(state_dict)
+    trimmed.generation_config = generation_config
+    return trimmed.eval()
+
+
+def model_size_mb(model):
+    return sum(p.numel() * p.element_size() for p in model.parameters()) / 1024 ** 2
+
+
+def trim_checkpoint(model_dir, output_dir=None, csv_path=None):
+    """Réduit le checkpoint `model_dir` au vocabulaire du corpus parallèle et l'enregistre dans `output_dir`."""
+    output_dir = Path(output_dir or NMT_TRIMMED_DIR)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, src_lang=NMT_SRC_LANG, tgt_lang=NMT_TGT_LANG)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_dir)
+
+    sources, targets = read_parallel_corpus(csv_path)
+    source = {"path": str(Path(model_dir).resolve()), "mtime_ns": checkpoint_mtime(model_dir)} \
+        if Path(model_dir).is_dir() else None
+    vocab = TrimmedVocab(corpus_token_ids(tokenizer, sources, targets), len(tokenizer), tokenizer.unk_token_id, source)
+    trimmed = trim_model(model, vocab)
+    logger.info(f"Vocabulaire : {len(vocab)} / {model.config.vocab_size} tokens ({len(sources)} paires), "
+                f"modèle {model_size_mb(trimmed):.0f} Mo au lieu de {model_size_mb(model):.0f} Mo")
+
+    trimmed.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    vocab.save(output_dir)
+    logger.info(f"Modèle réduit sauvegardé : {output_dir}")
+    return trimmed, tokenizer, vocab
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.models.train_translation_cpu import FINAL_DIR
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=str(FINAL_DIR))
+    parser.add_argument("--output", type=Path, default=NMT_TRIMMED_DIR)
+    parser.add_argument("--csv", type=Path, default=PARALLEL_CSV)
+    args = parser.parse_args()
+    trim_checkpoint(args.model, args.output, args.csv)
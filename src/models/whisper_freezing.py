@@ -0,0 +1,72 @@
+import logging
+
+from src.config.settings import ASR_FREEZE_PERCENT, ASR_FREEZE_POLICY
+
+logger = logging.getLogger(__name__)
+
+FREEZE_POLICIES = ("none", "percent", "encoder")
+
+
+def layer_blocks(model):
+    """
+    Blocs de paramètres de Whisper dans l'ordre du calcul (entrée -> sortie) :
+    convolutions, positions et couches de l'encodeur, puis embeddings et couches du décodeur.
+    proj_out partage ses poids avec decoder.embed_tokens.
+    """
+    encoder, decoder = model.model.encoder, model.model.decoder
+    blocks = [("encoder.stem", [encoder.conv1, encoder.conv2, encoder.embed_positions])]
+    blocks += [(f"encoder.layers.{i}", [layer]) for i, layer in enumerate(encoder.layers)]
+    blocks.append(("encoder.layer_norm", [encoder.layer_norm]))
+    blocks.append(("decoder.embeddings", [decoder.embed_tokens, decoder.embed_positions]))
+    blocks += [(f"decoder.layers.{i}", [layer]) for i, layer in enumerate(decoder.layers)]
+    blocks.append(("decoder.layer_norm", [decoder.layer_norm]))
+    return blocks
+
+
+def _count(modules) -> int:
+    return sum(p.numel() for m in modules for p in m.parameters())
+
+
+def freeze_percent(model, percent: float):
+    """
+    Gèle les blocs depuis l'entrée jusqu'à couvrir `percent` des paramètres
+    (granularité : une couche). Les dernières couches du décodeur restent entraînables.
+    """
+    total = sum(p.numel() for p in model.parameters())
+    frozen = 0
+    for name, modules in layer_blocks(model):
+        if frozen >= percent * total:
+            break
+        for module in modules:
+            module.requires_grad_(False)
+        frozen += _count(modules)
+
+
+def apply_freeze_policy(model, policy=None, percent=None):
+    """
+    Politiques de gel (ASR_FREEZE_POLICY) :
+    - "none"    : tout est entraîné
+    - "percent" : les premières couches, jusqu'à ASR_FREEZE_PERCENT des paramètres
+    - "encoder" : tout l'encodeur (le décodeur reste entraînable)
+    Retourne le nombre de paramètres entraînables.
+    """
+    policy = policy or ASR_FREEZE_POLICY
+    percent = ASR_FREEZE_PERCENT if percent is None else percent
+    if policy not in FREEZE_POLICIES:
+        raise ValueError(f"Politique de gel inconnue : {policy}. Options : {FREEZE_POLICIES}")
+
+    if policy == "percent":
+        freeze_percent(model, percent)
+    elif policy == "encoder":
+        model.freeze_encoder()
+
+    total = sum(p.numel() for p in model.parameters())
+    trainable = sum(p.numel() for p in model.parameters() if p.requires_grad)
+    logger.info(f"Gel '{policy}' : {trainable / 1e6:.1f}M / {total / 1e6:.1f}M paramètres entraînables "
+                f"({1 - trainable / total:.0%} gelés), encodeur {'gelé' if encoder_frozen(model) else 'entraîné'}")
+    return trainable
+
+
+def encoder_frozen(model) -> bool:
+    """Vrai si aucun paramètre de l'encodeur n'est entraîné : ses sorties peuvent être mises en cache."""
+    return not any(p.requires_grad for p in model.model.encoder.parameters())
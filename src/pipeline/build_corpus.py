@@ -1,32 +1,56 @@
+import argparse
 import asyncio
-import sys
-from src.scraping.ewe_bible_scraper import EweBibleScraper
-from src.scraping.gegbe_bible_scraper import GegbeBibleScraper
+from src.config.settings import SCRAPER_MAX_CONCURRENCY, SCRAPER_REQUESTS_PER_SECOND
+from src.scraping.bible_scraper import BibleScraper, ScrapeBudget
+from src.scraping.versions import BIBLE_VERSIONS
 
-async def scrape_language(scraper_class, lang_name):
-    print(f"--- Scraping {lang_name} ---")
-    scraper = scraper_class()  # Utilise les chemins par défaut de settings.py
-    await scraper.init_session()
+async def scrape_versions(langs, max_concurrency=SCRAPER_MAX_CONCURRENCY,
+                          requests_per_second=SCRAPER_REQUESTS_PER_SECOND,
+                          versions=None, **scraper_kwargs):
+    """
+    Scrape plusieurs versions en même temps sous un budget global commun
+    (concurrence + débit). La durée totale est bornée par la version la plus longue.
+    `versions` permet de remplacer les descripteurs (ex: serveur local de benchmark),
+    `scraper_kwargs` est transmis à chaque BibleScraper (output_dir, cache, use_browser...).
+    """
+    versions = versions or BIBLE_VERSIONS
+    budget = ScrapeBudget(max_concurrency, requests_per_second)
+    scrapers = [BibleScraper(versions[lang], budget=budget, **scraper_kwargs) for lang in langs]
+    print(f"--- Scraping {', '.join(langs)} (concurrence={max_concurrency}, {requests_per_second} req/s) ---")
 
+    for scraper in scrapers:
+        await scraper.init_session()
     try:
-        for book_code, book_info in scraper.books.items():
-            for chapter in range(1, book_info["chapters"] + 1):
-                await scraper.process_chapter(book_code, chapter)
-        
-        scraper.save_corpus_data()
+        await asyncio.gather(*(scraper.scrape_all() for scraper in scrapers))
     finally:
-        await scraper.close_session()
+        for scraper in scrapers:
+            await scraper.close_session()
 
-async def run(lang=None):
-    if lang == "ewe":
-        await scrape_language(EweBibleScraper, "Ewe")
-    elif lang == "gegbe":
-        await scrape_language(GegbeBibleScraper, "Gegbe")
+    return scrapers
+
+def reparse_versions(langs, max_workers=None):
+    """Reconstruit les *_bible_raw.json depuis le cache HTML, sans réseau."""
+    print(f"--- Re-parsing hors ligne de {', '.join(langs)} depuis le cache HTML ---")
+    return [
+        BibleScraper(BIBLE_VERSIONS[lang]).reparse_from_cache(max_workers=max_workers)
+        for lang in langs
+    ]
+
+async def run(lang=None, reparse=False):
+    if lang is None:
+        langs = list(BIBLE_VERSIONS.keys())
+    else:
+        langs = [l.strip() for l in lang.split(",") if l.strip()]
+        unknown = [l for l in langs if l not in BIBLE_VERSIONS]
+        if unknown:
+            raise ValueError(f"Version(s) inconnue(s) : {unknown}. Disponibles : {list(BIBLE_VERSIONS)}")
+
+    if reparse:
+        reparse_versions(langs)
     else:
-        # Scrape les deux
-        await scrape_language(EweBibleScraper, "Ewe")
-        await scrape_language(GegbeBibleScraper, "Gegbe")
-        
+        await scrape_versions(langs)
+
+    if lang is None:
         # Lance l'alignement parallèle
         from src.preprocessing.parallel_aligner import ParallelAligner
         print("--- Alignement du corpus parallèle ---")
@@ -35,6 +59,10 @@ async def run(lang=None):
 
 if __name__ == "__main__":
     # Permet de passer la langue en argument : python -m src.pipeline.build_corpus ewe
-    target_lang = sys.argv[1] if len(sys.argv) > 1 else None
-    asyncio.run(run(target_lang))
-
+    # ou plusieurs versions : python -m src.pipeline.build_corpus ewe,gegbe
+    # Re-parsing hors ligne après une correction du parser : python -m src.pipeline.build_corpus --reparse
+    parser = argparse.ArgumentParser(description="Scraping des Bibles Ewe / Gbe")
+    parser.add_argument("lang", nargs="?", default=None, help="ewe, gegbe ou liste séparée par des virgules")
+    parser.add_argument("--reparse", action="store_true", help="Reconstruire le corpus depuis le cache HTML (sans réseau)")
+    args = parser.parse_args()
+    asyncio.run(run(args.lang, reparse=args.reparse))
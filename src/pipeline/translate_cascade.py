@@ -1,33 +1,66 @@
 import logging
 from src.models.translation_mina_ewe import MinaEweTranslator
 from src.models.translation_ewe_fr import EweFrenchTranslator
+from src.config.settings import CASCADE_MODE, MINA_FR_STUDENT_DIR, MINA_FR_CT2_DIR
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MODES = ("cascade", "direct")
+
 class TranslationCascade:
-    def __init__(self, nllb_path=None, opus_path=None):
+    def __init__(self, nllb_path=None, opus_path=None, mode=None, student_path=None):
+        # "cascade" : Mina -> Ewe (NLLB) -> Français (OPUS-MT)
+        # "direct" : élève Marian Mina -> Français distillé de la cascade (src/models/distill_mina_fr.py)
+        self.mode = mode or CASCADE_MODE
+        if self.mode not in MODES:
+            raise ValueError(f"Mode de traduction inconnu : {self.mode} (attendu : {', '.join(MODES)})")
+
+        if self.mode == "direct":
+            logger.info("Initialisation de la traduction directe Mina -> Français...")
+            self.mina_fr = EweFrenchTranslator(
+                use_ctranslate2=True,
+                model_path=student_path or str(MINA_FR_STUDENT_DIR),
+                ct_model_path=MINA_FR_CT2_DIR,  # Export int8 ; sinon le modèle Transformers de l'élève
+            )
+            return
+
         logger.info("Initialisation de la cascade de traduction...")
         self.mina_ewe = MinaEweTranslator(model_path=nllb_path)
         self.ewe_fr = EweFrenchTranslator(use_ctranslate2=True, model_path=opus_path) # Fallback auto si pas converti
 
     def translate_mina_to_french(self, mina_text):
         logger.info(f"Source (Mina): {mina_text}")
-        
+
+        if self.mode == "direct":
+            french_text = self.mina_fr.translate(mina_text)
+            logger.info(f"Cible (Français, direct): {french_text}")
+            return {"mina": mina_text, "ewe": None, "french": french_text}
+
         # 1. Mina -> Ewe
         ewe_text = self.mina_ewe.translate(mina_text)
         logger.info(f"Pivot (Ewe): {ewe_text}")
-        
+
         # 2. Ewe -> French
         french_text = self.ewe_fr.translate(ewe_text)
         logger.info(f"Cible (Français): {french_text}")
-        
+
         return {
             "mina": mina_text,
             "ewe": ewe_text,
             "french": french_text
         }
 
+    def translate_batch_mina_to_french(self, mina_texts):
+        """Version par lots (génération des cibles de distillation, benchmarks) : un dict par phrase."""
+        if self.mode == "direct":
+            french_texts = self.mina_fr.translate_batch(mina_texts)
+            return [{"mina": m, "ewe": None, "french": f} for m, f in zip(mina_texts, french_texts)]
+
+        ewe_texts = self.mina_ewe.translate_batch(mina_texts)
+        french_texts = self.ewe_fr.translate_batch(ewe_texts)
+        return [{"mina": m, "ewe": e, "french": f} for m, e, f in zip(mina_texts, ewe_texts, french_texts)]
+
 if __name__ == "__main__":
     cascade = TranslationCascade()
     result = cascade.translate_mina_to_french("Egbé nyé gbe gba.")
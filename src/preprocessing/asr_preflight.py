@@ -0,0 +1,144 @@
+import csv
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+
+from src.config.settings import (
+    PROCESSED_DIR,
+    ASR_MIN_DURATION_MS,
+    ASR_MAX_DURATION_MS,
+    ASR_MAX_LABEL_TOKENS,
+)
+from src.preprocessing.silence import read_wav_int16
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STATS_PATH = PROCESSED_DIR / "asr_preflight_stats.json"
+REASONS = ("unreadable", "empty_text", "too_short", "too_long", "labels_too_long")
+
+
+class WavHeaders:
+    """Durées lues dans les seuls en-têtes WAV (aucun échantillon décodé), mises en cache par fichier."""
+
+    def __init__(self):
+        self._durations = {}
+
+    def duration_ms(self, path: str):
+        """Durée en ms, ou None si le fichier est absent / illisible."""
+        if path not in self._durations:
+            try:
+                samples, rate, channels = read_wav_int16(path)
+                self._durations[path] = len(samples) // channels * 1000 // rate
+            except (OSError, ValueError) as e:
+                logger.warning(f"WAV illisible {path}: {e}")
+                self._durations[path] = None
+        return self._durations[path]
+
+
+def row_duration_ms(row: dict, headers: WavHeaders):
+    """Durée d'une ligne du manifeste ; None si l'audio est illisible ou le segment hors du fichier."""
+    if row.get("parts"):
+        parts = json.loads(row["parts"]) if isinstance(row["parts"], str) else row["parts"]
+        durations = [headers.duration_ms(path) for path in parts]
+        if any(d is None for d in durations):
+            return None
+        return sum(durations) + int(row.get("gap_ms") or 0) * (len(parts) - 1)
+    if row.get("chapter_wav"):
+        total = headers.duration_ms(row["chapter_wav"])
+        start, end = int(row["start_ms"]), int(row["end_ms"])
+        if total is None or start < 0 or end > total + 1:
+            return None
+        return end - start
+    return headers.duration_ms(row["audio_filepath"])
+
+
+def reject_reason(duration, text, n_labels, min_ms, max_ms, max_labels):
+    """Motif de rejet d'un exemple (cf. REASONS), ou None s'il est conservé."""
+    if duration is None:
+        return "unreadable"
+    if not text:
+        return "empty_text"
+    if duration < min_ms:
+        return "too_short"
+    if duration > max_ms:
+        return "too_long"
+    if n_labels > max_labels:
+        return "labels_too_long"
+    return None
+
+
+def preflight(rows, tokenizer, min_ms=None, max_ms=None, max_labels=None):
+    """
+    Contrôle bon marché de chaque ligne du manifeste ASR avant extraction des features.
+    Rejette : audio illisible, texte vide, segment trop court / > 30 s, labels > 448 tokens.
+    Retourne (indices conservés, stats).
+    """
+    min_ms = ASR_MIN_DURATION_MS if min_ms is None else min_ms
+    max_ms = ASR_MAX_DURATION_MS if max_ms is None else max_ms
+    max_labels = ASR_MAX_LABEL_TOKENS if max_labels is None else max_labels
+
+    headers = WavHeaders()
+    texts = [str(row.get("text") or "").strip() for row in rows]
+    # Tokenisation en un seul appel (tokenizer rapide)
+    label_lengths = [len(ids) for ids in tokenizer(texts).input_ids] if rows else []
+
+    kept, rejected = [], Counter()
+    by_language = {}
+    kept_ms = 0
+    for i, row in enumerate(rows):
+        duration = row_duration_ms(row, headers)
+        reason = reject_reason(duration, texts[i], label_lengths[i], min_ms, max_ms, max_labels)
+
+        lang_stats = by_language.setdefault(str(row.get("language", "")), {"kept": 0, "rejected": 0})
+        if reason:
+            rejected[reason] += 1
+            lang_stats["rejected"] += 1
+            continue
+        kept.append(i)
+        kept_ms += duration
+        lang_stats["kept"] += 1
+
+    stats = {
+        "total": len(rows),
+        "kept": len(kept),
+        "rejected": {reason: rejected.get(reason, 0) for reason in REASONS},
+        "kept_hours": round(kept_ms / 3_600_000, 2),
+        "by_language": by_language,
+        "limits": {"min_ms": min_ms, "max_ms": max_ms, "max_labels": max_labels},
+    }
+    logger.info(f"Pré-filtrage : {len(kept)}/{len(rows)} exemples conservés ({stats['kept_hours']} h), "
+                f"rejets : {dict(rejected)}")
+    return kept, stats
+
+
+def save_stats(stats: dict, path: Path = None):
+    path = Path(path or STATS_PATH)
+    path.write_text(json.dumps(stats, indent=2, ensure_ascii=False), encoding="utf-8")
+    logger.info(f"Statistiques de pré-filtrage : {path}")
+
+
+if __name__ == "__main__":
+    # python -m src.preprocessing.asr_preflight data/processed/bible_asr_segments.csv
+    import argparse
+    from transformers import WhisperTokenizerFast
+    from src.config.settings import ASR_MODEL_SIZE
+
+    parser = argparse.ArgumentParser(description="Pré-filtrage du manifeste ASR (en-têtes WAV + tokens)")
+    parser.add_argument("csv_path", type=Path)
+    parser.add_argument("--model", default=f"openai/whisper-{ASR_MODEL_SIZE}")
+    args = parser.parse_args()
+
+    with open(args.csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames, csv_rows = reader.fieldnames, list(reader)
+
+    kept_idx, preflight_stats = preflight(csv_rows, WhisperTokenizerFast.from_pretrained(args.model))
+    out_path = args.csv_path.with_name(args.csv_path.stem + ".preflight.csv")
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(csv_rows[i] for i in kept_idx)
+    logger.info(f"Manifeste filtré : {out_path}")
+    save_stats(preflight_stats)
@@ -4,21 +4,26 @@ import math
 from pathlib import Path
 try:
     from pydub import AudioSegment
-    from pydub.silence import detect_silence
     PYDUB_AVAILABLE = True
 except ImportError:
     PYDUB_AVAILABLE = False
 
 from src.config.settings import PROCESSED_DIR
+from src.preprocessing.silence import read_wav_int16, detect_silence_np, duration_ms
 
 logger = logging.getLogger(__name__)
 
-def align_chapter(audio_path: Path, verses: list, output_dir: Path, lang_prefix: str, book_chapter_id: str):
+def align_chapter(audio_path: Path, verses: list, output_dir: Path, lang_prefix: str, book_chapter_id: str,
+                  export: bool = True):
     """
     Aligns a long chapter audio file with its verses using a length-based heuristic
     snapped to silence.
+
+    export=True  : each verse is written to its own WAV in output_dir (audio_filepath rows).
+    export=False : nothing is written, rows only carry offsets into the chapter WAV
+                   (chapter_wav, start_ms, end_ms), read lazily at training time.
     """
-    if not PYDUB_AVAILABLE:
+    if export and not PYDUB_AVAILABLE:
         logger.error("pydub not installed. Cannot align audio properly.")
         return []
 
@@ -26,20 +31,24 @@ def align_chapter(audio_path: Path, verses: list, output_dir: Path, lang_prefix:
         logger.warning(f"Audio file not found: {audio_path}")
         return []
 
-    # Load Audio
+    # Load Audio (samples int16 mappés en mémoire pour la détection de silence)
     try:
-        audio = AudioSegment.from_wav(str(audio_path))
+        audio = AudioSegment.from_wav(str(audio_path)) if export else None
+        samples, frame_rate, channels = read_wav_int16(audio_path)
     except Exception as e:
         logger.error(f"Failed to load audio {audio_path}: {e}")
         return []
+    audio_ms = duration_ms(len(samples) // channels, frame_rate)
+    samples_per_ms = frame_rate * channels // 1000
     
     # 1. Detect active range (crop silence/intro/outro)
     # This helps if there's a long intro music or outro
-    silence_ranges = detect_silence(audio, min_silence_len=500, silence_thresh=-45)
+    # (NumPy vectorisé, mêmes plages que pydub.silence.detect_silence)
+    silence_ranges = detect_silence_np(samples, frame_rate, min_silence_len=500, silence_thresh=-45, channels=channels)
     
     # Simple heuristic to find the start and end of the actual spoken content
     start_offset = 0
-    end_offset = len(audio)
+    end_offset = audio_ms
     
     if silence_ranges:
         # If the first silence starts at 0, the first non-silence starts at its end
@@ -47,18 +56,18 @@ def align_chapter(audio_path: Path, verses: list, output_dir: Path, lang_prefix:
             start_offset = silence_ranges[0][1]
         
         # If the last silence ends at the very end, the content ends at its start
-        if silence_ranges[-1][1] > len(audio) - 500:
+        if silence_ranges[-1][1] > audio_ms - 500:
             end_offset = silence_ranges[-1][0]
 
-    content_audio = audio[start_offset:end_offset]
-    content_ms = len(content_audio)
+    content_samples = samples[start_offset * samples_per_ms:end_offset * samples_per_ms]
+    content_ms = duration_ms(len(content_samples) // channels, frame_rate)
     total_chars = sum(len(v["text"]) for v in verses)
     
     if total_chars == 0 or content_ms == 0:
         return []
 
     # 2. Refined cut points within the content area
-    content_silence_ranges = detect_silence(content_audio, min_silence_len=300, silence_thresh=-40)
+    content_silence_ranges = detect_silence_np(content_samples, frame_rate, min_silence_len=300, silence_thresh=-40, channels=channels)
     cut_points = [(start + end) // 2 for start, end in content_silence_ranges]
     cut_points.sort()
     
@@ -104,6 +113,18 @@ def align_chapter(audio_path: Path, verses: list, output_dir: Path, lang_prefix:
         # Slice from the original audio using the cumulative start_offset
         abs_start = start_offset + current_time_ms
         abs_end = start_offset + end_time_ms
+        
+        if not export:
+            aligned_data.append({
+                "chapter_wav": str(audio_path),
+                "start_ms": abs_start,
+                "end_ms": abs_end,
+                "text": text,
+                "language": lang_prefix
+            })
+            current_time_ms = end_time_ms
+            continue
+        
         chunk = audio[abs_start:abs_end]
         
         # Clean verse num
@@ -1,10 +1,15 @@
+import hashlib
+import json
+import os
 import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import imageio_ffmpeg
 from pathlib import Path
 
 import logging
 
-from src.config.settings import PROJECT_ROOT, EWE_RAW_DIR, GEGBE_RAW_DIR
+from src.config.settings import PROJECT_ROOT, EWE_RAW_DIR, GEGBE_RAW_DIR, AUDIO_CONVERSION_WORKERS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,13 +18,130 @@ PROCESSED_AUDIO_DIR = PROJECT_ROOT / "data" / "processed" / "audio_16k"
 PROCESSED_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 
 FFMPEG_EXE = imageio_ffmpeg.get_ffmpeg_exe()
+MANIFEST_PATH = PROCESSED_AUDIO_DIR / "manifest.json"
+
+# ───────────────────────────────────────────────
+# Manifeste : source (taille, mtime, hash) -> WAV validé (taille, durée)
+# ───────────────────────────────────────────────
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        try:
+            return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+        except ValueError:
+            logger.warning(f"Manifeste illisible, il sera reconstruit : {MANIFEST_PATH}")
+    return {}
+
+
+def save_manifest(manifest):
+    tmp = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def file_sha1(path: Path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def wav_info(path: Path):
+    """
+    Lit l'en-tête WAV et vérifie sa cohérence avec la taille du fichier.
+    Retourne (durée en s, nb d'échantillons) ou None si le fichier est tronqué / corrompu.
+    """
+    try:
+        with wave.open(str(path), "rb") as w:
+            frames = w.getnframes()
+            data_bytes = frames * w.getsampwidth() * w.getnchannels()
+            rate = w.getframerate()
+    except (wave.Error, EOFError, OSError):
+        return None
+    size = path.stat().st_size
+    # En-tête (44 octets + éventuel chunk LIST) : l'écart doit rester faible
+    if frames == 0 or rate != 16000 or not (0 <= size - data_bytes < 4096):
+        return None
+    return frames / rate, frames
+
+
+def is_up_to_date(mp3_path: Path, wav_path: Path, manifest: dict):
+    """
+    Un WAV n'est ignoré que si sa source n'a pas changé et que le fichier est valide.
+    Source touchée mais identique (même SHA-1) : le mtime de l'entrée est mis à jour pour
+    ne pas re-hacher le MP3 aux lancements suivants (manifeste sauvegardé en fin de run).
+    """
+    entry = manifest.get(wav_path.name)
+    if not entry or not wav_path.exists():
+        return False
+    stat = mp3_path.stat()
+    if entry["source_size"] != stat.st_size:
+        return False
+    if entry["source_mtime"] != stat.st_mtime:
+        if entry["source_sha1"] != file_sha1(mp3_path):
+            return False
+        entry["source_mtime"] = stat.st_mtime
+    return wav_path.stat().st_size == entry["wav_size"]
+
+
+def adopt_existing(mp3_path: Path, wav_path: Path):
+    """
+    WAV produit avant l'introduction du manifeste : on le reprend s'il est valide
+    et plus récent que sa source, au lieu de tout reconvertir.
+    """
+    info = wav_info(wav_path)
+    if info is None or wav_path.stat().st_mtime < mp3_path.stat().st_mtime:
+        return None
+    return manifest_entry(mp3_path, wav_path, info)
+
+
+def convert_file(mp3_path: Path, wav_path: Path):
+    """Convertit un MP3 dans un fichier temporaire puis renomme atomiquement. Retourne l'entrée du manifeste."""
+    tmp_path = wav_path.with_name(wav_path.stem + ".part.wav")
+    try:
+        subprocess.run([
+            FFMPEG_EXE,
+            "-i", str(mp3_path),
+            "-ar", "16000",
+            "-ac", "1",
+            "-c:a", "pcm_s16le",     # on précise explicitement 16-bit PCM
+            str(tmp_path),
+            "-y",
+            "-loglevel", "error"
+        ], check=True, capture_output=True)
+
+        info = wav_info(tmp_path)
+        if info is None:
+            raise RuntimeError(f"WAV produit invalide : {tmp_path.name}")
+        os.replace(tmp_path, wav_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return manifest_entry(mp3_path, wav_path, info)
+
+
+def manifest_entry(mp3_path: Path, wav_path: Path, info):
+    stat = mp3_path.stat()
+    duration, samples = info
+    return {
+        "source": str(mp3_path),
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime,
+        "source_sha1": file_sha1(mp3_path),
+        "wav_size": wav_path.stat().st_size,
+        "duration": duration,
+        "samples": samples,
+    }
 
 # MP3 → WAV mono 16kHz (OBLIGATOIRE pour ASR)
 
-def convert_mp3_to_wav_16k(lang=None):
+def convert_mp3_to_wav_16k(lang=None, workers=None):
     """
     Convertit les MP3 en WAV 16kHz mono.
     Si lang est spécifié ("ewe" ou "gegbe"), ne traite que ce dossier.
+    Les conversions tournent en parallèle (`workers` processus ffmpeg, AUDIO_CONVERSION_WORKERS
+    par défaut) et seuls les WAV validés par le manifeste sont ignorés lors d'une relance.
     """
     # ───────────────────────────────────────────────
     # 1. Déterminer quels dossiers traiter
@@ -49,6 +171,8 @@ def convert_mp3_to_wav_16k(lang=None):
                 f"{len(list((GEGBE_RAW_DIR / 'audio').glob('*.mp3')))} mp3")
 
     total_processed = 0
+    manifest = load_manifest()
+    jobs = []
 
     for d in raw_dirs:
         if not d.exists():
@@ -84,28 +208,40 @@ def convert_mp3_to_wav_16k(lang=None):
             wav_name = f"{current_lang}_{mp3_path.stem}.wav"
             wav_path = PROCESSED_AUDIO_DIR / wav_name
 
-            if wav_path.exists():
+            if wav_path.name not in manifest and wav_path.exists():
+                entry = adopt_existing(mp3_path, wav_path)
+                if entry:
+                    manifest[wav_path.name] = entry
+
+            if is_up_to_date(mp3_path, wav_path, manifest):
                 # logger.debug(f"Déjà existant, ignoré : {wav_path.name}")
                 continue
+            jobs.append((mp3_path, wav_path))
+
+    if not jobs:
+        save_manifest(manifest)
+        logger.info("Conversion terminée. 0 nouveaux fichiers créés.")
+        return
 
+    # ───────────────────────────────────────────────
+    # 3. Conversion parallèle (un processus ffmpeg par worker)
+    # ───────────────────────────────────────────────
+    workers = workers or AUDIO_CONVERSION_WORKERS
+    logger.info(f"Conversion de {len(jobs)} fichiers avec {workers} workers ffmpeg...")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(convert_file, mp3, wav): (mp3, wav) for mp3, wav in jobs}
+        for future in as_completed(futures):
+            mp3_path, wav_path = futures[future]
             try:
-                subprocess.run([
-                    FFMPEG_EXE,
-                    "-i", str(mp3_path),
-                    "-ar", "16000",
-                    "-ac", "1",
-                    "-c:a", "pcm_s16le",     # on précise explicitement 16-bit PCM
-                    str(wav_path),
-                    "-y",
-                    "-loglevel", "error"
-                ], check=True, capture_output=True)
-
-                logger.info(f"✔ {wav_path.name}")
+                manifest[wav_path.name] = future.result()
+                logger.info(f"✔ {wav_path.name} ({manifest[wav_path.name]['duration']:.1f}s)")
                 total_processed += 1
-
+                save_manifest(manifest)
             except subprocess.CalledProcessError as e:
                 logger.error(f"❌ Erreur ffmpeg sur {mp3_path.name} : {e.stderr.decode() if e.stderr else e}")
             except Exception as e:
                 logger.error(f"❌ Erreur inattendue sur {mp3_path.name} : {e}")
 
+    save_manifest(manifest)
     logger.info(f"Conversion terminée. {total_processed} nouveaux fichiers créés.")
\ No newline at end of file
@@ -1,11 +1,29 @@
 import json
 import csv
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import logging
 
-from src.config.settings import PROJECT_ROOT, META_DIR, GEGBE_META_DIR
+import numpy as np
+import pandas as pd
+
+from src.config.settings import (
+    PROJECT_ROOT,
+    META_DIR,
+    GEGBE_META_DIR,
+    ASR_DATASET_MODE,
+    ASR_ALIGNMENT_WORKERS,
+    ASR_PACKING,
+    ASR_PACKING_MAX_MS,
+    ASR_PACKING_GAP_MS,
+    ASR_MAX_LABEL_TOKENS,
+)
 # Import the aligner
 from src.preprocessing.audio_alignment import align_chapter, PYDUB_AVAILABLE
+from src.preprocessing.asr_preflight import WavHeaders, row_duration_ms
+from src.utils.corpus_store import read_corpus
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,9 +35,29 @@ AUDIO_SPLIT_DIR.mkdir(parents=True, exist_ok=True)
 
 AUDIO_DIR_16K = PROCESSED_DIR / "audio_16k"
 OUTPUT_CSV = PROCESSED_DIR / "bible_asr_dataset.csv"
+# Mode "offsets" : pas de WAV par verset, uniquement des offsets dans les WAV de chapitre
+OUTPUT_SEGMENTS_CSV = PROCESSED_DIR / "bible_asr_segments.csv"
+SEGMENT_FIELDS = ["chapter_wav", "start_ms", "end_ms", "text", "language"]
+# Résultats par chapitre (un CSV par chapitre) + index de complétion, pour reprendre après un crash
+SHARDS_DIR = PROCESSED_DIR / "asr_shards"
+SHARD_INDEX = "index.json"
+
+def build_asr_dataset(limit_chapters_per_lang=None, mode=None, workers=None):
+    """
+    mode="export"  : découpe chaque verset en WAV (audio_split/) -> bible_asr_dataset.csv
+    mode="offsets" : écrit seulement chapter_wav/start_ms/end_ms -> bible_asr_segments.csv
+    Par défaut : ASR_DATASET_MODE.
 
-def build_asr_dataset(limit_chapters_per_lang=None):
-    if not PYDUB_AVAILABLE:
+    Les chapitres sont alignés dans un pool de `workers` processus (ASR_ALIGNMENT_WORKERS).
+    Chaque chapitre produit un shard dans asr_shards/<mode>/ ; une relance ne réaligne que
+    les chapitres dont le WAV ou les versets ont changé, puis fusionne les shards en CSV.
+    """
+    mode = mode or ASR_DATASET_MODE
+    if mode not in ("export", "offsets"):
+        raise ValueError(f"Mode inconnu : {mode} (export ou offsets)")
+    export = mode == "export"
+
+    if export and not PYDUB_AVAILABLE:
         logger.error("Pydub not installed. Please install it to run alignment.")
         return
 
@@ -27,45 +65,34 @@ def build_asr_dataset(limit_chapters_per_lang=None):
         (META_DIR / "ewe_bible_raw.json", "ewe"),
         (GEGBE_META_DIR / "gegbe_bible_raw.json", "gegbe")
     ]
+    columns = ["book", "chapter", "verse", "verse_start", "text", "audio_path"]
 
-    all_rows = []
+    jobs = []
     
     for meta_path, lang in meta_files:
-        if not meta_path.exists():
+        # Corpus Parquet (colonnes utiles seulement), reconstruit depuis le JSON s'il est périmé
+        df = read_corpus(lang, columns=columns, source=meta_path)
+        if df.empty:
             logger.warning(f"Meta file not found: {meta_path}")
             continue
             
         logger.info(f"Processing metadata for {lang}...")
-        records = json.loads(meta_path.read_text(encoding="utf-8"))
-        
-        # Group by Book+Chapter
-        chapters = {}
-        for r in records:
-            if not r.get("audio_path"):
-                continue
-            audio_path_key = r["audio_path"]
-            if audio_path_key not in chapters:
-                chapters[audio_path_key] = []
-            chapters[audio_path_key].append(r)
-            
-        chapter_keys = list(chapters.keys())
+        df = df[df["audio_path"].notna() & (df["audio_path"] != "")]
+
+        # Group by Book+Chapter (un MP3 par chapitre), dans l'ordre du corpus : un seul tri stable
+        # (chapitre, premier numéro de verset) puis des tranches contiguës par chapitre
+        codes, chapter_keys = pd.factorize(df["audio_path"])
+        order = np.lexsort((df["verse_start"].to_numpy(), codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(chapter_keys) + 1))
+        books, chapter_nums, verse_ids, texts = (df[c].to_numpy()[order].tolist() for c in ("book", "chapter", "verse", "text"))
         logger.info(f"Found {len(chapter_keys)} unique chapters for {lang}")
         
         if limit_chapters_per_lang:
             logger.info(f"Limiting to {limit_chapters_per_lang} chapters for {lang}")
             chapter_keys = chapter_keys[:limit_chapters_per_lang]
 
-        # Process each chapter
-        for count, audio_source_path in enumerate(chapter_keys):
-            verses_list = chapters[audio_source_path]
-            
-            # Sort verses
-            def verse_sort_key(v):
-                try:
-                    return int(str(v["verse"]).split('-')[0].strip())
-                except:
-                    return 0
-            verses_list.sort(key=verse_sort_key)
+        for k, audio_source_path in enumerate(chapter_keys):
+            start, end = bounds[k], bounds[k + 1]
             
             # Locate 16k Wav
             wav_name = f"{lang}_{Path(audio_source_path).with_suffix('.wav').name}"
@@ -75,35 +102,238 @@ def build_asr_dataset(limit_chapters_per_lang=None):
                 logger.debug(f"WAV 16k missing: {wav_path}")
                 continue
                 
-            first = verses_list[0]
-            book_chapter_id = f"{first['book']}_{first['chapter']}"
-            
-            logger.info(f"[{lang}] Alignant {book_chapter_id} ({count+1}/{len(chapter_keys)})...")
-            
-            # Run alignment
-            aligned_rows = align_chapter(
-                audio_path=wav_path,
-                verses=verses_list,
-                output_dir=AUDIO_SPLIT_DIR,
-                lang_prefix=lang,
-                book_chapter_id=book_chapter_id
-            )
-            
-            all_rows.extend(aligned_rows)
+            book_chapter_id = f"{books[start]}_{chapter_nums[start]}"
+            verses = [{"verse": v, "text": t} for v, t in zip(verse_ids[start:end], texts[start:end])]
+            jobs.append({
+                "shard": f"{lang}_{book_chapter_id}.csv",
+                "wav_path": str(wav_path),
+                "verses": verses,
+                "lang": lang,
+                "book_chapter_id": book_chapter_id,
+                "export": export,
+                "fingerprint": chapter_fingerprint(wav_path, verses, mode),
+            })
 
-    if not all_rows:
+    if not jobs:
         logger.warning("No data rows generated.")
         return
 
-    # Write CSV
-    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["audio_filepath", "text", "language"])
+    # Reprise : seuls les chapitres dont l'audio ou le texte a changé sont réalignés
+    shard_dir = SHARDS_DIR / mode
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    index = load_shard_index(shard_dir)
+    todo = [
+        job for job in jobs
+        if index.get(job["shard"], {}).get("fingerprint") != job["fingerprint"]
+        or not (shard_dir / job["shard"]).exists()
+    ]
+    logger.info(f"{len(jobs) - len(todo)} chapitres déjà alignés, {len(todo)} à aligner "
+                f"({workers or ASR_ALIGNMENT_WORKERS} workers)")
+
+    with ProcessPoolExecutor(max_workers=workers or ASR_ALIGNMENT_WORKERS) as pool:
+        futures = {pool.submit(align_job, job, str(shard_dir)): job for job in todo}
+        for count, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                n_rows = future.result()
+            except Exception as e:
+                # L'ancien shard correspond à un audio / texte périmé : exclu de la fusion
+                (shard_dir / job["shard"]).unlink(missing_ok=True)
+                if index.pop(job["shard"], None) is not None:
+                    save_shard_index(shard_dir, index)
+                logger.error(f"[{job['lang']}] Échec alignement {job['book_chapter_id']}: {e} "
+                             f"(chapitre exclu du dataset)")
+                continue
+            index[job["shard"]] = {"fingerprint": job["fingerprint"], "rows": n_rows}
+            save_shard_index(shard_dir, index)
+            logger.info(f"[{job['lang']}] Aligné {job['book_chapter_id']} ({count}/{len(todo)}, {n_rows} segments)")
+
+    # Fusion finale des shards (dans l'ordre des chapitres) -> CSV
+    output_csv = OUTPUT_CSV if export else OUTPUT_SEGMENTS_CSV
+    fieldnames = ["audio_filepath", "text", "language"] if export else SEGMENT_FIELDS
+    total_rows = merge_shards(shard_dir, [job["shard"] for job in jobs], output_csv, fieldnames)
+
+    if not total_rows:
+        logger.warning("No data rows generated.")
+        return
+
+    logger.info(f"Successfully generated ASR dataset with {total_rows} segments at {output_csv}")
+    if ASR_PACKING:
+        with open(output_csv, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        log_packing_report(rows, pack_rows(rows))
+
+
+# ---------------------------------------------------------------------
+# Shards par chapitre + index de complétion
+# ---------------------------------------------------------------------
+def chapter_fingerprint(wav_path: Path, verses: list, mode: str) -> str:
+    """Empreinte des entrées d'un chapitre : WAV (taille, mtime) + textes + mode."""
+    stat = wav_path.stat()
+    h = hashlib.sha1()
+    h.update(f"{mode}|{stat.st_size}|{stat.st_mtime_ns}|".encode("utf-8"))
+    h.update(json.dumps(verses, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_shard_index(shard_dir: Path) -> dict:
+    index_path = shard_dir / SHARD_INDEX
+    if index_path.exists():
+        try:
+            return json.loads(index_path.read_text(encoding="utf-8"))
+        except ValueError:
+            logger.warning(f"Index illisible, réalignement complet : {index_path}")
+    return {}
+
+
+def save_shard_index(shard_dir: Path, index: dict):
+    tmp = shard_dir / (SHARD_INDEX + ".tmp")
+    tmp.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, shard_dir / SHARD_INDEX)
+
+
+def align_job(job: dict, shard_dir: str) -> int:
+    """Tâche du pool : aligne un chapitre et écrit son shard CSV atomiquement."""
+    rows = align_chapter(
+        audio_path=Path(job["wav_path"]),
+        verses=job["verses"],
+        output_dir=AUDIO_SPLIT_DIR,
+        lang_prefix=job["lang"],
+        book_chapter_id=job["book_chapter_id"],
+        export=job["export"]
+    )
+    fieldnames = ["audio_filepath", "text", "language"] if job["export"] else SEGMENT_FIELDS
+    shard_path = Path(shard_dir) / job["shard"]
+    tmp = shard_path.with_name(shard_path.name + ".tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, shard_path)
+    return len(rows)
+
+
+def merge_shards(shard_dir: Path, shard_names: list, output_csv: Path, fieldnames: list) -> int:
+    total_rows = 0
+    tmp = output_csv.with_name(output_csv.name + ".tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(all_rows)
+        for name in shard_names:
+            shard_path = shard_dir / name
+            if not shard_path.exists():
+                continue
+            with open(shard_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    writer.writerow(row)
+                    total_rows += 1
+    if total_rows:
+        os.replace(tmp, output_csv)
+    else:
+        tmp.unlink()
+    return total_rows
+
+
+# ---------------------------------------------------------------------
+# Packing : plusieurs versets consécutifs par fenêtre Whisper de 30 s
+# ---------------------------------------------------------------------
+def chapter_key(row: dict) -> str:
+    """Chapitre d'une ligne : WAV de chapitre (offsets) ou préfixe du fichier verset (ewe_GEN_1_12.wav)."""
+    if row.get("chapter_wav"):
+        return row["chapter_wav"]
+    return Path(row["audio_filepath"]).stem.rsplit("_", 1)[0]
+
+
+def pack_rows(rows, max_ms=None, gap_ms=None, tokenizer=None, max_labels=None):
+    """
+    Regroupe les versets consécutifs d'un même chapitre en exemples <= max_ms.
+
+    - segments (offsets) : versets contigus fusionnés en un seul segment [début, fin] ;
+      les coupes étant au milieu des silences, les pauses réelles sont conservées
+    - fichiers (export) : colonne parts (JSON) concaténée au chargement avec gap_ms de silence
+
+    Les transcriptions sont jointes par une espace. Avec un tokenizer, un paquet dont les
+    labels dépassent max_labels est redécoupé en deux. `rows` doit suivre l'ordre des
+    versets (ordre des shards / du CSV).
+    """
+    max_ms = max_ms or ASR_PACKING_MAX_MS
+    gap_ms = ASR_PACKING_GAP_MS if gap_ms is None else gap_ms
+    max_labels = max_labels or ASR_MAX_LABEL_TOKENS
+    headers = WavHeaders()
+
+    groups, current, current_ms = [], [], 0
+    for row in rows:
+        duration = row_duration_ms(row, headers)
+        if duration is None:
+            continue
+        if current:
+            prev = current[-1][0]
+            same_chapter = chapter_key(prev) == chapter_key(row)
+            if row.get("chapter_wav"):
+                # Fusion uniquement si le segment suit immédiatement le précédent
+                contiguous = same_chapter and int(row["start_ms"]) == int(prev["end_ms"])
+                extra = duration
+            else:
+                contiguous = same_chapter
+                extra = gap_ms + duration
+            if contiguous and current_ms + extra <= max_ms:
+                current.append((row, duration))
+                current_ms += extra
+                continue
+            groups.append(current)
+        current, current_ms = [(row, duration)], duration
+    if current:
+        groups.append(current)
+
+    packed = [_merge_group([row for row, _ in group], gap_ms) for group in groups]
+    if tokenizer is None:
+        return packed
+
+    # Labels > max_labels : on coupe le paquet en deux jusqu'à respecter la limite
+    result = []
+    pending = list(zip(packed, [[row for row, _ in group] for group in groups]))
+    while pending:
+        lengths = [len(ids) for ids in tokenizer([p["text"] for p, _ in pending]).input_ids]
+        retry = []
+        for (packed_row, members), n_labels in zip(pending, lengths):
+            if n_labels <= max_labels or len(members) == 1:
+                result.append(packed_row)
+            else:
+                half = len(members) // 2
+                retry += [(_merge_group(members[:half], gap_ms), members[:half]),
+                          (_merge_group(members[half:], gap_ms), members[half:])]
+        pending = retry
+    return result
+
+
+def _merge_group(members, gap_ms):
+    first = members[0]
+    text = " ".join(str(m["text"]).strip() for m in members)
+    if first.get("chapter_wav"):
+        return {"chapter_wav": first["chapter_wav"], "start_ms": int(first["start_ms"]),
+                "end_ms": int(members[-1]["end_ms"]), "text": text, "language": first["language"],
+                "n_verses": len(members)}
+    return {"audio_filepath": first["audio_filepath"], "text": text, "language": first["language"],
+            "parts": json.dumps([m["audio_filepath"] for m in members]), "gap_ms": gap_ms,
+            "n_verses": len(members)}
+
+
+def padding_ratio(rows, window_ms=None) -> float:
+    """Part de padding dans les fenêtres de 30 s traitées par l'encodeur Whisper."""
+    window_ms = window_ms or ASR_PACKING_MAX_MS
+    headers = WavHeaders()
+    speech = [min(row_duration_ms(row, headers) or 0, window_ms) for row in rows]
+    return 1 - sum(speech) / (len(speech) * window_ms) if speech else 0.0
+
+
+def log_packing_report(rows, packed):
+    before, after = padding_ratio(rows), padding_ratio(packed)
+    logger.info(f"Packing : {len(rows)} versets -> {len(packed)} exemples <= {ASR_PACKING_MAX_MS // 1000} s | "
+                f"padding {before:.0%} -> {after:.0%} | "
+                f"parole réelle par pas x{(1 - after) / max(1 - before, 1e-9):.1f}")
+    return before, after
 
-    logger.info(f"Successfully generated ASR dataset with {len(all_rows)} segments at {OUTPUT_CSV}")
 
 if __name__ == "__main__":
     # Example: limit to 20 chapters per language to avoid overloading PC initially
     build_asr_dataset(limit_chapters_per_lang=20)
-
@@ -0,0 +1,122 @@
+import logging
+
+import numpy as np
+
+from src.config.settings import LOG_MEL_BATCH_SIZE
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedLogMel:
+    """
+    Log-mel Whisper calculé par lots : un seul STFT + une seule projection mel pour tout
+    le lot (torch si disponible, sinon NumPy), au lieu d'un appel au feature extractor
+    par exemple. Sortie identique à WhisperFeatureExtractor à ~1e-5 près :
+    signal complété/tronqué à n_samples (30 s), fenêtre de Hann, |STFT|², filtres mel,
+    log10, plancher à (max - 8) par exemple, puis (x + 4) / 4.
+
+    Le STFT s'arrête à la fin du signal (au plus long du lot) : pour un verset de 6 s,
+    ~600 trames sont calculées au lieu de 3000. C'est l'essentiel du gain. Un exemple par
+    STFT (LOG_MEL_BATCH_SIZE = 1) est le plus rapide sur CPU mono-cœur ; les lots plus grands
+    (signaux de longueurs voisines) sont une option à mesurer avec scripts/bench_log_mel.py.
+
+    Utilisable hors ligne (feature store, dataset.map batched) comme pour regrouper
+    des requêtes d'inférence (return_tensors="pt").
+    """
+
+    def __init__(self, feature_extractor, batch_size=None, backend=None):
+        self.n_fft = feature_extractor.n_fft
+        self.hop_length = feature_extractor.hop_length
+        self.n_samples = feature_extractor.n_samples
+        self.sampling_rate = feature_extractor.sampling_rate
+        self.padding_value = feature_extractor.padding_value
+        self.dither = getattr(feature_extractor, "dither", 0.0)
+        self.mel_filters = np.asarray(feature_extractor.mel_filters, dtype=np.float32)  # (n_fft//2 + 1, n_mels)
+        self.batch_size = batch_size or LOG_MEL_BATCH_SIZE
+        self.backend = backend or ("torch" if TORCH_AVAILABLE else "numpy")
+        if self.backend == "torch" and not TORCH_AVAILABLE:
+            raise ImportError("torch n'est pas installé (backend='numpy' disponible)")
+
+        # Fenêtre de Hann périodique (celle de torch.hann_window et de Whisper)
+        self.window = np.hanning(self.n_fft + 1)[:-1].astype(np.float32)
+        if self.backend == "torch":
+            self._window_t = torch.from_numpy(self.window)
+            self._filters_t = torch.from_numpy(np.ascontiguousarray(self.mel_filters.T))
+
+    @property
+    def n_frames(self) -> int:
+        return self.n_samples // self.hop_length
+
+    def span(self, max_length: int):
+        """
+        (trames à calculer, échantillons à transformer) pour un lot dont le plus long signal
+        fait max_length échantillons. Au-delà, les fenêtres ne contiennent que le padding nul :
+        puissance 0, donc log-mel constant (log10(1e-10)) — inutile de les passer au STFT.
+        """
+        if self.dither or self.padding_value != 0.0:
+            return self.n_frames, self.n_samples
+        n_keep = min(self.n_frames, (max_length + self.n_fft // 2) // self.hop_length + 1)
+        # Marge pour que le padding "reflect" de fin de STFT ne touche aucune trame conservée
+        n_compute = min(self.n_samples, (n_keep + 1) * self.hop_length + self.n_fft)
+        return n_keep, n_compute
+
+    def pad_batch(self, waveforms, length=None) -> np.ndarray:
+        """(B, length) float32 : signaux tronqués à 30 s et complétés par padding_value."""
+        length = length or self.n_samples
+        batch = np.full((len(waveforms), length), self.padding_value, dtype=np.float32)
+        for i, waveform in enumerate(waveforms):
+            waveform = np.asarray(waveform, dtype=np.float32)[:min(length, self.n_samples)]
+            batch[i, :len(waveform)] = waveform
+        if self.dither:
+            batch += self.dither * np.random.standard_normal(batch.shape).astype(np.float32)
+        return batch
+
+    def __call__(self, waveforms, return_tensors="np"):
+        """Liste de signaux mono 16 kHz -> (B, n_mels, n_frames) float32 (np.ndarray ou torch.Tensor)."""
+        features = np.empty((len(waveforms), self.mel_filters.shape[1], self.n_frames), dtype=np.float32)
+        # Lots de longueurs voisines : le STFT de chaque lot s'arrête au plus long signal
+        order = np.argsort([len(w) for w in waveforms], kind="stable")
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start:start + self.batch_size]
+            features[idx] = self._extract([waveforms[i] for i in idx])
+        if return_tensors == "pt":
+            return torch.from_numpy(features)
+        return features
+
+    def _extract(self, waveforms) -> np.ndarray:
+        n_keep, n_compute = self.span(max(len(w) for w in waveforms))
+        batch = self.pad_batch(waveforms, n_compute)
+        mel_spec = np.zeros((len(waveforms), self.mel_filters.shape[1], self.n_frames), dtype=np.float32)
+        if self.backend == "torch":
+            mel_spec[..., :n_keep] = self._mel_torch(batch, n_keep)
+        else:
+            mel_spec[..., :n_keep] = self._mel_numpy(batch, n_keep)
+        log_spec = np.log10(np.maximum(mel_spec, 1e-10, out=mel_spec), out=mel_spec)
+        peak = log_spec.max(axis=(1, 2), keepdims=True)
+        np.maximum(log_spec, peak - 8.0, out=log_spec)
+        log_spec += 4.0
+        log_spec /= 4.0
+        return log_spec
+
+    def _mel_torch(self, batch, n_keep):
+        with torch.no_grad():
+            stft = torch.stft(torch.from_numpy(batch), self.n_fft, self.hop_length,
+                              window=self._window_t, return_complex=True)
+            # |X|² sans passer par abs() (racine puis carré)
+            power = torch.view_as_real(stft[..., :n_keep]).square().sum(-1)  # (B, n_freq, n_keep)
+            return (self._filters_t @ power).numpy()
+
+    def _mel_numpy(self, batch, n_keep):
+        # STFT centré (padding reflect comme torch.stft), trames par vue glissante
+        half = self.n_fft // 2
+        padded = np.pad(batch, ((0, 0), (half, half)), mode="reflect")
+        frames = np.lib.stride_tricks.sliding_window_view(padded, self.n_fft, axis=1)[:, ::self.hop_length]
+        spectrum = np.fft.rfft(frames[:, :n_keep] * self.window, axis=-1)  # (B, n_keep, n_freq)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        return np.matmul(power, self.mel_filters).transpose(0, 2, 1)
@@ -1,17 +1,173 @@
+import argparse
+import csv
+import hashlib
 import json
+import os
+import numpy as np
 import pandas as pd
 import logging
 from pathlib import Path
-from src.config.settings import META_DIR, GEGBE_META_DIR, PROCESSED_DIR
+from src.config.settings import META_DIR, GEGBE_META_DIR, PROCESSED_DIR, PARALLEL_INCREMENTAL, PARALLEL_SHARDS_DIR
+from src.utils.corpus_store import read_corpus
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SHARD_INDEX = "index.json"
+
+
+# ---------------------------------------------------------------------
+# Alignement incrémental : un shard CSV par chapitre + index des empreintes
+# ---------------------------------------------------------------------
+def chapter_keys(df: pd.DataFrame) -> pd.Series:
+    """Clé de chapitre "BOOK.CHAPTER" de chaque ligne (préfixe du verse_id)."""
+    return df["book"].astype(str) + "." + df["chapter"].astype(str)
+
+
+def chapter_hashes(df: pd.DataFrame, columns: list) -> dict:
+    """
+    Empreinte du contenu de chaque chapitre ("BOOK.CHAPTER" -> sha1), dans l'ordre du corpus.
+    Hachage vectorisé des lignes (`columns`) puis sha1 de la suite des hachages du chapitre.
+    """
+    if df.empty:
+        return {}
+    codes, uniques = pd.factorize(chapter_keys(df))
+    row_hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    hashed = row_hashes[order]
+    return {
+        key: hashlib.sha1(hashed[bounds[k]:bounds[k + 1]].tobytes()).hexdigest()
+        for k, key in enumerate(uniques)
+    }
+
+
+def load_shard_index(shard_dir: Path) -> dict:
+    index_path = shard_dir / SHARD_INDEX
+    if index_path.exists():
+        try:
+            return json.loads(index_path.read_text(encoding="utf-8"))
+        except ValueError:
+            logger.warning(f"Index illisible, réalignement complet : {index_path}")
+    return {}
+
+
+def save_shard_index(shard_dir: Path, index: dict):
+    tmp = shard_dir / (SHARD_INDEX + ".tmp")
+    tmp.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, shard_dir / SHARD_INDEX)
+
+
+def write_shard(shard_path: Path, fieldnames: list, rows):
+    # Même format que DataFrame.to_csv (NaN -> champ vide), pour un CSV fusionné identique
+    tmp = shard_path.with_name(shard_path.name + ".tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
+    os.replace(tmp, shard_path)
+
+
+def merge_shards(shard_dir: Path, shard_names: list, output_csv: Path) -> bool:
+    """Concatène les shards (en-tête du premier seulement) dans output_csv, atomiquement."""
+    tmp = output_csv.with_name(output_csv.name + ".tmp")
+    header_written = False
+    with open(tmp, "wb") as out:
+        for name in shard_names:
+            with open(shard_dir / name, "rb") as f:
+                header = f.readline()
+                if not header_written:
+                    out.write(header)
+                    header_written = True
+                out.write(f.read())
+    if header_written:
+        os.replace(tmp, output_csv)
+    else:
+        tmp.unlink()
+    return header_written
+
+
+def align_by_chapter(df_gegbe, df_ewe, pair_verses, output_csv: Path, shard_dir: Path,
+                     columns: list, output_columns: list) -> dict:
+    """
+    Met à jour output_csv en ne réalignant que les chapitres nouveaux ou modifiés.
+
+    Chaque chapitre ("BOOK.CHAPTER") est comparé à l'index du dossier de shards via
+    l'empreinte de ses lignes Gegbe et Ewe (`columns`). Les lignes des seuls chapitres dont
+    une empreinte a changé passent, en un appel, par `pair_verses(gegbe, ewe) -> DataFrame`
+    (avec verse_id) ; le résultat remplace le shard CSV de chacun de ces chapitres
+    (`output_columns`) et les chapitres disparus sont supprimés. output_csv est recomposé
+    par concaténation des shards, dans l'ordre du corpus Gegbe : il est identique à un
+    réalignement complet.
+
+    Retourne le rapport des changements (chapitres ajoutés / modifiés / supprimés, paires).
+    """
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    index = load_shard_index(shard_dir)
+
+    gegbe_hashes = chapter_hashes(df_gegbe, columns)
+    ewe_hashes = chapter_hashes(df_ewe, columns)
+    chapters = list(gegbe_hashes) + [key for key in ewe_hashes if key not in gegbe_hashes]
+
+    report = {"added": [], "changed": [], "removed": [], "unchanged": 0,
+              "pairs_before": sum(entry["rows"] for entry in index.values()), "pairs": 0}
+    todo = []
+    for key in chapters:
+        entry = index.get(key)
+        if entry is None:
+            report["added"].append(key)
+        elif (entry["gegbe"] != gegbe_hashes.get(key) or entry["ewe"] != ewe_hashes.get(key)
+              or (entry["rows"] and not (shard_dir / f"{key}.csv").exists())):
+            report["changed"].append(key)
+        else:
+            report["unchanged"] += 1
+            continue
+        todo.append(key)
+    report["removed"] = [key for key in index if key not in gegbe_hashes and key not in ewe_hashes]
+
+    if todo:
+        pairs = pair_verses(
+            df_gegbe[chapter_keys(df_gegbe).isin(todo).to_numpy()],
+            df_ewe[chapter_keys(df_ewe).isin(todo).to_numpy()],
+        )
+        pair_keys = pairs["verse_id"].str.rsplit(".", n=1).str[0]
+        values = pairs[output_columns].astype(object).where(pairs[output_columns].notna(), "").to_numpy()
+        positions = pair_keys.groupby(pair_keys, sort=False).indices
+        for key in todo:
+            rows = values[positions[key]] if key in positions else values[:0]
+            shard_path = shard_dir / f"{key}.csv"
+            if len(rows):
+                write_shard(shard_path, output_columns, rows.tolist())
+            elif shard_path.exists():
+                shard_path.unlink()
+            index[key] = {"gegbe": gegbe_hashes.get(key), "ewe": ewe_hashes.get(key), "rows": len(rows)}
+
+    for key in report["removed"]:
+        (shard_dir / f"{key}.csv").unlink(missing_ok=True)
+        del index[key]
+
+    report["pairs"] = sum(entry["rows"] for entry in index.values())
+    if todo or report["removed"]:
+        save_shard_index(shard_dir, index)
+    if todo or report["removed"] or not output_csv.exists():
+        shards = [f"{key}.csv" for key in chapters if index[key]["rows"]]
+        if not merge_shards(shard_dir, shards, output_csv) and output_csv.exists():
+            output_csv.unlink()
+
+    logger.info(
+        f"Alignement incrémental : {len(report['added'])} chapitres ajoutés, {len(report['changed'])} modifiés, "
+        f"{len(report['removed'])} supprimés, {report['unchanged']} inchangés ; "
+        f"{report['pairs']} paires ({report['pairs'] - report['pairs_before']:+d})"
+    )
+    return report
+
+
 class ParallelAligner:
     def __init__(self):
         self.ewe_meta_path = META_DIR / "ewe_bible_raw.json"
         self.gegbe_meta_path = GEGBE_META_DIR / "gegbe_bible_raw.json"
         self.output_csv = PROCESSED_DIR / "parallel_mina_ewe.csv"
+        self.shard_dir = PARALLEL_SHARDS_DIR / self.output_csv.stem
 
     def load_data(self, path):
         if not path.exists():
@@ -20,45 +176,57 @@ class ParallelAligner:
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
 
-    def align(self):
+    @staticmethod
+    def pair_verses(df_gegbe, df_ewe):
+        # Merge sur l'ID de verset
+        merged_df = pd.merge(df_gegbe, df_ewe, on="verse_id", suffixes=("_mina", "_ewe"))
+        # Nettoyage : suppression des lignes sans texte dans l'un ou l'autre
+        return merged_df.dropna(subset=["text_mina", "text_ewe"])
+
+    def align(self, incremental=None):
+        """
+        Aligne les versets Mina / Ewe dans parallel_mina_ewe.csv. En mode incrémental
+        (PARALLEL_INCREMENTAL par défaut), seuls les chapitres nouveaux ou modifiés sont
+        réalignés et le rapport des changements est retourné ; sinon le DataFrame aligné.
+        """
+        if incremental is None:
+            incremental = PARALLEL_INCREMENTAL
+        # Corpus Parquet (clé verse_id BOOK.CHAPTER.VERSE déjà calculée), colonnes utiles seulement
+        columns = ["verse_id", "text", "audio_path"]
+        read_columns = ["book", "chapter"] + columns if incremental else columns
         logger.info("Chargement des données Ewe...")
-        ewe_data = self.load_data(self.ewe_meta_path)
+        df_ewe = read_corpus("ewe", columns=read_columns, source=self.ewe_meta_path)
         logger.info("Chargement des données Gegbe (Mina)...")
-        gegbe_data = self.load_data(self.gegbe_meta_path)
+        df_gegbe = read_corpus("gegbe", columns=read_columns, source=self.gegbe_meta_path)
 
-        if not ewe_data or not gegbe_data:
+        if df_ewe.empty or df_gegbe.empty:
             logger.error("Impossible d'aligner : une des sources de données est vide.")
             return
 
-        # Création de DataFrames
-        df_ewe = pd.DataFrame(ewe_data)
-        df_gegbe = pd.DataFrame(gegbe_data)
+        if incremental:
+            report = align_by_chapter(
+                df_gegbe, df_ewe,
+                lambda gegbe, ewe: self.pair_verses(gegbe[columns], ewe[columns]),
+                self.output_csv, self.shard_dir, columns,
+                ["verse_id", "text_mina", "audio_path_mina", "text_ewe", "audio_path_ewe"],
+            )
+            logger.info(f"Dataset parallèle à jour : {self.output_csv}")
+            return report
 
-        # Création d'une clé unique pour l'alignement
-        # Clé : BOOK.CHAPTER.VERSE
-        df_ewe["verse_id"] = df_ewe.apply(lambda x: f"{x['book']}.{x['chapter']}.{x['verse']}", axis=1)
-        df_gegbe["verse_id"] = df_gegbe.apply(lambda x: f"{x['book']}.{x['chapter']}.{x['verse']}", axis=1)
-
-        # Merge sur l'ID de verset
         logger.info("Alignement des versets...")
-        merged_df = pd.merge(
-            df_gegbe[["verse_id", "text", "audio_path"]],
-            df_ewe[["verse_id", "text", "audio_path"]],
-            on="verse_id",
-            suffixes=("_mina", "_ewe")
-        )
+        merged_df = self.pair_verses(df_gegbe, df_ewe)
 
-        # Nettoyage : suppression des lignes sans texte dans l'un ou l'autre
-        merged_df = merged_df.dropna(subset=["text_mina", "text_ewe"])
-        
         logger.info(f"Alignement terminé : {len(merged_df)} versets parallèles trouvés.")
-        
+
         # Sauvegarde
         merged_df.to_csv(self.output_csv, index=False, encoding="utf-8")
         logger.info(f"Dataset parallèle sauvegardé dans : {self.output_csv}")
-        
+
         return merged_df
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alignement du corpus parallèle Mina / Ewe")
+    parser.add_argument("--full", action="store_true", help="Réalignement complet (sans shards par chapitre)")
+    args = parser.parse_args()
     aligner = ParallelAligner()
-    aligner.align()
+    aligner.align(incremental=False if args.full else None)
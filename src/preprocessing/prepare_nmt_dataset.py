@@ -1,56 +1,67 @@
-import json
-import csv
 import logging
+import pandas as pd
 from pathlib import Path
-from src.config.settings import META_DIR, GEGBE_META_DIR, PROCESSED_DIR
+from src.config.settings import META_DIR, GEGBE_META_DIR, PROCESSED_DIR, PARALLEL_INCREMENTAL, PARALLEL_SHARDS_DIR
+from src.preprocessing.parallel_aligner import align_by_chapter
+from src.utils.corpus_store import read_corpus
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def prepare_parallel_dataset():
+def pair_texts(gegbe_df, ewe_df):
+    # Un texte par verset (le dernier en cas de doublon), ordre du corpus Gegbe
+    parallel = pd.merge(
+        gegbe_df.drop_duplicates("verse_id", keep="last").rename(columns={"text": "mina"}),
+        ewe_df.drop_duplicates("verse_id", keep="last").rename(columns={"text": "ewe"}),
+        on="verse_id",
+    )
+    return parallel[["verse_id", "mina", "ewe"]]
+
+def prepare_parallel_dataset(incremental=None):
+    """
+    Paires (mina, ewe) pour l'entraînement NMT. En mode incrémental (PARALLEL_INCREMENTAL
+    par défaut), seuls les chapitres nouveaux ou modifiés sont réappariés ; retourne alors
+    le rapport des changements.
+    """
+    if incremental is None:
+        incremental = PARALLEL_INCREMENTAL
     ewe_meta = META_DIR / "ewe_bible_raw.json"
     gegbe_meta = GEGBE_META_DIR / "gegbe_bible_raw.json"
     output_csv = PROCESSED_DIR / "mina_ewe_parallel.csv"
 
-    if not ewe_meta.exists() or not gegbe_meta.exists():
+    logger.info("Loading Ewe and Gegbe corpora...")
+    # Corpus Parquet indexé par verse_id (reconstruit depuis le JSON s'il est absent ou périmé)
+    columns = ["book", "chapter", "verse_id", "text"] if incremental else ["verse_id", "text"]
+    ewe_df = read_corpus("ewe", columns=columns, source=ewe_meta)
+    gegbe_df = read_corpus("gegbe", columns=columns, source=gegbe_meta)
+
+    if ewe_df.empty or gegbe_df.empty:
         logger.error("Metadata files for Ewe or Gegbe not found.")
         return
 
-    logger.info("Loading Ewe and Gegbe metadata...")
-    ewe_data = json.loads(ewe_meta.read_text(encoding="utf-8"))
-    gegbe_data = json.loads(gegbe_meta.read_text(encoding="utf-8"))
-
-    # Index by book_chapter_verse
-    def build_index(data):
-        index = {}
-        for r in data:
-            key = f"{r['book']}_{r['chapter']}_{r['verse']}"
-            index[key] = r['text']
-        return index
-
-    ewe_index = build_index(ewe_data)
-    gegbe_index = build_index(gegbe_data)
+    if incremental:
+        logger.info("Matching new or changed chapters...")
+        report = align_by_chapter(
+            gegbe_df, ewe_df,
+            lambda gegbe, ewe: pair_texts(gegbe[["verse_id", "text"]], ewe[["verse_id", "text"]]),
+            output_csv, PARALLEL_SHARDS_DIR / output_csv.stem, ["verse_id", "text"], ["mina", "ewe"],
+        )
+        if not report["pairs"]:
+            logger.warning("No parallel pairs found.")
+        else:
+            logger.info(f"Parallel dataset up to date: {output_csv}")
+        return report
 
-    parallel_pairs = []
-    
     logger.info("Matching verses...")
-    for key, gegbe_text in gegbe_index.items():
-        if key in ewe_index:
-            parallel_pairs.append({
-                "mina": gegbe_text,
-                "ewe": ewe_index[key]
-            })
+    parallel = pair_texts(gegbe_df, ewe_df)
 
-    logger.info(f"Found {len(parallel_pairs)} parallel verses.")
+    logger.info(f"Found {len(parallel)} parallel verses.")
 
-    if not parallel_pairs:
+    if parallel.empty:
         logger.warning("No parallel pairs found.")
         return
 
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["mina", "ewe"])
-        writer.writeheader()
-        writer.writerows(parallel_pairs)
+    parallel[["mina", "ewe"]].to_csv(output_csv, index=False, encoding="utf-8")
 
     logger.info(f"Parallel dataset saved to {output_csv}")
 
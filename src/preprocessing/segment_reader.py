@@ -0,0 +1,86 @@
+import json
+import logging
+from collections import OrderedDict
+
+import numpy as np
+
+from src.preprocessing.silence import read_wav_int16
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentReader:
+    """
+    Lecture paresseuse de segments dans les WAV de chapitre (bible_asr_segments.csv).
+    Chaque WAV est mappé en mémoire une seule fois (cache LRU par processus) ;
+    un segment est une simple vue sur ce mapping, sans copie ni décodage.
+    """
+
+    def __init__(self, max_open=64):
+        self.max_open = max_open
+        self._open = OrderedDict()
+
+    def _samples(self, chapter_wav: str):
+        if chapter_wav in self._open:
+            self._open.move_to_end(chapter_wav)
+            return self._open[chapter_wav]
+        entry = read_wav_int16(chapter_wav)
+        self._open[chapter_wav] = entry
+        if len(self._open) > self.max_open:
+            self._open.popitem(last=False)
+        return entry
+
+    def read(self, chapter_wav: str, start_ms: int, end_ms: int):
+        """Vue int16 (zero-copy) sur [start_ms, end_ms) du chapitre, et sa fréquence."""
+        samples, rate, channels = self._samples(chapter_wav)
+        per_ms = rate * channels // 1000
+        return samples[int(start_ms) * per_ms:int(end_ms) * per_ms], rate, channels
+
+    def read_float(self, chapter_wav: str, start_ms: int, end_ms: int):
+        """Segment mono float32 dans [-1, 1] (la seule copie est la conversion de type)."""
+        view, rate, channels = self.read(chapter_wav, start_ms, end_ms)
+        waveform = view.astype(np.float32) / 32768.0
+        if channels > 1:
+            waveform = waveform.reshape(-1, channels).mean(axis=1)
+        return waveform, rate
+
+
+_reader = None
+
+
+def load_waveform(row: dict):
+    """
+    Charge l'audio d'une ligne de dataset ASR, quel que soit son format :
+    - segment (chapter_wav, start_ms, end_ms) : vue sur le WAV de chapitre mappé
+    - fichier (audio_filepath) : lecture soundfile classique
+    - exemple packé (parts) : fichiers concaténés avec gap_ms de silence
+    Retourne (waveform mono float, fréquence).
+    """
+    global _reader
+    if row.get("parts"):
+        return load_parts(row)
+    if row.get("chapter_wav"):
+        if _reader is None:
+            _reader = SegmentReader()
+        return _reader.read_float(row["chapter_wav"], row["start_ms"], row["end_ms"])
+
+    import soundfile as sf
+    waveform, sr = sf.read(row["audio_filepath"])
+    if len(waveform.shape) > 1:
+        waveform = waveform.mean(axis=1)
+    return waveform, sr
+
+
+def load_parts(row: dict):
+    """Concatène les fichiers d'un exemple packé (colonne parts, JSON) séparés par gap_ms de silence."""
+    parts = json.loads(row["parts"]) if isinstance(row["parts"], str) else row["parts"]
+    pieces, sr = [], None
+    for path in parts:
+        waveform, rate = load_waveform({"audio_filepath": path})
+        if sr is not None and rate != sr:
+            raise ValueError(f"Fréquences différentes dans un exemple packé : {path}")
+        if pieces:
+            pieces.append(np.zeros(int(rate * int(row.get("gap_ms") or 0) / 1000)))
+        pieces.append(waveform)
+        sr = rate
+    return np.concatenate(pieces), sr
@@ -0,0 +1,107 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def read_wav_int16(path: Path):
+    """
+    Ouvre un WAV PCM 16 bits en mémoire mappée (aucune copie).
+    Retourne (échantillons int16 entrelacés, fréquence, nb de canaux).
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"Pas un fichier WAV RIFF : {path}")
+        channels = rate = bits = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"Chunk 'data' introuvable : {path}")
+            chunk_id, size = chunk[:4], int.from_bytes(chunk[4:], "little")
+            if chunk_id == b"fmt ":
+                fmt = f.read(size)
+                channels = int.from_bytes(fmt[2:4], "little")
+                rate = int.from_bytes(fmt[4:8], "little")
+                bits = int.from_bytes(fmt[14:16], "little")
+                f.seek(size % 2, 1)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + size % 2, 1)
+
+    if bits != 16:
+        raise ValueError(f"WAV {bits} bits non supporté (PCM 16 bits attendu) : {path}")
+    # La taille annoncée peut être fausse (flux ffmpeg) : on se fie à la taille réelle
+    n_samples = (path.stat().st_size - offset) // 2
+    samples = np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=(n_samples,))
+    return samples, rate, channels
+
+
+def duration_ms(n_frames: int, frame_rate: int) -> int:
+    """Durée en ms arrondie comme len(AudioSegment)."""
+    return round(1000 * (n_frames / frame_rate))
+
+
+def detect_silence_np(samples, frame_rate, min_silence_len=1000, silence_thresh=-16, channels=1):
+    """
+    Équivalent vectorisé de pydub.silence.detect_silence (seek_step=1) pour du PCM 16 bits.
+
+    pydub calcule le RMS de chaque fenêtre [i, i + min_silence_len) ms pour chaque
+    milliseconde i, en Python. Ici : énergie par ms (vue reshape), somme glissante par
+    cumsum, puis regroupement des départs silencieux en plages par différences.
+    Les plages retournées ([début_ms, fin_ms]) sont identiques à celles de pydub.
+    """
+    samples = np.asarray(samples)
+    frame_width = channels
+    n_frames = len(samples) // frame_width
+    seg_len = duration_ms(n_frames, frame_rate)
+    if seg_len < min_silence_len:
+        return []
+
+    # pydub : rms (entier tronqué, audioop) <= 10^(dB/20) * 32768
+    thresh = (10 ** (silence_thresh / 20)) * 32768
+    # floor(sqrt(sum / n)) <= thresh  <=>  sum < (floor(thresh) + 1)^2 * n   (calcul exact en entiers)
+    limit = (int(np.floor(thresh)) + 1) ** 2
+
+    per_ms = frame_rate * frame_width / 1000
+    if per_ms != int(per_ms):
+        raise ValueError(f"Fréquence {frame_rate} Hz non multiple de 1 kHz")
+    per_ms = int(per_ms)
+
+    # Énergie par milliseconde (la dernière ms peut être partielle)
+    total = len(samples) - len(samples) % frame_width
+    full_ms = total // per_ms
+    squares = np.square(samples[:total], dtype=np.int64)
+    energy = np.zeros(seg_len + 1, dtype=np.int64)
+    energy[1:full_ms + 1] = squares[:full_ms * per_ms].reshape(full_ms, per_ms).sum(axis=1)
+    if total > full_ms * per_ms and full_ms < seg_len:
+        energy[full_ms + 1] = squares[full_ms * per_ms:].sum()
+    cum = np.cumsum(energy)
+
+    starts = np.arange(0, seg_len - min_silence_len + 1)
+    ends = starts + min_silence_len
+    window_sums = cum[ends] - cum[starts]
+    # Nombre réel d'échantillons par fenêtre (tronqué en fin de fichier comme le slicing pydub)
+    counts = np.minimum(ends * per_ms, total) - starts * per_ms
+    silent = np.nonzero(window_sums < limit * counts)[0]
+    if len(silent) == 0:
+        return []
+
+    # Nouvelle plage dès que deux départs silencieux sont séparés de plus d'une fenêtre
+    breaks = np.nonzero(np.diff(silent) > min_silence_len)[0]
+    range_starts = silent[np.concatenate(([0], breaks + 1))]
+    range_ends = silent[np.concatenate((breaks, [len(silent) - 1]))] + min_silence_len
+    return [[int(s), int(e)] for s, e in zip(range_starts, range_ends)]
+
+
+def detect_silence_wav(path: Path, min_silence_len=1000, silence_thresh=-16, start_ms=0, end_ms=None):
+    """detect_silence_np sur un WAV mappé en mémoire, éventuellement restreint à [start_ms, end_ms)."""
+    samples, rate, channels = read_wav_int16(path)
+    per_ms = rate * channels // 1000
+    stop = None if end_ms is None else end_ms * per_ms
+    return detect_silence_np(samples[start_ms * per_ms:stop], rate, min_silence_len, silence_thresh, channels)
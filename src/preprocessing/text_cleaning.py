@@ -3,6 +3,7 @@ from pathlib import Path
 import logging
 
 from src.config.settings import PROJECT_ROOT, EWE_RAW_DIR, GEGBE_RAW_DIR
+from src.utils.text_store import VerseTextStore
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,30 +39,12 @@ def clean_all_texts():
             
         logger.info(f"Traitement des textes pour : {lang}")
         
-        # Groupement par chapitre (ex: gen_01, 1ch_01)
-        groups = {}
-        for txt_path in d.glob("*.txt"):
-            parts = txt_path.stem.split('_')
-            if len(parts) >= 2:
-                chapter_id = "_".join(parts[:2])
-                groups.setdefault(chapter_id, []).append(txt_path)
-        
-        for chapter_id, paths in groups.items():
+        # Lecture via le store (un .txt par verset ou shards JSONL packés)
+        store = VerseTextStore(d)
+        for chapter_id, verses in store.iter_chapters():
             cleaned_path = PROCESSED_TEXT_DIR / f"{lang}_{chapter_id}.txt"
 
-            # On trie les versets par numéro pour l'ordre correct
-            def get_verse_num(p):
-                last_part = p.stem.split('_')[-1]
-                if last_part.isdigit():
-                    return int(last_part)
-                return 999  # Fallback
-
-            paths.sort(key=get_verse_num)
-            
-            all_verses = []
-            for p in paths:
-                text = p.read_text(encoding="utf-8")
-                all_verses.append(clean_text(text))
+            all_verses = [clean_text(text) for _, text in verses]
             
             # Fusion avec un espace
             full_chapter_text = " ".join(v for v in all_verses if v)
@@ -0,0 +1,441 @@
+import asyncio
+import json
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urljoin
+
+import aiohttp
+from bs4 import BeautifulSoup
+from crawl4ai import AsyncWebCrawler
+
+from src.config.settings import (
+    SCRAPER_MAX_CONCURRENCY,
+    SCRAPER_REQUESTS_PER_SECOND,
+    SCRAPER_MAX_RETRIES,
+    SCRAPER_RETRY_BACKOFF,
+    SCRAPER_USE_BROWSER,
+    HTML_CACHE_REVALIDATE,
+)
+from src.scraping.html_cache import HtmlCache
+from src.scraping.verse_parser import parse_verses, parse_chapter_html
+from src.scraping.versions import BibleVersion
+from src.utils.corpus_store import corpus_path, write_corpus
+from src.utils.text_store import VerseTextStore
+
+# ---------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _parse_cached_chapter(args):
+    """Tâche de pool de processus : lit une page depuis le cache et la parse."""
+    cache_dir, url = args
+    html = HtmlCache(cache_dir).get(url)
+    return url, (parse_chapter_html(html) if html else None)
+
+
+class ScrapeBudget:
+    """
+    Budget global partagé par tous les scrapers d'un même run :
+    - nombre maximal de chapitres traités en même temps (toutes versions confondues)
+    - débit maximal de requêtes HTTP / navigateur vers le site
+    """
+
+    def __init__(self, max_concurrency=SCRAPER_MAX_CONCURRENCY,
+                 requests_per_second=SCRAPER_REQUESTS_PER_SECOND):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def throttle(self):
+        """Attend le prochain créneau libre avant d'émettre une requête."""
+        if not self.min_interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class BibleScraper:
+    """
+    Moteur de scraping générique pour une version de la Bible sur bible.com.
+    Piloté par un descripteur BibleVersion (URLs, livres, dossiers).
+    Sauvegarde UNIQUEMENT les données brutes dans data/raw/<lang>/
+    """
+
+    def __init__(self, version: BibleVersion, output_dir=None, budget=None, cache=None, use_browser=None):
+        self.version = version
+        self.lang = version.lang
+
+        if output_dir:
+            self.root_dir = Path(output_dir)
+            self.audio_dir = self.root_dir / "audio"
+            self.text_dir = self.root_dir / "texts"
+            self.meta_dir = self.root_dir / "metadata"
+        else:
+            self.root_dir = version.root_dir
+            self.audio_dir = version.audio_dir
+            self.text_dir = version.text_dir
+            self.meta_dir = version.meta_dir
+
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.text_dir.mkdir(parents=True, exist_ok=True)
+        self.meta_dir.mkdir(parents=True, exist_ok=True)
+
+        self.base_text_url = version.text_url
+        self.base_audio_url = version.audio_url
+        self.books = dict(version.books)
+        self.text_store = VerseTextStore(self.text_dir)
+
+        # Un budget partagé permet de scraper plusieurs versions en parallèle
+        self.budget = budget if budget is not None else ScrapeBudget()
+        # Cache HTML brut (cache=False pour le désactiver)
+        self.cache = HtmlCache() if cache is None else cache
+        # Navigateur headless (crawl4ai) pour les pages absentes du cache, sinon HTTP simple
+        self.use_browser = SCRAPER_USE_BROWSER if use_browser is None else use_browser
+        # Compteurs pour le suivi / les benchmarks (scripts/bench_scraper.py)
+        self.stats = {"chapters": 0, "requests": 0, "retries": 0, "failures": 0, "bytes": 0}
+
+        self.session = None
+        self.records = []
+        self._done_chapters = set()
+        self._load_existing_records()
+
+    @property
+    def meta_file(self):
+        return self.meta_dir / self.version.meta_filename
+
+    def _load_existing_records(self):
+        if self.meta_file.exists():
+            try:
+                self.records = json.loads(self.meta_file.read_text(encoding="utf-8"))
+                self._done_chapters = {(r["book"], r["chapter"]) for r in self.records}
+                logger.info(f"[{self.lang}] Chargé {len(self.records)} enregistrements existants.")
+            except Exception as e:
+                logger.warning(f"[{self.lang}] Erreur chargement metadata: {e}")
+
+    # -----------------------------------------------------------------
+    # HTTP
+    # -----------------------------------------------------------------
+    async def init_session(self):
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=60),
+            headers={
+                "User-Agent": (
+                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/120.0 Safari/537.36"
+                )
+            }
+        )
+
+    async def close_session(self):
+        if self.session:
+            await self.session.close()
+
+    # -----------------------------------------------------------------
+    # Pages (cache + revalidation)
+    # -----------------------------------------------------------------
+    async def fetch_page(self, url: str, wait_for: str, delay: float):
+        """
+        Retourne le HTML d'une page.
+        - Page en cache : revalidation conditionnelle (ETag / Last-Modified), sinon cache servi tel quel.
+        - Page absente : navigateur headless (crawl4ai), repli sur aiohttp en cas d'erreur.
+        Toute page téléchargée est persistée dans le cache.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached is not None:
+            if not HTML_CACHE_REVALIDATE:
+                return cached
+            try:
+                html = await self._http_get(url, conditional=True)
+                return html if html is not None else cached
+            except Exception as e:
+                logger.warning(f"Revalidation impossible pour {url} ({e}), cache utilisé")
+                return cached
+
+        if not self.use_browser:
+            return await self._http_get(url)
+
+        try:
+            await self.budget.throttle()
+            self.stats["requests"] += 1
+            async with AsyncWebCrawler(verbose=False) as crawler:
+                result = await crawler.arun(
+                    url=url,
+                    wait_for=wait_for,
+                    delay_before_return_html=delay
+                )
+                if not result.success:
+                    return None
+
+                if self.cache:
+                    self.cache.put(url, result.html, getattr(result, "response_headers", None))
+                return result.html
+
+        except Exception as e:
+            logger.warning(f"Fallback HTTP {url}: {e}")
+            return await self._http_get(url)
+
+    async def _request(self, url: str, headers=None):
+        """
+        GET soumis au budget, avec reprises sur 429 / 5xx / erreurs réseau
+        (délai exponentiel, ou Retry-After si fourni par le serveur).
+        Retourne (status, headers, corps brut, charset).
+        """
+        if not self.session:
+            await self.init_session()
+
+        for attempt in range(SCRAPER_MAX_RETRIES + 1):
+            await self.budget.throttle()
+            self.stats["requests"] += 1
+            try:
+                async with self.session.get(url, headers=headers or {}) as resp:
+                    body = await resp.read()
+                    self.stats["bytes"] += len(body)
+                    retryable = resp.status == 429 or resp.status >= 500
+                    if not retryable or attempt == SCRAPER_MAX_RETRIES:
+                        if resp.status not in (200, 304):
+                            self.stats["failures"] += 1
+                        return resp.status, resp.headers, body, resp.charset or "utf-8"
+                    delay = self._retry_delay(attempt, resp.headers.get("Retry-After"))
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == SCRAPER_MAX_RETRIES:
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._retry_delay(attempt)
+
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(attempt, retry_after=None):
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return SCRAPER_RETRY_BACKOFF * (2 ** attempt)
+
+    async def _http_get(self, url: str, conditional=False):
+        headers = self.cache.conditional_headers(url) if (conditional and self.cache) else {}
+
+        status, resp_headers, body, charset = await self._request(url, headers=headers)
+        if status == 304:
+            self.cache.touch(url)
+            return self.cache.get(url)
+        if status != 200:
+            return None
+
+        html = body.decode(charset, errors="replace")
+        if self.cache:
+            self.cache.put(url, html, resp_headers)
+        return html
+
+    # -----------------------------------------------------------------
+    # Text
+    # -----------------------------------------------------------------
+    async def extract_text(self, url: str):
+        html = await self.fetch_page(url, wait_for="div[class*='Chapter'], .verse", delay=3)
+        return parse_chapter_html(html) if html else []
+
+    def _parse_verses(self, soup):
+        return parse_verses(soup)
+
+    # -----------------------------------------------------------------
+    # Audio
+    # -----------------------------------------------------------------
+    async def extract_audio_links(self, url: str):
+        html = await self.fetch_page(url, wait_for="audio, source", delay=5)
+        if not html:
+            return []
+        return self._parse_audio_links(BeautifulSoup(html, "html.parser"), url)
+
+    def _parse_audio_links(self, soup, base_url):
+        links = set()
+        for el in soup.find_all(["audio", "source"]):
+            src = el.get("src")
+            if src:
+                links.add(urljoin(base_url, src))
+        return list(links)
+
+    # -----------------------------------------------------------------
+    # Download
+    # -----------------------------------------------------------------
+    async def download_audio(self, url: str, filename: str):
+        status, _, body, _ = await self._request(url)
+        if status != 200:
+            return None
+
+        path = self.audio_dir / filename
+        path.write_bytes(body)
+        return str(path)
+
+    # -----------------------------------------------------------------
+    # Chapter
+    # -----------------------------------------------------------------
+    async def process_chapter(self, book_code: str, chapter: int):
+        try:
+            # Check if already in records
+            if (book_code, chapter) in self._done_chapters:
+                logger.info(f"[{self.lang}] Sauter {book_code} {chapter} (déjà dans metadata)")
+                return
+
+            logger.info(f"[{self.lang}] Traitement {book_code} chapitre {chapter}")
+
+            audio_filename = f"{book_code.lower()}_{chapter:02d}.mp3"
+            audio_path_local = self.audio_dir / audio_filename
+
+            text_url = self.base_text_url.format(book=book_code, chapter=chapter)
+            audio_url = self.base_audio_url.format(book=book_code, chapter=chapter)
+
+            verses = await self.extract_text(text_url)
+            if not verses:
+                logger.warning(f"Pas de texte trouvé pour {text_url}")
+                return
+
+            # Audio
+            audio_links = await self.extract_audio_links(audio_url)
+            downloaded_audio_path = None
+
+            if audio_links:
+                if not audio_path_local.exists():
+                    try:
+                        downloaded_audio_path = await self.download_audio(audio_links[0], audio_filename)
+                    except Exception as e:
+                        logger.error(f"Erreur download audio {audio_links[0]}: {e}")
+                else:
+                    downloaded_audio_path = str(audio_path_local)
+
+            self.text_store.write_chapter(book_code, chapter, verses)
+            for v in verses:
+                v_id = v["verse"]
+                self.records.append({
+                    "book": book_code,
+                    "chapter": chapter,
+                    "verse": v_id,
+                    "text": v["text"],
+                    "audio_path": downloaded_audio_path,
+                    "text_url": text_url,
+                    "audio_url": audio_url,
+                    "timestamp": time.time()
+                })
+            self._done_chapters.add((book_code, chapter))
+            self.stats["chapters"] += 1
+
+            # Save metadata incrementally
+            self.save_corpus_data()
+
+        except Exception as e:
+            logger.error(f"[{self.lang}] Erreur fatale sur {book_code} {chapter}: {e}")
+            # Ne pas re-lever pour permettre de continuer sur les autres chapitres
+
+    async def scrape_all(self, books=None):
+        """
+        Scrape tous les chapitres (ou seulement `books`) de la version.
+        Les chapitres partagent le sémaphore du budget : plusieurs versions lancées
+        ensemble se répartissent les mêmes créneaux.
+        """
+        book_codes = books or list(self.books.keys())
+
+        async def bounded(book_code, chapter):
+            async with self.budget.semaphore:
+                await self.process_chapter(book_code, chapter)
+
+        await asyncio.gather(*(
+            bounded(book_code, chapter)
+            for book_code in book_codes if book_code in self.books
+            for chapter in range(1, self.books[book_code]["chapters"] + 1)
+        ))
+        self.save_corpus_data()
+        self.save_corpus_store()
+        self.text_store.compact_if_needed()
+
+    def reparse_from_cache(self, max_workers=None):
+        """
+        Reconstruit les métadonnées et les textes UNIQUEMENT depuis le cache HTML
+        (aucune requête réseau). Les pages sont parsées dans un pool de processus.
+        Les chapitres absents du cache, comme ceux des livres hors de self.books,
+        conservent leurs enregistrements existants.
+        """
+        if not self.cache:
+            raise RuntimeError("reparse_from_cache nécessite un HtmlCache actif.")
+
+        chapters = [
+            (book_code, chapter)
+            for book_code, info in self.books.items()
+            for chapter in range(1, info["chapters"] + 1)
+        ]
+        urls = {
+            (book_code, chapter): self.base_text_url.format(book=book_code, chapter=chapter)
+            for book_code, chapter in chapters
+        }
+        cached = {key: url for key, url in urls.items() if url in self.cache}
+        logger.info(f"[{self.lang}] Re-parsing de {len(cached)}/{len(chapters)} chapitres depuis le cache...")
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parsed = dict(pool.map(
+                _parse_cached_chapter,
+                [(self.cache.cache_dir, url) for url in cached.values()],
+                chunksize=8,
+            ))
+
+        previous = {}
+        for r in self.records:
+            previous.setdefault((r["book"], r["chapter"]), []).append(r)
+
+        records = []
+        for book_code, chapter in chapters:
+            verses = parsed.get(cached.get((book_code, chapter)))
+            if not verses:
+                records.extend(previous.get((book_code, chapter), []))
+                continue
+
+            text_url = urls[(book_code, chapter)]
+            audio_url = self.base_audio_url.format(book=book_code, chapter=chapter)
+            audio_path_local = self.audio_dir / f"{book_code.lower()}_{chapter:02d}.mp3"
+            fetched_at = self.cache.get_meta(text_url).get("fetched_at", time.time())
+
+            self.text_store.write_chapter(book_code, chapter, verses)
+            for v in verses:
+                v_id = v["verse"]
+                records.append({
+                    "book": book_code,
+                    "chapter": chapter,
+                    "verse": v_id,
+                    "text": v["text"],
+                    "audio_path": str(audio_path_local) if audio_path_local.exists() else None,
+                    "text_url": text_url,
+                    "audio_url": audio_url,
+                    "timestamp": fetched_at
+                })
+
+        # Enregistrements hors du périmètre re-parsé (autres livres) conservés tels quels
+        scope = set(chapters)
+        records.extend(r for r in self.records if (r["book"], r["chapter"]) not in scope)
+
+        self.records = records
+        self._done_chapters = {(r["book"], r["chapter"]) for r in self.records}
+        self.save_corpus_data()
+        self.save_corpus_store()
+        self.text_store.compact_if_needed()
+        return self.records
+
+    # -----------------------------------------------------------------
+    # Save
+    # -----------------------------------------------------------------
+    def save_corpus_data(self):
+        self.meta_file.write_text(
+            json.dumps(self.records, ensure_ascii=False, indent=2),
+            encoding="utf-8"
+        )
+        logger.info(f"[{self.lang}] {len(self.records)} versets sauvegardés")
+
+    def save_corpus_store(self):
+        """Corpus en Parquet (colonnes typées + verse_id), relu par l'alignement et les datasets."""
+        write_corpus(self.records, self.lang, corpus_path(self.lang, self.meta_dir))
@@ -0,0 +1,95 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from src.config.settings import HTML_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class HtmlCache:
+    """
+    Cache local des pages HTML téléchargées (compressées gzip).
+    Chaque page est adressée par le SHA-256 de son URL :
+        <cache_dir>/<2 premiers hex>/<sha256>.html.gz   (corps)
+        <cache_dir>/<2 premiers hex>/<sha256>.json      (url, ETag, Last-Modified, dates)
+    Permet de re-parser le corpus sans réseau et de revalider avec If-None-Match / If-Modified-Since.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else HTML_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, url: str):
+        k = self.key(url)
+        folder = self.cache_dir / k[:2]
+        return folder / f"{k}.html.gz", folder / f"{k}.json"
+
+    def __contains__(self, url):
+        return self._paths(url)[0].exists()
+
+    def get(self, url: str):
+        body_path, _ = self._paths(url)
+        if not body_path.exists():
+            return None
+        try:
+            return gzip.decompress(body_path.read_bytes()).decode("utf-8")
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            logger.warning(f"Entrée de cache corrompue pour {url}: {e}")
+            return None
+
+    def get_meta(self, url: str) -> dict:
+        _, meta_path = self._paths(url)
+        if not meta_path.exists():
+            return {}
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def conditional_headers(self, url: str) -> dict:
+        """En-têtes de revalidation HTTP pour une page déjà en cache."""
+        meta = self.get_meta(url)
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def put(self, url: str, html: str, headers=None):
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        now = time.time()
+        meta = {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": now,
+            "validated_at": now,
+        }
+        # Écriture atomique : un crash ne laisse jamais de fichier tronqué
+        self._atomic_write(body_path, gzip.compress(html.encode("utf-8"), compresslevel=6))
+        self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def touch(self, url: str):
+        """Marque une entrée comme revalidée (réponse 304)."""
+        _, meta_path = self._paths(url)
+        meta = self.get_meta(url)
+        meta["validated_at"] = time.time()
+        self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
@@ -0,0 +1,133 @@
+import re
+import logging
+
+from bs4 import BeautifulSoup
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Expressions précompilées (appelées des milliers de fois lors d'un re-parsing complet)
+_LEADING_NUMBER_RE = re.compile(r'^\d+')
+_FIRST_NUMBER_RE = re.compile(r'\d+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+if LXML_AVAILABLE:
+    _VERSE_NODES = etree.XPath("//*[self::span or self::div][@data-usfm]")
+    _CONTENT_SPANS = etree.XPath(
+        ".//span[contains(concat(' ', normalize-space(@class), ' '), ' content ')]"
+    )
+    _TEXT_NODES = etree.XPath(".//text()", smart_strings=False)
+
+
+def _verse_sort_key(v_num):
+    m = _FIRST_NUMBER_RE.search(v_num)
+    return int(m.group()) if m else 0
+
+
+def parse_verses(soup):
+    """
+    Parser de référence (BeautifulSoup / html.parser).
+    Conservé pour la compatibilité et pour vérifier le parser lxml (scripts/bench_verse_parser.py).
+    """
+    verses_map = {}
+    # Bible.com uses spans with class 'verse' or data-usfm
+    elements = soup.find_all(["span", "div"], {"data-usfm": True})
+
+    for el in elements:
+        usfm = el.get("data-usfm", "")
+        parts = usfm.split(".")
+        if len(parts) < 3:
+            continue
+
+        v_num = parts[2]
+        v_key = v_num.split("-")[0]  # Segment support (e.g. 1-2)
+
+        # Use only content spans, skip verse numbers
+        text = ""
+        for content in el.find_all("span", class_="content"):
+            text += content.get_text(strip=True) + " "
+
+        if not text:
+            text = el.get_text(strip=True)
+
+        # Cleanup: remove leading numbers and extra spaces
+        text = re.sub(r'^\d+', '', text).strip()
+
+        if text:
+            if v_key not in verses_map:
+                verses_map[v_key] = text
+            else:
+                verses_map[v_key] += " " + text
+
+    # Final cleanup and formatting
+    sorted_verses = []
+    for v_num in sorted(verses_map.keys(), key=lambda x: int(re.search(r'\d+', x).group()) if re.search(r'\d+', x) else 0):
+        # Clean up double spaces
+        v_text = re.sub(r'\s+', ' ', verses_map[v_num]).strip()
+        sorted_verses.append({
+            "verse": v_num,
+            "text": v_text,
+            "usfm": v_num
+        })
+
+    return sorted_verses
+
+
+def _stripped_text(el):
+    """Équivalent de BeautifulSoup.get_text(strip=True) sur un élément lxml."""
+    return "".join(s for s in (t.strip() for t in _TEXT_NODES(el)) if s)
+
+
+def parse_verses_lxml(html):
+    """
+    Parser rapide (lxml + XPath compilés), sortie identique à parse_verses.
+    Le texte de chaque verset est assemblé en une passe (liste + join) au lieu
+    de concaténations successives.
+    """
+    if not html or not html.strip():
+        return []
+    try:
+        root = lxml.html.document_fromstring(html)
+    except ValueError:
+        # Chaîne unicode avec déclaration d'encodage XML
+        root = lxml.html.document_fromstring(html.encode("utf-8"))
+
+    verses_map = {}
+    for el in _VERSE_NODES(root):
+        parts = el.get("data-usfm", "").split(".")
+        if len(parts) < 3:
+            continue
+
+        v_num = parts[2]
+        v_key = v_num.split("-")[0]
+
+        contents = _CONTENT_SPANS(el)
+        if contents:
+            text = " ".join(_stripped_text(c) for c in contents) + " "
+        else:
+            text = _stripped_text(el)
+
+        text = _LEADING_NUMBER_RE.sub('', text).strip()
+        if text:
+            verses_map.setdefault(v_key, []).append(text)
+
+    return [
+        {
+            "verse": v_num,
+            "text": _WHITESPACE_RE.sub(' ', " ".join(verses_map[v_num])).strip(),
+            "usfm": v_num
+        }
+        for v_num in sorted(verses_map, key=_verse_sort_key)
+    ]
+
+
+def parse_chapter_html(html: str):
+    """Parse une page chapitre complète -> liste de versets triés (lxml si disponible)."""
+    if LXML_AVAILABLE:
+        return parse_verses_lxml(html)
+    return parse_verses(BeautifulSoup(html, "html.parser"))
@@ -0,0 +1,233 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from src.config.settings import EWE_RAW_DIR, GEGBE_RAW_DIR
+
+# ---------------------------------------------------------------------
+# Tables des livres (codes USFM -> nom local + nombre de chapitres)
+# ---------------------------------------------------------------------
+EWE_BOOKS = {
+    "GEN": {"name": "Mose I", "chapters": 50},
+    "EXO": {"name": "Mose II", "chapters": 40},
+    "LEV": {"name": "Mose III", "chapters": 27},
+    "NUM": {"name": "Mose IV", "chapters": 36},
+    "DEU": {"name": "Mose V", "chapters": 34},
+    "JOS": {"name": "Yosua", "chapters": 24},
+    "JDG": {"name": "Ɖelawo", "chapters": 21},
+    "RUT": {"name": "Rut", "chapters": 4},
+    "1SA": {"name": "Samuel I", "chapters": 31},
+    "2SA": {"name": "Samuel II", "chapters": 24},
+    "1KI": {"name": "Fiawo I", "chapters": 22},
+    "2KI": {"name": "Fiawo II", "chapters": 25},
+    "1CH": {"name": "Kronika I", "chapters": 29},
+    "2CH": {"name": "Kronika II", "chapters": 36},
+    "EZR": {"name": "Ezra ƒe Agbalẽ", "chapters": 10},
+    "NEH": {"name": "Nexemya ƒe Agbalẽ", "chapters": 13},
+    "TOB": {"name": "Tobit", "chapters": 14},
+    "JDT": {"name": "Yudit", "chapters": 16},
+    "ESG": {"name": "Esta G", "chapters": 11},
+    "1MA": {"name": "1Makabeowo", "chapters": 16},
+    "2MA": {"name": "2Makabeowo", "chapters": 15},
+    "JOB": {"name": "Hiob ƒe Agbalẽ", "chapters": 42},
+    "PSA": {"name": "Psalmowo", "chapters": 150},
+    "PRO": {"name": "Salomo ƒe Lododowo", "chapters": 31},
+    "ECC": {"name": "Nyagblɔla Salomo", "chapters": 12},
+    "SNG": {"name": "Hawo ƒe ha", "chapters": 8},
+    "WIS": {"name": "Salomo ƒe Nunya", "chapters": 19},
+    "SIR": {"name": "EKLESIASTIKO", "chapters": 52},
+    "ISA": {"name": "Yesaya", "chapters": 66},
+    "JER": {"name": "Yeremya", "chapters": 52},
+    "LAM": {"name": "Konyifahawo", "chapters": 5},
+    "BAR": {"name": "Barux", "chapters": 7},
+    "EZK": {"name": "Xezekiel", "chapters": 48},
+    "DAG": {"name": "Daniɛl (Greek)", "chapters": 3},
+    "HOS": {"name": "Hosea", "chapters": 14},
+    "JOL": {"name": "Yoel", "chapters": 3},
+    "AMO": {"name": "Amos", "chapters": 9},
+    "OBA": {"name": "Obadya", "chapters": 1},
+    "JON": {"name": "Yona", "chapters": 4},
+    "MIC": {"name": "Mixa", "chapters": 7},
+    "NAM": {"name": "Naxum", "chapters": 3},
+    "HAB": {"name": "Xabakuk", "chapters": 3},
+    "ZEP": {"name": "Zefanya", "chapters": 3},
+    "HAG": {"name": "Xagai", "chapters": 2},
+    "ZEC": {"name": "Zaxarya", "chapters": 14},
+    "MAL": {"name": "Maleaxi", "chapters": 4},
+    "MAT": {"name": "Mateo", "chapters": 28},
+    "MRK": {"name": "Marko", "chapters": 16},
+    "LUK": {"name": "Luka", "chapters": 24},
+    "JHN": {"name": "Yohanes", "chapters": 21},
+    "ACT": {"name": "Amedɔdɔawo ƒe Dɔwɔwɔwo", "chapters": 28},
+    "ROM": {"name": "Romatɔwo", "chapters": 16},
+    "1CO": {"name": "Korintotɔwo I", "chapters": 16},
+    "2CO": {"name": "Korintotɔwo II", "chapters": 13},
+    "GAL": {"name": "Galatiatɔwo", "chapters": 6},
+    "EPH": {"name": "Efesotɔwo", "chapters": 6},
+    "PHP": {"name": "Filipitɔwo", "chapters": 4},
+    "COL": {"name": "Kolosetɔwo", "chapters": 4},
+    "1TH": {"name": "Tesalonikatɔwo I", "chapters": 5},
+    "2TH": {"name": "Tesalonikatɔwo II", "chapters": 3},
+    "1TI": {"name": "Timoteo I", "chapters": 6},
+    "2TI": {"name": "Timoteo II", "chapters": 4},
+    "TIT": {"name": "Tito", "chapters": 3},
+    "PHM": {"name": "Filemon", "chapters": 1},
+    "HEB": {"name": "Hebritɔwo", "chapters": 13},
+    "JAS": {"name": "Yakobo", "chapters": 5},
+    "1PE": {"name": "Petro I", "chapters": 5},
+    "2PE": {"name": "Petro II", "chapters": 3},
+    "1JN": {"name": "Yohanes I", "chapters": 5},
+    "2JN": {"name": "Yohanes II", "chapters": 1},
+    "3JN": {"name": "Yohanes III", "chapters": 1},
+    "JUD": {"name": "Yuda", "chapters": 1},
+    "REV": {"name": "Nyaɖeɖefia", "chapters": 22},
+}
+
+GEGBE_BOOKS = {
+    "GEN": {"name": "Gɔ̃mèjèje be Xoma", "chapters": 50},
+    "EXO": {"name": "Toto jo", "chapters": 40},
+    "LEV": {"name": "Levìwo", "chapters": 27},
+    "NUM": {"name": "Àmè Hɛ̃hlɛ̃", "chapters": 36},
+    "DEU": {"name": "Èsea gbìgbɔ̀ hlɛ̃", "chapters": 34},
+    "JOS": {"name": "Yosùa", "chapters": 24},
+    "JDG": {"name": "Kòjoɖotɔwo", "chapters": 21},
+    "RUT": {"name": "Rut", "chapters": 4},
+    "1SA": {"name": "1Samuɛl", "chapters": 31},
+    "2SA": {"name": "2Samuɛl", "chapters": 24},
+    "1KI": {"name": "1Èfìɔwo", "chapters": 22},
+    "2KI": {"name": "2Èfìɔ", "chapters": 25},
+    "1CH": {"name": "1Kronikà", "chapters": 29},
+    "2CH": {"name": "2Kronikà", "chapters": 36},
+    "EZR": {"name": "Ɛzrà", "chapters": 10},
+    "NEH": {"name": "Nèhemìa", "chapters": 13},
+    "TOB": {"name": "TOBÌ", "chapters": 14},
+    "JDT": {"name": "Yudìt", "chapters": 16},
+    "ESG": {"name": "Ɛstà-G", "chapters": 18},
+    "1MA": {"name": "1Màkàbeòwo", "chapters": 16},
+    "2MA": {"name": "2Màkàbeòwo", "chapters": 15},
+    "JOB": {"name": "Yɔb", "chapters": 42},
+    "PSA": {"name": "Èhàwo", "chapters": 150},
+    "PRO": {"name": "Èlododowo", "chapters": 31},
+    "ECC": {"name": "Àɖàŋùɖètɔ", "chapters": 12},
+    "SNG": {"name": "Èhàwo be Èhà", "chapters": 8},
+    "WIS": {"name": "Ànyasã", "chapters": 19},
+    "SIR": {"name": "Sirasid", "chapters": 51},
+    "ISA": {"name": "Ezayà", "chapters": 66},
+    "JER": {"name": "Yeremìa", "chapters": 52},
+    "LAM": {"name": "Àlenanawo", "chapters": 5},
+    "BAR": {"name": "Bàruk", "chapters": 5},
+    "EZK": {"name": "Ezekìɛl", "chapters": 48},
+    "DAG": {"name": "Dàniɛl-G", "chapters": 14},
+    "HOS": {"name": "Òzeà", "chapters": 14},
+    "JOL": {"name": "Yoɛ̀l", "chapters": 4},
+    "AMO": {"name": "Àmos", "chapters": 9},
+    "OBA": {"name": "Obadìa", "chapters": 1},
+    "JON": {"name": "Yonà", "chapters": 4},
+    "MIC": {"name": "Mikà", "chapters": 7},
+    "NAM": {"name": "Nàhum", "chapters": 3},
+    "HAB": {"name": "Hàbakuk", "chapters": 3},
+    "ZEP": {"name": "Sèfanìa", "chapters": 3},
+    "HAG": {"name": "Hagài", "chapters": 2},
+    "ZEC": {"name": "Zakarìa", "chapters": 14},
+    "MAL": {"name": "Malakìa", "chapters": 3},
+    "MAT": {"name": "Màteo", "chapters": 28},
+    "MRK": {"name": "Markò", "chapters": 16},
+    "LUK": {"name": "Lukà", "chapters": 24},
+    "JHN": {"name": "Yòhanɛ̀s", "chapters": 21},
+    "ACT": {"name": "Èdɔwɔ̀wɔwo", "chapters": 28},
+    "ROM": {"name": "Romàtɔwo", "chapters": 16},
+    "1CO": {"name": "1Kòrɛ̃tòtɔwo", "chapters": 16},
+    "2CO": {"name": "2Kòrɛ̃tòtɔwo", "chapters": 13},
+    "GAL": {"name": "Galatìatɔwɔ", "chapters": 6},
+    "EPH": {"name": "Efesòtɔwo", "chapters": 6},
+    "PHP": {"name": "Fìlipìtɔwo", "chapters": 4},
+    "COL": {"name": "Kolosètɔwo", "chapters": 4},
+    "1TH": {"name": "1Tɛsalonikà", "chapters": 5},
+    "2TH": {"name": "2Tɛsalonikà", "chapters": 3},
+    "1TI": {"name": "1Timòteo", "chapters": 6},
+    "2TI": {"name": "2Timòteo", "chapters": 4},
+    "TIT": {"name": "Titò", "chapters": 3},
+    "PHM": {"name": "Filemɔ̀n", "chapters": 1},
+    "HEB": {"name": "Hebrùwo", "chapters": 13},
+    "JAS": {"name": "Yakobò", "chapters": 5},
+    "1PE": {"name": "1Petrò", "chapters": 5},
+    "2PE": {"name": "2Petrò", "chapters": 3},
+    "1JN": {"name": "1Yòhanɛ̀s", "chapters": 5},
+    "2JN": {"name": "2Yòhanɛ̀s", "chapters": 1},
+    "3JN": {"name": "3Yòhanɛ̀s", "chapters": 1},
+    "JUD": {"name": "Yudà", "chapters": 1},
+    "REV": {"name": "Àvìmènu", "chapters": 22},
+}
+
+# Livres effectivement scrapés (Pentateuque + livres historiques jusqu'à Esdras)
+ACTIVE_BOOKS = [
+    "GEN", "EXO", "LEV", "NUM", "DEU", "JOS", "JDG", "RUT",
+    "1SA", "2SA", "1KI", "2KI", "1CH", "2CH", "EZR",
+]
+
+
+def select_books(table: Dict[str, dict], codes: List[str]) -> Dict[str, dict]:
+    """Extrait d'une table de livres les codes demandés, dans l'ordre donné."""
+    return {code: table[code] for code in codes if code in table}
+
+
+@dataclass
+class BibleVersion:
+    """
+    Descripteur d'une version de la Bible sur bible.com.
+    Ajouter une variété Gbe = ajouter une entrée dans BIBLE_VERSIONS.
+    """
+    lang: str                 # préfixe utilisé partout (fichiers, datasets)
+    version_id: int           # ID bible.com (ex: 3306)
+    suffix: str               # suffixe USFM de la version (ex: EB14)
+    books: Dict[str, dict]
+    root_dir: Path            # data/raw/<lang>
+    locale: str = ""          # segment de langue dans l'URL (ex: "fr")
+    base_url: str = "https://www.bible.com"
+
+    @property
+    def audio_dir(self) -> Path:
+        return self.root_dir / "audio"
+
+    @property
+    def text_dir(self) -> Path:
+        return self.root_dir / "texts"
+
+    @property
+    def meta_dir(self) -> Path:
+        return self.root_dir / "metadata"
+
+    @property
+    def meta_filename(self) -> str:
+        return f"{self.lang}_bible_raw.json"
+
+    def _url(self, kind: str) -> str:
+        prefix = f"{self.base_url}/{self.locale}" if self.locale else self.base_url
+        return f"{prefix}/{kind}/{self.version_id}/{{book}}.{{chapter}}.{self.suffix}"
+
+    @property
+    def text_url(self) -> str:
+        return self._url("bible")
+
+    @property
+    def audio_url(self) -> str:
+        return self._url("audio-bible")
+
+
+BIBLE_VERSIONS = {
+    "ewe": BibleVersion(
+        lang="ewe",
+        version_id=3306,
+        suffix="EB14",
+        locale="fr",
+        books=select_books(EWE_BOOKS, ACTIVE_BOOKS),
+        root_dir=EWE_RAW_DIR,
+    ),
+    "gegbe": BibleVersion(
+        lang="gegbe",
+        version_id=2236,
+        suffix="GEN",
+        books=select_books(GEGBE_BOOKS, ACTIVE_BOOKS),
+        root_dir=GEGBE_RAW_DIR,
+    ),
+}
@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from src.scraping.versions import BIBLE_VERSIONS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CORPUS_SUFFIX = "_corpus.parquet"
+# Colonnes des enregistrements du scraper (*_bible_raw.json), dans l'ordre du fichier Parquet
+RECORD_COLUMNS = ["book", "chapter", "verse", "text", "audio_path", "text_url", "audio_url", "timestamp"]
+# Colonnes calculées une fois à l'écriture
+KEY_COLUMNS = ["verse_id", "verse_start"]
+
+
+def meta_path(lang: str) -> Path:
+    version = BIBLE_VERSIONS[lang]
+    return version.meta_dir / version.meta_filename
+
+
+def corpus_path(lang: str, meta_dir=None) -> Path:
+    """Fichier Parquet du corpus, à côté du JSON du scraper (data/raw/<lang>/metadata)."""
+    return Path(meta_dir or BIBLE_VERSIONS[lang].meta_dir) / f"{lang}{CORPUS_SUFFIX}"
+
+
+def records_to_frame(records) -> pd.DataFrame:
+    """
+    Enregistrements du scraper -> DataFrame typé : book (catégorie), chapter (int32),
+    verse (texte, ex: "3" ou "3-4"), clé verse_id "BOOK.CHAPTER.VERSE" et premier
+    numéro de verset (verse_start, ordre de lecture), calculés en colonnes.
+    """
+    df = pd.DataFrame.from_records(records, columns=RECORD_COLUMNS)
+    df["book"] = df["book"].astype(str)
+    df["chapter"] = pd.to_numeric(df["chapter"]).astype("int32")
+    df["verse"] = df["verse"].astype(str)
+    df["timestamp"] = pd.to_numeric(df["timestamp"]).astype("float64")
+    df["verse_id"] = df["book"] + "." + df["chapter"].astype(str) + "." + df["verse"]
+    df["verse_start"] = (
+        pd.to_numeric(df["verse"].str.split("-").str[0].str.strip(), errors="coerce").fillna(0).astype("int32")
+    )
+    df["book"] = df["book"].astype("category")
+    return df[RECORD_COLUMNS + KEY_COLUMNS]
+
+
+def write_corpus(records, lang: str, path=None) -> Path:
+    """Écrit le corpus d'une langue en Parquet (écriture atomique) ; appelé en fin de scraping."""
+    if not PYARROW_AVAILABLE:
+        logger.warning("pyarrow non installé : corpus Parquet non écrit (lecture depuis le JSON).")
+        return None
+    path = Path(path or corpus_path(lang))
+    table = pa.Table.from_pandas(records_to_frame(records), preserve_index=False)
+    tmp = path.with_suffix(".parquet.tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+    logger.info(f"[{lang}] Corpus Parquet : {table.num_rows} versets -> {path}")
+    return path
+
+
+def read_corpus(lang: str, columns=None, path=None, source=None) -> pd.DataFrame:
+    """
+    Corpus d'une langue (seulement `columns`). Le Parquet est (re)construit depuis le
+    JSON du scraper (`source`) s'il manque ou s'il est plus ancien que celui-ci.
+    DataFrame vide si aucune des deux sources n'existe.
+    """
+    path = Path(path or corpus_path(lang))
+    source = Path(source or meta_path(lang))
+    stale = not path.exists() or (source.exists() and source.stat().st_mtime > path.stat().st_mtime)
+
+    if stale and not source.exists():
+        logger.warning(f"Corpus introuvable : {path} / {source}")
+        return pd.DataFrame(columns=columns or RECORD_COLUMNS + KEY_COLUMNS)
+
+    if not PYARROW_AVAILABLE:
+        # Sans pyarrow : JSON du scraper, sinon Parquet existant via un autre moteur (fastparquet)
+        if source.exists():
+            df = records_to_frame(json.loads(source.read_text(encoding="utf-8")))
+            return df[columns] if columns else df
+        return pd.read_parquet(path, columns=columns)
+
+    if stale:
+        logger.info(f"[{lang}] Conversion de {source.name} en Parquet...")
+        write_corpus(json.loads(source.read_text(encoding="utf-8")), lang, path)
+
+    return pq.read_table(path, columns=columns).to_pandas()
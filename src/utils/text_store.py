@@ -0,0 +1,256 @@
+import json
+import os
+import re
+import logging
+from pathlib import Path
+
+from src.config.settings import TEXT_STORAGE_LAYOUT, TEXT_STORE_COMPACT_RATIO
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+LAYOUTS = ("files", "chapter", "book")
+
+
+def chapter_id(book_code: str, chapter: int) -> str:
+    """Identifiant de chapitre partagé par tous les formats (ex: gen_01)."""
+    return f"{book_code.lower()}_{chapter:02d}"
+
+
+def safe_verse_id(verse_id: str) -> str:
+    return re.sub(r'\D', '_', str(verse_id))
+
+
+def verse_order(safe_v_id: str) -> int:
+    """Ordre des versets historique de clean_all_texts (dernier segment numérique)."""
+    last_part = safe_v_id.split('_')[-1]
+    if last_part.isdigit():
+        return int(last_part)
+    return 999  # Fallback
+
+
+class VerseTextStore:
+    """
+    Stockage des textes bruts des versets d'une langue (data/raw/<lang>/texts).
+
+    Formats :
+    - "files"   : un .txt par verset ({book}_{chapter}_{verse}.txt), format historique
+    - "chapter" : un shard JSONL par chapitre ({book}_{chapter}.jsonl)
+    - "book"    : un shard JSONL par livre ({book}.jsonl)
+
+    Les formats packés tiennent un index (index.json) : chapitre -> (shard, offset, longueur),
+    ce qui permet de relire un chapitre avec un seul open + seek.
+    """
+
+    def __init__(self, text_dir, layout=None):
+        self.text_dir = Path(text_dir)
+        self.layout = layout or TEXT_STORAGE_LAYOUT
+        if self.layout not in LAYOUTS:
+            raise ValueError(f"Format de stockage inconnu : {self.layout}. Options : {LAYOUTS}")
+        self.text_dir.mkdir(parents=True, exist_ok=True)
+        self._index = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.text_dir / INDEX_FILE
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                self._index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        return self._index
+
+    @property
+    def storage_layout(self) -> str:
+        """
+        Format effectif des écritures : un dossier déjà packé (index.json) reste packé
+        même avec le format "files", sinon les lecteurs (index seul) ignoreraient les .txt.
+        """
+        if self.layout != "files" or not self.is_packed():
+            return self.layout
+        for cid, entry in self.index.items():
+            return "chapter" if entry["shard"] == f"{cid}.jsonl" else "book"
+        return "chapter"
+
+    def _save_index(self):
+        tmp = self.index_path.with_name(INDEX_FILE + ".tmp")
+        tmp.write_text(json.dumps(self.index, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    # -----------------------------------------------------------------
+    # Écriture
+    # -----------------------------------------------------------------
+    def write_chapter(self, book_code: str, chapter: int, verses):
+        """verses : liste de dicts {"verse", "text"} (sortie du parser)."""
+        layout = self.storage_layout
+        if layout == "files":
+            for v in verses:
+                text_file = f"{chapter_id(book_code, chapter)}_{safe_verse_id(v['verse'])}.txt"
+                (self.text_dir / text_file).write_text(v["text"], encoding="utf-8")
+            return
+
+        cid = chapter_id(book_code, chapter)
+        shard = f"{cid}.jsonl" if layout == "chapter" else f"{book_code.lower()}.jsonl"
+        payload = "".join(
+            json.dumps({"book": book_code, "chapter": chapter, "verse": v["verse"], "text": v["text"]},
+                       ensure_ascii=False) + "\n"
+            for v in verses
+        ).encode("utf-8")
+
+        shard_path = self.text_dir / shard
+        if layout == "chapter":
+            tmp = shard_path.with_name(shard + ".tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, shard_path)
+            offset = 0
+        else:
+            entry = self.index.get(cid)
+            if entry and entry["shard"] == shard and entry["length"] == len(payload) and shard_path.exists():
+                with open(shard_path, "rb") as f:
+                    f.seek(entry["offset"])
+                    if f.read(entry["length"]) == payload:
+                        return  # Chapitre inchangé (cas courant d'un re-parsing) : rien à réécrire
+            # Ajout en fin de shard ; une réécriture du chapitre rend l'ancien bloc orphelin (cf. compact)
+            with open(shard_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(payload)
+
+        self.index[cid] = {"shard": shard, "offset": offset, "length": len(payload), "verses": len(verses)}
+        self._save_index()
+
+    # -----------------------------------------------------------------
+    # Lecture
+    # -----------------------------------------------------------------
+    def is_packed(self) -> bool:
+        return self.index_path.exists()
+
+    def read_chapter(self, book_code: str, chapter: int):
+        """Retourne [(safe_verse_id, texte)] triés, ou [] si le chapitre est absent."""
+        cid = chapter_id(book_code, chapter)
+        entry = self.index.get(cid) if self.is_packed() else None
+        if entry:
+            with open(self.text_dir / entry["shard"], "rb") as f:
+                return self._decode_block(f, entry)
+        # Format historique, ou .txt écrits après le packing (hors index)
+        return self._sorted([
+            (p.stem[len(cid) + 1:], p.read_text(encoding="utf-8"))
+            for p in self.text_dir.glob(f"{cid}_*.txt")
+        ])
+
+    def iter_chapters(self):
+        """
+        Itère sur (chapter_id, [(safe_verse_id, texte)]) — un open par shard en format packé,
+        puis les chapitres en .txt absents de l'index (format historique).
+        """
+        indexed = self.index if self.is_packed() else {}
+        by_shard = {}
+        for cid, entry in indexed.items():
+            by_shard.setdefault(entry["shard"], []).append((cid, entry))
+        for shard, entries in by_shard.items():
+            with open(self.text_dir / shard, "rb") as f:
+                for cid, entry in sorted(entries, key=lambda e: e[1]["offset"]):
+                    yield cid, self._decode_block(f, entry)
+
+        # Format historique : groupement des fichiers par chapitre (ex: gen_01, 1ch_01)
+        groups = {}
+        for txt_path in self.text_dir.glob("*.txt"):
+            parts = txt_path.stem.split('_')
+            if len(parts) >= 2:
+                cid = "_".join(parts[:2])
+                if cid not in indexed:
+                    groups.setdefault(cid, []).append(txt_path)
+        for cid, paths in groups.items():
+            yield cid, self._sorted([
+                (p.stem[len(cid) + 1:], p.read_text(encoding="utf-8")) for p in paths
+            ])
+
+    def _decode_block(self, f, entry):
+        f.seek(entry["offset"])
+        lines = f.read(entry["length"]).decode("utf-8").splitlines()
+        rows = [json.loads(line) for line in lines if line]
+        return self._sorted([(safe_verse_id(r["verse"]), r["text"]) for r in rows])
+
+    @staticmethod
+    def _sorted(items):
+        # On trie les versets par numéro pour l'ordre correct (ordre déterministe en cas d'égalité)
+        return sorted(items, key=lambda item: (verse_order(item[0]), item[0]))
+
+    # -----------------------------------------------------------------
+    # Maintenance
+    # -----------------------------------------------------------------
+    def orphan_bytes(self) -> int:
+        """Octets des shards "book" qui ne sont plus référencés par l'index."""
+        if self.storage_layout != "book" or not self.is_packed():
+            return 0
+        indexed = {}
+        for entry in self.index.values():
+            indexed[entry["shard"]] = indexed.get(entry["shard"], 0) + entry["length"]
+        return sum(
+            (self.text_dir / shard).stat().st_size - length
+            for shard, length in indexed.items() if (self.text_dir / shard).exists()
+        )
+
+    def compact_if_needed(self, max_ratio=None) -> bool:
+        """Compacte les shards "book" si la part d'octets orphelins dépasse max_ratio."""
+        max_ratio = TEXT_STORE_COMPACT_RATIO if max_ratio is None else max_ratio
+        orphans = self.orphan_bytes()
+        if not orphans:
+            return False
+        total = sum((self.text_dir / shard).stat().st_size
+                    for shard in {entry["shard"] for entry in self.index.values()}
+                    if (self.text_dir / shard).exists())
+        if orphans / total <= max_ratio:
+            return False
+        logger.info(f"Compactage de {self.text_dir} : {orphans / 1024:.0f} Ko orphelins ({orphans / total:.0%})")
+        self.compact()
+        return True
+
+    def compact(self):
+        """Réécrit les shards "book" sans les blocs orphelins laissés par les réécritures."""
+        if self.storage_layout != "book" or not self.is_packed():
+            return
+        blocks = {}
+        for cid, entry in self.index.items():
+            with open(self.text_dir / entry["shard"], "rb") as f:
+                f.seek(entry["offset"])
+                blocks.setdefault(entry["shard"], []).append((cid, entry, f.read(entry["length"])))
+        for shard, items in blocks.items():
+            tmp = self.text_dir / (shard + ".tmp")
+            with open(tmp, "wb") as f:
+                for cid, entry, payload in sorted(items, key=lambda x: x[1]["offset"]):
+                    entry["offset"] = f.tell()
+                    f.write(payload)
+            os.replace(tmp, self.text_dir / shard)
+        self._save_index()
+
+
+def pack_text_dir(text_dir, layout="chapter"):
+    """
+    Convertit un dossier au format historique (un .txt par verset) en shards JSONL.
+    Les .txt d'origine ne sont pas supprimés ; l'index rend le format packé prioritaire.
+    Sur un dossier déjà packé, seuls les chapitres en .txt absents de l'index sont ajoutés
+    (dans le format existant).
+    """
+    source = VerseTextStore(text_dir, layout="files")
+    packed = set(source.index) if source.is_packed() else set()
+    if packed:
+        layout = source.storage_layout
+        logger.info(f"{text_dir} est déjà au format packé ({layout}) : ajout des chapitres hors index.")
+    target = VerseTextStore(text_dir, layout=layout)
+    n_chapters = 0
+    for cid, verses in list(source.iter_chapters()):
+        if cid in packed:
+            continue
+        book, chapter = cid.rsplit("_", 1)
+        target.write_chapter(book.upper(), int(chapter), [{"verse": v, "text": t} for v, t in verses])
+        n_chapters += 1
+    logger.info(f"{n_chapters} chapitres packés ({layout}) dans {text_dir}")
+
+
+if __name__ == "__main__":
+    # python -m src.utils.text_store data/raw/ewe/texts book
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    pack_text_dir(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else "chapter")